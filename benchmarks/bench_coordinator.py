@@ -0,0 +1,349 @@
+"""Benchmarks for Baby Care Tracker coordinator hot paths.
+
+Run from the repository root:
+
+    pytest benchmarks
+
+Histories of 1k to 100k activities are measured by default on both storage
+backends; set ``BABY_CARE_BENCH_FULL=1`` to include 1M. See
+benchmarks/README.md for comparing runs against the committed baseline.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import random
+import shutil
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from homeassistant.config_entries import ConfigEntry  # noqa: E402
+from homeassistant.core import Event, HomeAssistant  # noqa: E402
+from homeassistant.helpers import (  # noqa: E402
+    area_registry as ar,
+    device_registry as dr,
+    entity_registry as er,
+)
+
+from custom_components.baby_care_tracker import binary_sensor, sensor  # noqa: E402
+from custom_components.baby_care_tracker.const import (  # noqa: E402
+    ACTIVITY_BOTTLE_FEEDING,
+    ACTIVITY_DIAPER,
+    ACTIVITY_FEEDING,
+    ACTIVITY_GROWTH,
+    ACTIVITY_SLEEPING,
+    ACTIVITY_TYPES,
+    CONF_BABY_NAME,
+    CONF_DIAPER_PEE,
+    CONF_STORAGE_BACKEND,
+    DOMAIN,
+    STORAGE_BACKEND_JSON,
+    STORAGE_BACKEND_SQLITE,
+)
+from custom_components.baby_care_tracker.coordinator import (  # noqa: E402
+    BabyCareCoordinator,
+)
+from custom_components.baby_care_tracker.storage import (  # noqa: E402
+    SqliteActivityStorage,
+    assign_activity_ids,
+)
+from custom_components.baby_care_tracker.sync import SyncLog  # noqa: E402
+from custom_components.baby_care_tracker.throttle import TriggerThrottle  # noqa: E402
+
+HISTORY_SIZES = [1_000, 10_000, 100_000]
+FULL_HISTORY_SIZES = HISTORY_SIZES + [1_000_000]
+EVENT_FLOOD_SIZE = 1_000
+MAPPED_DEVICE_ACTION = "arrow_left_hold"
+
+
+def pytest_generate_tests(metafunc: pytest.Metafunc) -> None:
+    """Parametrize history sizes, adding 1M activities when requested."""
+    if "history_size" in metafunc.fixturenames:
+        full = os.environ.get("BABY_CARE_BENCH_FULL") == "1"
+        sizes = FULL_HISTORY_SIZES if full else HISTORY_SIZES
+        metafunc.parametrize("history_size", sizes, ids=[f"{n // 1000}k" for n in sizes], scope="module")
+
+
+class StubStore:
+    """In-memory replacement for the JSON Store that keeps the serialization cost."""
+
+    def __init__(self, payload: Optional[str] = None) -> None:
+        """Initialize the stub with an already serialized payload."""
+        self.payload = payload
+        self.saves = 0
+
+    async def async_load(self) -> Optional[Dict[str, Any]]:
+        """Parse the stored payload."""
+        if self.payload is None:
+            return None
+        return json.loads(self.payload)
+
+    async def async_save(self, data: Dict[str, Any]) -> None:
+        """Serialize the data like Store does."""
+        self.payload = json.dumps(data)
+        self.saves += 1
+
+
+def generate_history(size: int, seed: int = 1) -> Dict[str, Any]:
+    """Generate a realistic mix of activities ending now."""
+    rng = random.Random(seed)
+    now = datetime.now()
+    activities: List[Dict[str, Any]] = []
+    timestamp = now - timedelta(minutes=58 * size)
+
+    while len(activities) < size:
+        timestamp += timedelta(minutes=rng.randint(30, 90))
+        roll = rng.random()
+        if roll < 0.35:
+            duration = rng.randint(300, 1800)
+            start = timestamp - timedelta(seconds=duration)
+            activities.append({
+                "type": ACTIVITY_FEEDING,
+                "side": rng.choice(["left", "right"]),
+                "start_time": start.isoformat(),
+                "end_time": timestamp.isoformat(),
+                "duration_seconds": float(duration),
+                "notes": "",
+                "timestamp": timestamp.isoformat(),
+            })
+        elif roll < 0.65:
+            activities.append({
+                "type": ACTIVITY_DIAPER,
+                "diaper_type": rng.choice(["pee", "poo", "both"]),
+                "timestamp": timestamp.isoformat(),
+                "notes": "",
+            })
+        elif roll < 0.85:
+            duration = rng.randint(1200, 14400)
+            start = timestamp - timedelta(seconds=duration)
+            activities.append({
+                "type": ACTIVITY_SLEEPING,
+                "start_time": start.isoformat(),
+                "end_time": timestamp.isoformat(),
+                "duration_seconds": float(duration),
+                "notes": "",
+                "timestamp": timestamp.isoformat(),
+            })
+        elif roll < 0.99:
+            activities.append({
+                "type": ACTIVITY_BOTTLE_FEEDING,
+                "amount_ml": rng.randint(60, 180),
+                "timestamp": timestamp.isoformat(),
+                "notes": "",
+            })
+        else:
+            activities.append({
+                "type": ACTIVITY_GROWTH,
+                "weight_kg": round(rng.uniform(3.0, 12.0), 2),
+                "height_cm": round(rng.uniform(48.0, 80.0), 1),
+                "timestamp": timestamp.isoformat(),
+                "notes": "",
+            })
+
+    assign_activity_ids(activities)
+    # Stored as an existing install would, already numbered for peer sync
+    sync, _ = SyncLog.from_data(None, activities)
+    return {
+        "activities": activities,
+        "sync": sync.as_dict(),
+        "current_feeding": {
+            "type": ACTIVITY_FEEDING,
+            "side": "left",
+            "start_time": (now - timedelta(minutes=5)).isoformat(),
+            "notes": "",
+        },
+        "current_sleep": None,
+    }
+
+
+@pytest.fixture(scope="module")
+def loop():
+    """Provide an event loop shared by the module."""
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="module")
+def hass(loop, tmp_path_factory):
+    """Provide a bare Home Assistant core without any integrations."""
+
+    async def _async_create() -> HomeAssistant:
+        hass = HomeAssistant(str(tmp_path_factory.mktemp("config")))
+        hass.config.set_time_zone("UTC")
+        await ar.async_load(hass)
+        await dr.async_load(hass)
+        await er.async_load(hass)
+        return hass
+
+    hass = loop.run_until_complete(_async_create())
+    yield hass
+    loop.run_until_complete(hass.async_stop(force=True))
+
+
+@pytest.fixture(scope="module")
+def payload(history_size: int) -> str:
+    """Serialize a synthetic history once per size."""
+    return json.dumps(generate_history(history_size))
+
+
+@pytest.fixture(scope="module")
+def mapped_device(hass: HomeAssistant) -> str:
+    """Register a button entity on a remote whose specific action is mapped."""
+    device_id = "bench_remote"
+    er.async_get(hass).async_get_or_create(
+        "button", "zha", "bench_remote_button", device_id=device_id
+    )
+    return device_id
+
+
+@pytest.fixture(scope="module", params=[STORAGE_BACKEND_JSON, STORAGE_BACKEND_SQLITE])
+def backend(request: pytest.FixtureRequest) -> str:
+    """Run every benchmark on both storage backends."""
+    return request.param
+
+
+@pytest.fixture(scope="module")
+def sqlite_template(hass: HomeAssistant, loop, payload: str) -> str:
+    """Import the synthetic history into a SQLite database once per size."""
+    storage = SqliteActivityStorage(hass, "bench_template")
+    loop.run_until_complete(storage.async_import(json.loads(payload)))
+    loop.run_until_complete(storage.async_close())
+    return storage.path
+
+
+def create_entry(entity_id: Optional[str], backend: str) -> ConfigEntry:
+    """Create the benchmark config entry."""
+    return ConfigEntry(
+        version=1,
+        minor_version=1,
+        domain=DOMAIN,
+        title="Baby Care - Bench",
+        data={CONF_BABY_NAME: "Bench"},
+        source="user",
+        options={
+            CONF_DIAPER_PEE: f"{entity_id}:{MAPPED_DEVICE_ACTION}",
+            CONF_STORAGE_BACKEND: backend,
+        },
+        entry_id="bench_entry",
+    )
+
+
+@pytest.fixture
+def coordinator(
+    request: pytest.FixtureRequest,
+    hass: HomeAssistant,
+    loop,
+    payload: str,
+    mapped_device: str,
+    backend: str,
+) -> BabyCareCoordinator:
+    """Create a loaded coordinator over a stub store or a fresh copy of the SQLite database."""
+    entity_id = er.async_get(hass).async_get_entity_id("button", "zha", "bench_remote_button")
+    coordinator = BabyCareCoordinator(hass, create_entry(entity_id, backend))
+    if backend == STORAGE_BACKEND_SQLITE:
+        shutil.copyfile(request.getfixturevalue("sqlite_template"), coordinator._storage.path)
+    else:
+        coordinator._storage._store = StubStore(payload)
+    loop.run_until_complete(coordinator._async_load_data())
+    loop.run_until_complete(coordinator.async_refresh())
+    yield coordinator
+    loop.run_until_complete(coordinator.async_remove_entity_listeners())
+    loop.run_until_complete(coordinator.async_close())
+
+
+def test_load_data(benchmark, loop, coordinator: BabyCareCoordinator) -> None:
+    """Benchmark loading and parsing the full history."""
+    benchmark(lambda: loop.run_until_complete(coordinator._async_load_data()))
+
+
+def test_save_data(benchmark, loop, coordinator: BabyCareCoordinator) -> None:
+    """Benchmark a save, including the snapshot refresh it triggers."""
+    benchmark(lambda: loop.run_until_complete(coordinator._async_save_data()))
+
+
+def test_update_data(benchmark, loop, coordinator: BabyCareCoordinator) -> None:
+    """Benchmark the periodic snapshot refresh."""
+    benchmark(lambda: loop.run_until_complete(coordinator._async_update_data()))
+
+
+def test_get_daily_activities(benchmark, coordinator: BabyCareCoordinator) -> None:
+    """Benchmark today's activity lookups for every type."""
+
+    def _run() -> None:
+        for activity_type in ACTIVITY_TYPES:
+            coordinator.get_daily_activities(activity_type)
+
+    benchmark(_run)
+
+
+def test_get_last_activity(benchmark, coordinator: BabyCareCoordinator) -> None:
+    """Benchmark latest activity lookups for every type."""
+
+    def _run() -> None:
+        for activity_type in ACTIVITY_TYPES:
+            coordinator.get_last_activity(activity_type)
+
+    benchmark(_run)
+
+
+def test_get_activities_month(benchmark, coordinator: BabyCareCoordinator) -> None:
+    """Benchmark the calendar's month view lookup."""
+    end = datetime.now()
+    start = end - timedelta(days=31)
+    benchmark(lambda: coordinator.get_activities_between(start, end))
+
+
+@pytest.mark.parametrize("description", sensor.SENSORS, ids=lambda description: description.key)
+def test_sensor_state(benchmark, coordinator: BabyCareCoordinator, description) -> None:
+    """Benchmark a sensor's native_value and extra_state_attributes."""
+    entity = sensor.BabyCareSensor(coordinator, coordinator.baby_name, description)
+    benchmark(lambda: (entity.native_value, entity.extra_state_attributes))
+
+
+@pytest.mark.parametrize(
+    "description", binary_sensor.BINARY_SENSORS, ids=lambda description: description.key
+)
+def test_binary_sensor_state(benchmark, coordinator: BabyCareCoordinator, description) -> None:
+    """Benchmark a binary sensor's is_on and extra_state_attributes."""
+    entity = binary_sensor.BabyCareBinarySensor(coordinator, coordinator.baby_name, description)
+    benchmark(lambda: (entity.is_on, entity.extra_state_attributes))
+
+
+def test_button_event_flood(
+    benchmark, loop, hass: HomeAssistant, coordinator: BabyCareCoordinator, mapped_device: str
+) -> None:
+    """Benchmark routing a flood of button events, a share of them presses of the mapped action.
+
+    Each round starts with a fresh throttle, so the first mapped press runs
+    its queued mutation and save and the rest are debounced.
+    """
+    loop.run_until_complete(coordinator.async_setup_entity_listeners())
+    events = [
+        Event(
+            "zha_event",
+            {
+                "device_id": mapped_device if i % 10 == 0 else f"unknown_{i % 50}",
+                "command": MAPPED_DEVICE_ACTION if i % 20 == 0 else "arrow_right_click",
+            },
+        )
+        for i in range(EVENT_FLOOD_SIZE)
+    ]
+
+    def _run() -> None:
+        coordinator.trigger_throttle = TriggerThrottle()
+        for event in events:
+            coordinator._async_button_event_received(event)
+        loop.run_until_complete(hass.async_block_till_done())
+
+    history_size = coordinator.history_size
+    benchmark(_run)
+    assert coordinator.history_size > history_size
@@ -12,15 +12,19 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.components.http import HomeAssistantView
 
-from .const import DOMAIN
+from .const import DOMAIN, CONF_STORAGE_BACKEND, CONF_UNRECORDED_SENSORS, DEFAULT_STORAGE_BACKEND
 from .coordinator import BabyCareCoordinator
+from .device_catalog import async_setup_device_catalog
 from .panel import async_register_panel, async_unregister_panel
+from .services import async_setup_services
+from .sync import peer_options
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: list[Platform] = [
     Platform.SENSOR,
     Platform.BINARY_SENSOR,
+    Platform.CALENDAR,
 ]
 
 
@@ -57,6 +61,12 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     # Register the HTTP view for serving panel files
     hass.http.register_view(BabyCareTrackerView())
     
+    # Register services once for all babies
+    await async_setup_services(hass)
+    
+    # Serve the device trigger catalog used by the mapping panel
+    async_setup_device_catalog(hass)
+    
     return True
 
 
@@ -68,30 +78,60 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     
     hass.data[DOMAIN][entry.entry_id] = coordinator
     
+    # Schedule overdue and long sleep alerts
+    coordinator.alerts.async_start()
+    
+    # Exchange history changes with the peer Home Assistant
+    if coordinator.peer_sync is not None:
+        coordinator.peer_sync.async_start()
+    
     # Setup platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     
-    # Register services
-    await coordinator.async_register_services()
-    
     # Setup entity state listeners for button mapping
     await coordinator.async_setup_entity_listeners()
     
     # Register the dashboard panel
     await async_register_panel(hass)
     
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
+    
     return True
 
 
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed options, reloading when the storage backend, recorded sensors or sync peer change."""
+    coordinator: BabyCareCoordinator = hass.data[DOMAIN][entry.entry_id]
+    backend = entry.options.get(CONF_STORAGE_BACKEND, DEFAULT_STORAGE_BACKEND)
+    
+    unrecorded_sensors = entry.options.get(CONF_UNRECORDED_SENSORS, [])
+    
+    if (
+        backend == coordinator.storage_backend
+        and unrecorded_sensors == coordinator.unrecorded_sensors
+        and peer_options(entry.options) == coordinator.sync_peer
+    ):
+        # Rewire only the button mappings that changed
+        await coordinator.async_setup_entity_listeners()
+        # Baby details and alert thresholds are read on demand, refresh what uses them
+        coordinator.async_update_listeners()
+        return
+    
+    if backend != coordinator.storage_backend:
+        await coordinator.async_migrate_storage(backend)
+    # State classes and the sync peer are set up with the entry, so reload it
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     coordinator: BabyCareCoordinator = hass.data[DOMAIN][entry.entry_id]
     
-    # Unregister services
-    await coordinator.async_unregister_services()
-    
-    # Remove entity listeners
+    # Remove entity listeners, alert timers and peer sync
     await coordinator.async_remove_entity_listeners()
+    coordinator.alerts.async_stop()
+    if coordinator.peer_sync is not None:
+        coordinator.peer_sync.async_stop()
     
     # Unregister the dashboard panel
     await async_unregister_panel(hass)
@@ -99,6 +139,7 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     
     if unload_ok:
+        await coordinator.async_close()
         hass.data[DOMAIN].pop(entry.entry_id)
     
     return unload_ok
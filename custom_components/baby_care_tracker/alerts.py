@@ -0,0 +1,189 @@
+"""Deadline alerts for Baby Care Tracker."""
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
+
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.event import async_track_point_in_time
+
+from .const import (
+    ACTIVITY_BOTTLE_FEEDING,
+    ACTIVITY_DIAPER,
+    ACTIVITY_FEEDING,
+    ALERT_DIAPER_OVERDUE,
+    ALERT_FEEDING_OVERDUE,
+    ALERT_LONG_SLEEP,
+    ALERT_TYPES,
+    CONF_DIAPER_ALERT_HOURS,
+    CONF_FEEDING_ALERT_HOURS,
+    CONF_SLEEP_ALERT_HOURS,
+    DEFAULT_DIAPER_ALERT_HOURS,
+    DEFAULT_FEEDING_ALERT_HOURS,
+    DEFAULT_SLEEP_ALERT_HOURS,
+    EVENT_ALERT,
+)
+
+if TYPE_CHECKING:
+    from .coordinator import BabyCareCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Alert -> (threshold option, default hours)
+ALERT_THRESHOLDS = {
+    ALERT_FEEDING_OVERDUE: (CONF_FEEDING_ALERT_HOURS, DEFAULT_FEEDING_ALERT_HOURS),
+    ALERT_LONG_SLEEP: (CONF_SLEEP_ALERT_HOURS, DEFAULT_SLEEP_ALERT_HOURS),
+    ALERT_DIAPER_OVERDUE: (CONF_DIAPER_ALERT_HOURS, DEFAULT_DIAPER_ALERT_HOURS),
+}
+
+
+def _activity_start(activity: Optional[Dict[str, Any]]) -> Optional[datetime]:
+    """Return when an activity started."""
+    if not activity:
+        return None
+    return datetime.fromisoformat(activity.get("start_time") or activity["timestamp"])
+
+
+class AlertManager:
+    """Schedule one timer per pending alert deadline.
+
+    Deadlines are recomputed from the coordinator snapshot whenever it
+    refreshes; a timer is only replaced when its deadline moved, so logging
+    a matching activity reschedules it and nothing polls the clock.
+    """
+
+    def __init__(self, coordinator: BabyCareCoordinator) -> None:
+        """Initialize the alert manager."""
+        self.coordinator = coordinator
+        self.hass = coordinator.hass
+        self._deadlines: Dict[str, Optional[datetime]] = {}
+        self._timers: Dict[str, CALLBACK_TYPE] = {}
+        self._active: Dict[str, datetime] = {}
+        self._unsub_coordinator: Optional[CALLBACK_TYPE] = None
+
+    def threshold(self, alert: str) -> timedelta:
+        """Return the configured threshold of an alert."""
+        option, default = ALERT_THRESHOLDS[alert]
+        hours = self.coordinator.entry.options.get(option, default)
+        return timedelta(hours=float(hours or 0))
+
+    def _reference_time(self, alert: str) -> Optional[datetime]:
+        """Return the time an alert's threshold is counted from."""
+        coordinator = self.coordinator
+        if alert == ALERT_LONG_SLEEP:
+            return _activity_start(coordinator.current_sleep_info)
+
+        if alert == ALERT_FEEDING_OVERDUE:
+            if coordinator.is_currently_feeding:
+                return None
+            starts = [
+                start for start in (
+                    _activity_start(coordinator.get_last_activity(ACTIVITY_FEEDING)),
+                    _activity_start(coordinator.get_last_activity(ACTIVITY_BOTTLE_FEEDING)),
+                )
+                if start is not None
+            ]
+            return max(starts, default=None)
+
+        return _activity_start(coordinator.get_last_activity(ACTIVITY_DIAPER))
+
+    def _deadline(self, alert: str) -> Optional[datetime]:
+        """Return when an alert becomes due, or None if it is disabled or idle."""
+        threshold = self.threshold(alert)
+        if threshold <= timedelta(0):
+            return None
+        reference = self._reference_time(alert)
+        if reference is None:
+            return None
+        return (reference + threshold).astimezone()
+
+    @callback
+    def async_start(self) -> None:
+        """Schedule the alerts and follow coordinator updates."""
+        self._unsub_coordinator = self.coordinator.async_add_listener(self.async_reschedule)
+        self.async_reschedule()
+
+    @callback
+    def async_stop(self) -> None:
+        """Cancel all timers."""
+        if self._unsub_coordinator is not None:
+            self._unsub_coordinator()
+            self._unsub_coordinator = None
+        for cancel in self._timers.values():
+            cancel()
+        self._timers.clear()
+
+    @callback
+    def async_reschedule(self) -> None:
+        """Move the timers whose deadline changed.
+
+        A deadline that already passed when the alerts start, after a restart
+        or reload, was alerted before, so the alert is active without firing
+        its event again.
+        """
+        now = datetime.now().astimezone()
+        for alert in ALERT_TYPES:
+            deadline = self._deadline(alert)
+            starting = alert not in self._deadlines
+            if not starting and deadline == self._deadlines[alert]:
+                continue
+
+            self._deadlines[alert] = deadline
+            self._active.pop(alert, None)
+            if (cancel := self._timers.pop(alert, None)) is not None:
+                cancel()
+
+            if deadline is None:
+                continue
+            if deadline <= now:
+                if starting:
+                    self._active[alert] = deadline
+                else:
+                    self._async_trigger(alert)
+                continue
+            self._timers[alert] = async_track_point_in_time(
+                self.hass, self._deadline_callback(alert), deadline
+            )
+
+    def _deadline_callback(self, alert: str) -> Callable[[datetime], None]:
+        """Return the timer callback of an alert."""
+
+        @callback
+        def _async_deadline_reached(now: datetime) -> None:
+            """Trigger the alert and update the binary sensors."""
+            self._timers.pop(alert, None)
+            self._async_trigger(alert)
+            self.coordinator.async_update_listeners()
+
+        return _async_deadline_reached
+
+    @callback
+    def _async_trigger(self, alert: str) -> None:
+        """Mark an alert active and fire its event."""
+        deadline = self._deadlines[alert]
+        self._active[alert] = deadline
+        threshold_hours = self.threshold(alert).total_seconds() / 3600
+        _LOGGER.info(f"{self.coordinator.baby_name}: {alert} alert after {threshold_hours:g} hours")
+        self.hass.bus.async_fire(
+            EVENT_ALERT,
+            {
+                "baby": self.coordinator.baby_name,
+                "config_entry_id": self.coordinator.entry.entry_id,
+                "alert": alert,
+                "since": (deadline - self.threshold(alert)).isoformat(),
+                "threshold_hours": threshold_hours,
+            },
+        )
+
+    def is_active(self, alert: str) -> bool:
+        """Return whether an alert is due."""
+        return alert in self._active
+
+    def get_info(self, alert: str) -> Dict[str, Any]:
+        """Return the deadline and threshold of an alert."""
+        deadline = self._deadlines.get(alert)
+        return {
+            "deadline": deadline.isoformat() if deadline else None,
+            "threshold_hours": self.threshold(alert).total_seconds() / 3600,
+        }
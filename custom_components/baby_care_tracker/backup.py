@@ -0,0 +1,249 @@
+"""Incremental backups and point-in-time restore of a baby's history."""
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+import logging
+import os
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+
+from .const import BACKUP_DIR
+from .sync import FIELD_DELETED, FIELD_MODIFIED_AT, FIELD_SEQ
+
+if TYPE_CHECKING:
+    from .coordinator import BabyCareCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+BACKUP_FORMAT = 1
+
+# Segments after a snapshot before the next backup starts a new chain
+BACKUP_MAX_SEGMENTS = 30
+
+KIND_SNAPSHOT = "snapshot"
+KIND_SEGMENT = "segment"
+
+SESSION_KEYS = ("current_feeding", "current_sleep")
+
+# File names sort by creation time, e.g. 20260101T120000000000Z-snapshot.jsonl.gz
+BACKUP_SUFFIX = ".jsonl.gz"
+BACKUP_TIME_FORMAT = "%Y%m%dT%H%M%S%fZ"
+
+
+def backup_name(created: datetime, kind: str) -> str:
+    """Return the file name of a backup."""
+    return f"{created.strftime(BACKUP_TIME_FORMAT)}-{kind}{BACKUP_SUFFIX}"
+
+
+def list_backups(directory: str) -> List[Tuple[datetime, str, str]]:
+    """Return the (creation time, kind, path) of the backups in a directory, oldest first."""
+    if not os.path.isdir(directory):
+        return []
+    backups = []
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(BACKUP_SUFFIX):
+            continue
+        stamp, _, kind = name[: -len(BACKUP_SUFFIX)].partition("-")
+        try:
+            created = datetime.strptime(stamp, BACKUP_TIME_FORMAT).replace(tzinfo=timezone.utc)
+        except ValueError:
+            continue
+        if kind in (KIND_SNAPSHOT, KIND_SEGMENT):
+            backups.append((created, kind, os.path.join(directory, name)))
+    return backups
+
+
+def read_entries(path: str) -> Iterator[Dict[str, Any]]:
+    """Stream a backup file, the header first and then its activities or tombstones."""
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        for line in file:
+            yield json.loads(line)
+
+
+def _last_backup(directory: str) -> Tuple[Optional[Dict[str, Any]], int]:
+    """Return the header of the latest backup and the number of segments since its snapshot."""
+    backups = list_backups(directory)
+    if not backups:
+        return None, 0
+    segments = 0
+    for _, kind, _ in reversed(backups):
+        if kind == KIND_SNAPSHOT:
+            break
+        segments += 1
+    return next(read_entries(backups[-1][2])), segments
+
+
+def _write_backup(path: str, header: Dict[str, Any], entries: Iterable[Dict[str, Any]]) -> int:
+    """Write a backup file atomically, returning its size in bytes."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with gzip.open(temp_path, "wt", encoding="utf-8") as file:
+        file.write(json.dumps(header, separators=(",", ":")) + "\n")
+        for entry in entries:
+            entry.pop(FIELD_SEQ, None)
+            file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+    os.replace(temp_path, path)
+    return os.path.getsize(path)
+
+
+def _modified_at(entry: Dict[str, Any]) -> Optional[datetime]:
+    """Return when an activity or tombstone was last changed, if it was changed since sync existed."""
+    modified_at = entry.get(FIELD_MODIFIED_AT)
+    return dt_util.parse_datetime(modified_at) if modified_at else None
+
+
+def _read_history(
+    directory: str, at: Optional[datetime]
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Rebuild the history as of a time from the backups, one file and line at a time.
+
+    Starts at the last snapshot taken at or before the time and applies the
+    segments after it. The first segment taken after the time is applied
+    only for the changes made before the time. Returns the activities and
+    the header of the last backup applied in full.
+    """
+    backups = list_backups(directory)
+    eligible = [backup for backup in backups if at is None or backup[0] <= at]
+    start = next(
+        (index for index in range(len(eligible) - 1, -1, -1) if eligible[index][1] == KIND_SNAPSHOT),
+        None,
+    )
+    if start is None:
+        raise HomeAssistantError(
+            "No backup found" + (f" from before {at.isoformat()}" if at else "")
+        )
+
+    activities: Dict[str, Dict[str, Any]] = {}
+    header: Dict[str, Any] = {}
+    for index in range(start, len(backups)):
+        created, kind, path = backups[index]
+        partial = at is not None and created > at
+        if partial and kind == KIND_SNAPSHOT:
+            break
+        entries = read_entries(path)
+        file_header = next(entries)
+        if file_header.get("format") != BACKUP_FORMAT:
+            raise HomeAssistantError(f"Unsupported backup format in {os.path.basename(path)}")
+        for entry in entries:
+            if partial:
+                modified_at = _modified_at(entry)
+                if modified_at is not None and modified_at > at:
+                    continue
+            if entry.get(FIELD_DELETED):
+                activities.pop(entry["id"], None)
+            else:
+                activities[entry["id"]] = entry
+        if partial:
+            break
+        header = file_header
+    return list(activities.values()), header
+
+
+class HistoryBackup:
+    """Backups of a baby's history in a local directory.
+
+    A backup chain starts with a snapshot of the whole history followed by
+    segments holding only the activities changed or deleted since the
+    backup before, found through the sync log. Files are gzipped JSON
+    lines, a header and then one activity or tombstone per line, so a
+    restore streams through them instead of loading them at once.
+    """
+
+    def __init__(self, coordinator: BabyCareCoordinator) -> None:
+        """Initialize the backups."""
+        self.coordinator = coordinator
+        self.hass = coordinator.hass
+        self.directory = coordinator.hass.config.path(BACKUP_DIR, coordinator.entry.entry_id)
+        self._lock = asyncio.Lock()
+
+    async def async_backup(self, full: bool = False) -> Dict[str, Any]:
+        """Back up the changes since the last backup, or the whole history."""
+        async with self._lock:
+            return await self._async_backup(full)
+
+    async def _async_backup(self, full: bool) -> Dict[str, Any]:
+        """Write the next backup file."""
+        last, segments = await self.hass.async_add_executor_job(_last_backup, self.directory)
+        log = self.coordinator.sync
+        created = dt_util.utcnow()
+        header = {
+            "format": BACKUP_FORMAT,
+            "baby": self.coordinator.baby_name,
+            "created": created.isoformat(),
+            "instance_id": log.instance_id,
+            "sequence": log.sequence,
+            "current_feeding": self.coordinator.current_feeding_info,
+            "current_sleep": self.coordinator.current_sleep_info,
+        }
+
+        if (
+            full
+            or last is None
+            or last.get("instance_id") != log.instance_id
+            or last.get("sequence", 0) > log.sequence
+            or segments >= BACKUP_MAX_SEGMENTS
+        ):
+            kind = KIND_SNAPSHOT
+            entries = self.coordinator.get_history_snapshot()
+        else:
+            kind = KIND_SEGMENT
+            header["since"] = last["sequence"]
+            entries, _, _ = log.changes_since(last["sequence"], self.coordinator.get_activity, limit=None)
+            if not entries and all(last.get(key) == header[key] for key in SESSION_KEYS):
+                return {
+                    "baby": self.coordinator.baby_name,
+                    "kind": None,
+                    "file": None,
+                    "entries": 0,
+                    "size_bytes": 0,
+                    "created": last.get("created"),
+                }
+
+        path = os.path.join(self.directory, backup_name(created, kind))
+        size = await self.hass.async_add_executor_job(_write_backup, path, header, entries)
+        _LOGGER.info(f"Backed up {len(entries)} {self.coordinator.baby_name} activities to {path}")
+        return {
+            "baby": self.coordinator.baby_name,
+            "kind": kind,
+            "file": path,
+            "entries": len(entries),
+            "size_bytes": size,
+            "created": header["created"],
+        }
+
+    async def async_restore(self, at: Optional[datetime] = None) -> Dict[str, Any]:
+        """Restore the history as of a time, the latest backup by default.
+
+        The current history is backed up first, so a restore can be undone
+        by restoring to the time before it.
+        """
+        async with self._lock:
+            if at is not None:
+                target = dt_util.as_utc(at)
+            else:
+                backups = await self.hass.async_add_executor_job(list_backups, self.directory)
+                if not backups:
+                    raise HomeAssistantError(f"No backup of {self.coordinator.baby_name} found")
+                target = backups[-1][0]
+            before = await self._async_backup(False)
+            activities, header = await self.hass.async_add_executor_job(
+                _read_history, self.directory, target
+            )
+        counts = await self.coordinator.async_restore_history(
+            activities, {key: header.get(key) for key in SESSION_KEYS}
+        )
+        _LOGGER.info(
+            f"Restored {self.coordinator.baby_name} history as of {target.isoformat()}: {counts}"
+        )
+        return {
+            "baby": self.coordinator.baby_name,
+            "restored_to": target.isoformat(),
+            "backup_before_restore": before["file"],
+            "activities": len(activities),
+            **counts,
+        }
@@ -2,23 +2,120 @@
 from __future__ import annotations
 
 import logging
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Callable, Dict, List, Optional
 
 from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
     BinarySensorEntity,
+    BinarySensorEntityDescription,
 )
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, CONF_BABY_NAME
+from .const import (
+    DOMAIN,
+    CONF_BABY_NAME,
+    ACTIVITY_FEEDING,
+    ACTIVITY_SLEEPING,
+    ALERT_FEEDING_OVERDUE,
+    ALERT_LONG_SLEEP,
+    ALERT_DIAPER_OVERDUE,
+)
 from .coordinator import BabyCareCoordinator
+from .entity import BabyCareEntity, async_enabled_descriptions
 
 _LOGGER = logging.getLogger(__name__)
 
+# Alert -> (name, icon)
+ALERT_SENSORS = {
+    ALERT_FEEDING_OVERDUE: ("Feeding Overdue", "mdi:baby-bottle-outline"),
+    ALERT_LONG_SLEEP: ("Long Sleep", "mdi:sleep-off"),
+    ALERT_DIAPER_OVERDUE: ("Diaper Overdue", "mdi:alert-circle-outline"),
+}
+
+
+@dataclass(frozen=True, kw_only=True)
+class BabyCareBinarySensorEntityDescription(BinarySensorEntityDescription):
+    """Describes a baby care binary sensor by the queries behind its state and attributes."""
+
+    is_on_fn: Callable[[BabyCareCoordinator], bool]
+    attr_fn: Optional[Callable[[BabyCareCoordinator], Dict[str, Any]]] = None
+    # "state" or an attribute -> smallest change that is written
+    significant_changes: Dict[str, float] = field(default_factory=dict)
+    # Measures a running session against the current time, so it is never memoized
+    live: bool = False
+
+
+def _currently_feeding_attributes(coordinator: BabyCareCoordinator) -> Dict[str, Any]:
+    """Return the details of the in-progress feeding."""
+    if not coordinator.is_currently_feeding:
+        return {}
+
+    feeding_info = coordinator.current_feeding_info
+    start_time = coordinator.get_session_start(ACTIVITY_FEEDING)
+    duration = (datetime.now() - start_time).total_seconds()
+
+    return {
+        "feeding_side": feeding_info.get("side"),
+        "start_time": feeding_info.get("start_time"),
+        "duration_minutes": round(duration / 60, 1),
+        "notes": feeding_info.get("notes", ""),
+    }
+
+
+def _currently_sleeping_attributes(coordinator: BabyCareCoordinator) -> Dict[str, Any]:
+    """Return the details of the in-progress sleep."""
+    if not coordinator.is_currently_sleeping:
+        return {}
+
+    sleep_info = coordinator.current_sleep_info
+    start_time = coordinator.get_session_start(ACTIVITY_SLEEPING)
+    duration = (datetime.now() - start_time).total_seconds()
+
+    return {
+        "start_time": sleep_info.get("start_time"),
+        "duration_hours": round(duration / 3600, 1),
+        "notes": sleep_info.get("notes", ""),
+    }
+
+
+BINARY_SENSORS: List[BabyCareBinarySensorEntityDescription] = [
+    BabyCareBinarySensorEntityDescription(
+        key="currently_feeding",
+        name="Currently Feeding",
+        icon="mdi:baby-bottle",
+        is_on_fn=lambda coordinator: coordinator.is_currently_feeding,
+        attr_fn=_currently_feeding_attributes,
+        significant_changes={"duration_minutes": 5},
+        live=True,
+    ),
+    BabyCareBinarySensorEntityDescription(
+        key="currently_sleeping",
+        name="Currently Sleeping",
+        device_class=BinarySensorDeviceClass.OCCUPANCY,
+        icon="mdi:sleep",
+        is_on_fn=lambda coordinator: coordinator.is_currently_sleeping,
+        attr_fn=_currently_sleeping_attributes,
+        significant_changes={"duration_hours": 0.25},
+        live=True,
+    ),
+    *(
+        BabyCareBinarySensorEntityDescription(
+            key=alert,
+            name=name,
+            device_class=BinarySensorDeviceClass.PROBLEM,
+            icon=icon,
+            is_on_fn=lambda coordinator, alert=alert: coordinator.alerts.is_active(alert),
+            attr_fn=lambda coordinator, alert=alert: coordinator.alerts.get_info(alert),
+        )
+        for alert, (name, icon) in ALERT_SENSORS.items()
+    ),
+]
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -29,90 +126,48 @@ async def async_setup_entry(
     coordinator: BabyCareCoordinator = hass.data[DOMAIN][config_entry.entry_id]
     baby_name = config_entry.data.get(CONF_BABY_NAME, "Baby")
 
-    entities = [
-        BabyCurrentlyFeedingBinarySensor(coordinator, baby_name),
-        BabyCurrentlySleepingBinarySensor(coordinator, baby_name),
-    ]
+    async_add_entities(
+        BabyCareBinarySensor(coordinator, baby_name, description)
+        for description in async_enabled_descriptions(
+            hass, Platform.BINARY_SENSOR, baby_name, BINARY_SENSORS
+        )
+    )
 
-    async_add_entities(entities)
 
+class BabyCareBinarySensor(BabyCareEntity, BinarySensorEntity):
+    """Baby care binary sensor whose state and attributes come from its description."""
 
-class BabyCareBinarySensorBase(CoordinatorEntity, BinarySensorEntity):
-    """Base class for baby care binary sensors."""
-
-    def __init__(self, coordinator: BabyCareCoordinator, baby_name: str, sensor_type: str) -> None:
-        """Initialize the binary sensor."""
-        super().__init__(coordinator)
-        self._baby_name = baby_name
-        self._sensor_type = sensor_type
-        self._attr_unique_id = f"{DOMAIN}_{baby_name}_{sensor_type}".lower().replace(" ", "_")
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, baby_name)},
-            "name": f"Baby Care - {baby_name}",
-            "manufacturer": "Baby Care Tracker",
-            "model": "Baby Monitor",
-        }
-
-
-class BabyCurrentlyFeedingBinarySensor(BabyCareBinarySensorBase):
-    """Binary sensor for currently feeding status."""
-
-    def __init__(self, coordinator: BabyCareCoordinator, baby_name: str) -> None:
-        """Initialize the binary sensor."""
-        super().__init__(coordinator, baby_name, "currently_feeding")
-        self._attr_name = f"{baby_name} Currently Feeding"
-        self._attr_icon = "mdi:baby-bottle"
+    entity_description: BabyCareBinarySensorEntityDescription
 
-    @property
-    def is_on(self) -> bool:
-        """Return true if currently feeding."""
-        return self.coordinator.is_currently_feeding
+    # Live durations change on every update
+    _unrecorded_attributes = frozenset({"duration_minutes", "duration_hours"})
 
-    @property
-    def extra_state_attributes(self) -> Dict[str, Any]:
-        """Return additional state attributes."""
-        if not self.coordinator.is_currently_feeding:
-            return {}
-        
-        feeding_info = self.coordinator.current_feeding_info
-        start_time = datetime.fromisoformat(feeding_info["start_time"])
-        duration = (datetime.now() - start_time).total_seconds()
-        
-        return {
-            "feeding_side": feeding_info.get("side"),
-            "start_time": feeding_info.get("start_time"),
-            "duration_minutes": round(duration / 60, 1),
-            "notes": feeding_info.get("notes", ""),
-        }
-
-
-class BabyCurrentlySleepingBinarySensor(BabyCareBinarySensorBase):
-    """Binary sensor for currently sleeping status."""
-
-    def __init__(self, coordinator: BabyCareCoordinator, baby_name: str) -> None:
+    def __init__(
+        self,
+        coordinator: BabyCareCoordinator,
+        baby_name: str,
+        description: BabyCareBinarySensorEntityDescription,
+    ) -> None:
         """Initialize the binary sensor."""
-        super().__init__(coordinator, baby_name, "currently_sleeping")
-        self._attr_name = f"{baby_name} Currently Sleeping"
-        self._attr_device_class = BinarySensorDeviceClass.OCCUPANCY
-        self._attr_icon = "mdi:sleep"
+        super().__init__(coordinator, baby_name, description.key)
+        self.entity_description = description
+        self._attr_name = f"{baby_name} {description.name}"
+        self._significant_changes = description.significant_changes
 
     @property
     def is_on(self) -> bool:
-        """Return true if currently sleeping."""
-        return self.coordinator.is_currently_sleeping
+        """Return the state from the description's query."""
+        return self.entity_description.is_on_fn(self.coordinator)
 
     @property
-    def extra_state_attributes(self) -> Dict[str, Any]:
-        """Return additional state attributes."""
-        if not self.coordinator.is_currently_sleeping:
-            return {}
-        
-        sleep_info = self.coordinator.current_sleep_info
-        start_time = datetime.fromisoformat(sleep_info["start_time"])
-        duration = (datetime.now() - start_time).total_seconds()
-        
-        return {
-            "start_time": sleep_info.get("start_time"),
-            "duration_hours": round(duration / 3600, 1),
-            "notes": sleep_info.get("notes", ""),
-        }
+    def extra_state_attributes(self) -> Optional[Dict[str, Any]]:
+        """Return the attributes from the description's query."""
+        attr_fn = self.entity_description.attr_fn
+        if attr_fn is None:
+            return None
+        if self.entity_description.live:
+            return attr_fn(self.coordinator)
+        return self.coordinator.memoize(
+            (Platform.BINARY_SENSOR, self._sensor_type, "attributes"),
+            lambda: attr_fn(self.coordinator),
+        )
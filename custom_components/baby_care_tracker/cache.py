@@ -0,0 +1,58 @@
+"""Bounded cache of values derived from one generation of coordinator data."""
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+# Entries kept per cache
+DEFAULT_CACHE_SIZE = 64
+
+
+class GenerationCache:
+    """Least recently used cache that empties when the data generation moves on.
+
+    Values are computed from coordinator data, so they stay valid until the
+    coordinator bumps its generation; the size bound keeps arbitrary query
+    keys from growing the cache within one generation.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE) -> None:
+        """Initialize an empty cache."""
+        self.maxsize = maxsize
+        self.generation = -1
+        self.hits = 0
+        self.misses = 0
+        self._values: OrderedDict[Hashable, Any] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of cached values."""
+        return len(self._values)
+
+    def get(self, generation: int, key: Hashable, compute: Callable[[], T]) -> T:
+        """Return the cached value of a key, computing it on a miss."""
+        if generation != self.generation:
+            self._values.clear()
+            self.generation = generation
+
+        if key in self._values:
+            self.hits += 1
+            self._values.move_to_end(key)
+            return self._values[key]
+
+        self.misses += 1
+        value = compute()
+        self._values[key] = value
+        if len(self._values) > self.maxsize:
+            self._values.popitem(last=False)
+        return value
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Summarize the cache for diagnostics."""
+        return {
+            "generation": self.generation,
+            "size": len(self._values),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
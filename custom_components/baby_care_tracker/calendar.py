@@ -0,0 +1,119 @@
+"""Calendar platform for Baby Care Tracker."""
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from homeassistant.components.calendar import CalendarEntity, CalendarEvent
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import (
+    DOMAIN,
+    CONF_BABY_NAME,
+    ACTIVITY_FEEDING,
+    ACTIVITY_SLEEPING,
+    ACTIVITY_DIAPER,
+    ACTIVITY_BOTTLE_FEEDING,
+    ACTIVITY_GROWTH,
+)
+from .coordinator import BabyCareCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Length shown for activities logged at a single point in time
+POINT_EVENT_DURATION = timedelta(minutes=1)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the Baby Care Tracker calendar."""
+    coordinator: BabyCareCoordinator = hass.data[DOMAIN][config_entry.entry_id]
+    baby_name = config_entry.data.get(CONF_BABY_NAME, "Baby")
+
+    async_add_entities([BabyActivityCalendar(coordinator, baby_name)])
+
+
+def _activity_summary(activity: Dict[str, Any]) -> str:
+    """Return the event title of an activity."""
+    activity_type = activity.get("type")
+    if activity_type == ACTIVITY_FEEDING:
+        return f"Feeding ({activity.get('side', 'unknown')})"
+    if activity_type == ACTIVITY_SLEEPING:
+        return "Sleep"
+    if activity_type == ACTIVITY_DIAPER:
+        return f"Diaper ({activity.get('diaper_type', 'unknown')})"
+    if activity_type == ACTIVITY_BOTTLE_FEEDING:
+        return f"Bottle {activity.get('amount_ml', 0)} ml"
+    if activity_type == ACTIVITY_GROWTH:
+        measurements = []
+        if activity.get("weight_kg") is not None:
+            measurements.append(f"{activity['weight_kg']} kg")
+        if activity.get("height_cm") is not None:
+            measurements.append(f"{activity['height_cm']} cm")
+        return " ".join(["Growth", *measurements])
+    return str(activity_type).replace("_", " ").capitalize()
+
+
+def _activity_event(activity: Dict[str, Any]) -> CalendarEvent:
+    """Convert an activity into a calendar event."""
+    if activity.get("start_time"):
+        start = datetime.fromisoformat(activity["start_time"])
+        if activity.get("end_time"):
+            end = datetime.fromisoformat(activity["end_time"])
+        else:
+            # Keep sessions in progress open slightly past now so the calendar is on
+            end = datetime.now() + POINT_EVENT_DURATION
+    else:
+        start = datetime.fromisoformat(activity["timestamp"])
+        end = start
+    end = max(end, start + POINT_EVENT_DURATION)
+
+    return CalendarEvent(
+        start=start.astimezone(),
+        end=end.astimezone(),
+        summary=_activity_summary(activity),
+        description=activity.get("notes") or None,
+        uid=activity.get("id"),
+    )
+
+
+class BabyActivityCalendar(CoordinatorEntity, CalendarEntity):
+    """Calendar of logged feedings, sleeps, diapers and measurements."""
+
+    def __init__(self, coordinator: BabyCareCoordinator, baby_name: str) -> None:
+        """Initialize the calendar."""
+        super().__init__(coordinator)
+        self._baby_name = baby_name
+        self._attr_unique_id = f"{DOMAIN}_{baby_name}_activities".lower().replace(" ", "_")
+        self._attr_name = f"{baby_name} Activities"
+        self._attr_icon = "mdi:calendar-heart"
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, baby_name)},
+            "name": f"Baby Care - {baby_name}",
+            "manufacturer": "Baby Care Tracker",
+            "model": "Baby Monitor",
+        }
+
+    @property
+    def event(self) -> Optional[CalendarEvent]:
+        """Return the feeding or sleep in progress."""
+        current = self.coordinator.current_feeding_info or self.coordinator.current_sleep_info
+        if current is None:
+            return None
+        return _activity_event(current)
+
+    async def async_get_events(
+        self, hass: HomeAssistant, start_date: datetime, end_date: datetime
+    ) -> List[CalendarEvent]:
+        """Return the activities within a time range from the time index."""
+        return [
+            _activity_event(activity)
+            for activity in self.coordinator.get_activities_between(start_date, end_date)
+        ]
@@ -0,0 +1,115 @@
+"""Searchable index of entities that can be mapped to baby care actions."""
+from __future__ import annotations
+
+import heapq
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from homeassistant.core import HomeAssistant, split_entity_id
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+
+# Most entities offered by one search
+MAX_CANDIDATES = 100
+
+# Integrations whose remotes send button events with named actions
+BUTTON_EVENT_PLATFORMS = {"zha", "deconz"}
+# Domains of entities that report button presses
+BUTTON_DOMAINS = {"button", "input_button", "event"}
+
+
+class MappingCandidateIndex:
+    """Entities of the mapping domains bucketed by domain, area and device.
+
+    Built once from the registries and the state machine; a search starts
+    from the smallest matching bucket and returns a capped list.
+    """
+
+    def __init__(self, hass: HomeAssistant, domains: Iterable[str]) -> None:
+        """Build the index."""
+        self.domains = set(domains)
+        self._names: Dict[str, str] = {}
+        self._search_text: Dict[str, str] = {}
+        self.by_domain: Dict[str, Set[str]] = {}
+        self.by_area: Dict[str, Set[str]] = {}
+        self.by_device: Dict[str, Set[str]] = {}
+        self.button_devices: Set[str] = set()
+
+        entity_registry = er.async_get(hass)
+        device_registry = dr.async_get(hass)
+
+        for entry in entity_registry.entities.values():
+            domain = split_entity_id(entry.entity_id)[0]
+            if domain not in self.domains or entry.disabled_by is not None:
+                continue
+            device = device_registry.async_get(entry.device_id) if entry.device_id else None
+            area_id = entry.area_id or (device.area_id if device else None)
+            name = entry.name or entry.original_name
+            if device is not None:
+                name = " ".join(part for part in (device.name_by_user or device.name, name) if part)
+            self._add(entry.entity_id, name or entry.entity_id, area_id, entry.device_id)
+            if entry.device_id and (domain in BUTTON_DOMAINS or entry.platform in BUTTON_EVENT_PLATFORMS):
+                self.button_devices.add(entry.device_id)
+
+        # Entities without a unique ID only exist in the state machine
+        for domain in self.domains:
+            for state in hass.states.async_all(domain):
+                if state.entity_id not in self._names:
+                    self._add(state.entity_id, state.name, None, None)
+
+    def _add(
+        self, entity_id: str, name: str, area_id: Optional[str], device_id: Optional[str]
+    ) -> None:
+        """Add an entity to the buckets."""
+        self._names[entity_id] = name
+        self._search_text[entity_id] = f"{name} {entity_id}".lower()
+        self.by_domain.setdefault(split_entity_id(entity_id)[0], set()).add(entity_id)
+        if area_id:
+            self.by_area.setdefault(area_id, set()).add(entity_id)
+        if device_id:
+            self.by_device.setdefault(device_id, set()).add(entity_id)
+
+    def __len__(self) -> int:
+        """Return the number of indexed entities."""
+        return len(self._names)
+
+    def name(self, entity_id: str) -> str:
+        """Return the display name of an entity."""
+        return self._names.get(entity_id, entity_id)
+
+    def search(
+        self,
+        query: str = "",
+        domain: Optional[str] = None,
+        area_id: Optional[str] = None,
+        button_devices_only: bool = False,
+        limit: int = MAX_CANDIDATES,
+    ) -> Tuple[List[str], bool]:
+        """Return matching entity IDs sorted by name, and whether results were cut."""
+        buckets: List[Set[str]] = []
+        if domain:
+            buckets.append(self.by_domain.get(domain, set()))
+        if area_id:
+            buckets.append(self.by_area.get(area_id, set()))
+        if button_devices_only:
+            buckets.append({
+                entity_id
+                for device_id in self.button_devices
+                for entity_id in self.by_device.get(device_id, ())
+            })
+
+        if buckets:
+            buckets.sort(key=len)
+            candidates = buckets[0].intersection(*buckets[1:])
+        else:
+            candidates = self._names.keys()
+
+        terms = query.lower().split()
+        matches = heapq.nsmallest(
+            limit + 1,
+            (
+                entity_id for entity_id in candidates
+                if all(term in self._search_text[entity_id] for term in terms)
+            ),
+            key=self._search_text.__getitem__,
+        )
+        return matches[:limit], len(matches) > limit
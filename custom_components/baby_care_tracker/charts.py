@@ -0,0 +1,101 @@
+"""Downsampled chart series of the activity history for dashboards."""
+from __future__ import annotations
+
+import math
+from datetime import timedelta
+from typing import Any, Iterable, List, Sequence, Tuple
+
+Point = Tuple[float, float]
+
+SERIES_FEEDINGS = "feedings"
+SERIES_SLEEP = "sleep"
+SERIES_BOTTLE = "bottle"
+SERIES_GROWTH = "growth"
+CHART_SERIES = [SERIES_FEEDINGS, SERIES_SLEEP, SERIES_BOTTLE, SERIES_GROWTH]
+
+# Point budget per series
+DEFAULT_CHART_POINTS = 500
+MAX_CHART_POINTS = 5000
+# Range charted when none is given
+DEFAULT_CHART_RANGE = timedelta(days=7)
+# Feedings are counted per hour, or per several hours on long ranges
+MIN_BUCKET_SECONDS = 3600
+
+
+def lttb(points: Sequence[Point], threshold: int) -> List[Point]:
+    """Downsample time-sorted points with Largest-Triangle-Three-Buckets.
+
+    Keeps the first and last point and, from each bucket in between, the
+    point forming the largest triangle with the previously kept point and
+    the average of the next bucket, so peaks and dips survive.
+    """
+    count = len(points)
+    if threshold >= count or threshold < 3:
+        return list(points)
+
+    sampled = [points[0]]
+    every = (count - 2) / (threshold - 2)
+    previous = 0
+    for bucket in range(threshold - 2):
+        average_start = int((bucket + 1) * every) + 1
+        average_end = min(int((bucket + 2) * every) + 1, count)
+        average_points = points[average_start:average_end]
+        average_x = sum(point[0] for point in average_points) / len(average_points)
+        average_y = sum(point[1] for point in average_points) / len(average_points)
+
+        previous_x, previous_y = points[previous]
+        largest_area = -1.0
+        selected = previous
+        for index in range(int(bucket * every) + 1, int((bucket + 1) * every) + 1):
+            x, y = points[index]
+            area = abs(
+                (previous_x - average_x) * (y - previous_y)
+                - (previous_x - x) * (average_y - previous_y)
+            )
+            if area > largest_area:
+                largest_area = area
+                selected = index
+        sampled.append(points[selected])
+        previous = selected
+
+    sampled.append(points[-1])
+    return sampled
+
+
+def bucket_seconds_for(start: float, end: float, points: int) -> int:
+    """Return the smallest whole number of hours that fits a range into the budget."""
+    hours = math.ceil((end - start) / points / MIN_BUCKET_SECONDS)
+    return max(1, hours) * MIN_BUCKET_SECONDS
+
+
+def bucket_counts(
+    timestamps: Iterable[float], start: float, end: float, bucket_seconds: int
+) -> List[Point]:
+    """Count timestamps per bucket, with buckets aligned to whole bucket lengths."""
+    first = start - start % bucket_seconds
+    counts = [0] * max(1, math.ceil((end - first) / bucket_seconds))
+    for timestamp in timestamps:
+        if start <= timestamp < end:
+            counts[int((timestamp - first) // bucket_seconds)] += 1
+    return [(first + index * bucket_seconds, count) for index, count in enumerate(counts)]
+
+
+def bucket_durations(
+    intervals: Iterable[Tuple[float, float]], start: float, end: float, bucket_seconds: int
+) -> List[Point]:
+    """Sum the seconds intervals cover in each bucket, splitting those that cross buckets."""
+    first = start - start % bucket_seconds
+    totals = [0.0] * max(1, math.ceil((end - first) / bucket_seconds))
+    for interval_start, interval_end in intervals:
+        interval_start, interval_end = max(interval_start, start), min(interval_end, end)
+        while interval_start < interval_end:
+            index = int((interval_start - first) // bucket_seconds)
+            bucket_end = min(first + (index + 1) * bucket_seconds, interval_end)
+            totals[index] += bucket_end - interval_start
+            interval_start = bucket_end
+    return [(first + index * bucket_seconds, round(total)) for index, total in enumerate(totals)]
+
+
+def to_millis(points: Iterable[Sequence[float]]) -> List[List[Any]]:
+    """Convert the leading epoch seconds of each point to milliseconds for charting."""
+    return [[int(point[0] * 1000), *point[1:]] for point in points]
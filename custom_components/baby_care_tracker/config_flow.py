@@ -16,16 +16,34 @@ from .const import (
     DOMAIN,
     CONF_BABY_NAME,
     CONF_BIRTH_DATE,
+    CONF_SEX,
+    BABY_CONFIG_KEYS,
     DEFAULT_NAME,
-    CONF_FEEDING_START_LEFT,
-    CONF_FEEDING_START_RIGHT,
-    CONF_FEEDING_STOP,
-    CONF_SLEEP_START,
-    CONF_WAKE_UP,
-    CONF_DIAPER_PEE,
-    CONF_DIAPER_POO,
-    CONF_DIAPER_BOTH,
+    CONF_MAPPINGS,
+    MAPPING_CONFIG_KEYS,
+    MAPPING_DOMAINS,
+    CONF_STORAGE_BACKEND,
+    CONF_UNRECORDED_SENSORS,
+    STATISTICS_SENSORS,
+    DEFAULT_STORAGE_BACKEND,
+    CONF_FEEDING_ALERT_HOURS,
+    CONF_SLEEP_ALERT_HOURS,
+    CONF_DIAPER_ALERT_HOURS,
+    ALERT_CONFIG_KEYS,
+    DEFAULT_FEEDING_ALERT_HOURS,
+    DEFAULT_SLEEP_ALERT_HOURS,
+    DEFAULT_DIAPER_ALERT_HOURS,
+    STORAGE_BACKEND_JSON,
+    STORAGE_BACKEND_SQLITE,
+    SEX_MALE,
+    SEX_FEMALE,
+    CONF_SYNC_URL,
+    CONF_SYNC_TOKEN,
+    CONF_SYNC_BABY,
+    SYNC_CONFIG_KEYS,
 )
+from .candidates import MAX_CANDIDATES, MappingCandidateIndex
+from .triggers import MAPPING_ACTIONS, get_mappings, mapping_options
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -39,8 +57,20 @@ BABY_ACTIONS = {
     "diaper_pee": "Log Pee Diaper",
     "diaper_poo": "Log Poo Diaper",
     "diaper_both": "Log Both (Pee & Poo)",
+    "sleep_toggle": "Toggle Sleep / Wake Up",
+    "feeding_toggle": "Toggle Feeding (alternates sides)",
 }
 
+SEX_SELECTOR = selector.SelectSelector(
+    selector.SelectSelectorConfig(
+        options=[
+            {"value": SEX_FEMALE, "label": "Girl"},
+            {"value": SEX_MALE, "label": "Boy"},
+        ],
+        mode=selector.SelectSelectorMode.LIST,
+    )
+)
+
 
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Baby Care Tracker."""
@@ -68,6 +98,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 {
                     vol.Required(CONF_BABY_NAME, default=DEFAULT_NAME): str,
                     vol.Optional(CONF_BIRTH_DATE): selector.DateSelector(),
+                    vol.Optional(CONF_SEX): SEX_SELECTOR,
                 }
             ),
             errors=errors,
@@ -89,69 +120,220 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
         """Initialize options flow."""
         self.config_entry = config_entry
         self.entity_mappings = {}
+        self.entity_button_actions = {}
+        self.extra_mappings = []
         self.current_entities = []
+        self.candidates = []
+        self.candidates_truncated = False
+        self._candidate_index: MappingCandidateIndex | None = None
 
     async def async_step_init(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Manage the options."""
-        return await self.async_step_select_entities()
+        return self.async_show_menu(
+            step_id="init",
+            menu_options=["select_entities", "baby", "alerts", "storage", "sync"],
+        )
 
-    async def async_step_select_entities(
+    def _non_mapping_options(self) -> dict[str, Any]:
+        """Return current options that are not button mappings."""
+        return {
+            key: value
+            for key, value in self.config_entry.options.items()
+            if key not in MAPPING_CONFIG_KEYS and key != CONF_MAPPINGS
+        }
+
+    async def async_step_baby(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
-        """Step 1: Select entities to configure."""
+        """Set the birth date and sex used for growth percentiles."""
         if user_input is not None:
-            self.current_entities = user_input.get("entities", [])
-            if not self.current_entities:
-                # No entities selected, save empty configuration
-                return self.async_create_entry(title="", data={})
-            
-            # Initialize mappings with current options
-            current_options = self.config_entry.options
-            self.entity_mappings = {}
-            self.entity_button_actions = {}
-            
-            # Preserve existing mappings for selected entities - map back from config keys to entities
-            config_to_entity = {
-                CONF_FEEDING_START_LEFT: "feeding_start_left",
-                CONF_FEEDING_START_RIGHT: "feeding_start_right", 
-                CONF_FEEDING_STOP: "feeding_stop",
-                CONF_SLEEP_START: "sleep_start",
-                CONF_WAKE_UP: "wake_up",
-                CONF_DIAPER_PEE: "diaper_pee",
-                CONF_DIAPER_POO: "diaper_poo",
-                CONF_DIAPER_BOTH: "diaper_both",
+            # Cleared fields are left out of the input; store them empty so they
+            # no longer fall back to the old options or the initial setup
+            data = {
+                key: value
+                for key, value in self.config_entry.options.items()
+                if key not in BABY_CONFIG_KEYS
             }
-            
-            for entity in self.current_entities:
-                # Find if this entity is already mapped
-                for config_key, action_key in config_to_entity.items():
-                    entity_config = current_options.get(config_key)
-                    if entity_config:
-                        # Handle entity:action format
-                        if ":" in str(entity_config):
-                            entity_id, button_action = entity_config.split(":", 1)
-                            if entity_id == entity:
-                                self.entity_mappings[entity] = action_key
-                                self.entity_button_actions[entity] = button_action
-                                break
-                        elif entity_config == entity:
-                            self.entity_mappings[entity] = action_key
-                            break
-                else:
-                    # Entity not mapped yet
-                    self.entity_mappings[entity] = None
-            
-            return await self.async_step_assign_actions()
+            data.update({key: user_input.get(key) for key in BABY_CONFIG_KEYS})
+            return self.async_create_entry(title="", data=data)
+
+        birth_date = self.config_entry.options.get(
+            CONF_BIRTH_DATE, self.config_entry.data.get(CONF_BIRTH_DATE)
+        )
+        sex = self.config_entry.options.get(CONF_SEX, self.config_entry.data.get(CONF_SEX))
+
+        return self.async_show_form(
+            step_id="baby",
+            data_schema=vol.Schema({
+                vol.Optional(
+                    CONF_BIRTH_DATE,
+                    description={"suggested_value": birth_date},
+                ): selector.DateSelector(),
+                vol.Optional(
+                    CONF_SEX,
+                    description={"suggested_value": sex},
+                ): SEX_SELECTOR,
+            }),
+        )
+
+    async def async_step_alerts(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Set the alert thresholds."""
+        if user_input is not None:
+            # Cleared fields are left out of the input and go back to their defaults
+            data = {
+                key: value
+                for key, value in self.config_entry.options.items()
+                if key not in ALERT_CONFIG_KEYS
+            }
+            data.update(user_input)
+            return self.async_create_entry(title="", data=data)
+
+        hours_selector = selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                min=0,
+                max=24,
+                step=0.25,
+                unit_of_measurement="h",
+                mode=selector.NumberSelectorMode.BOX,
+            )
+        )
+        options = self.config_entry.options
+
+        return self.async_show_form(
+            step_id="alerts",
+            data_schema=vol.Schema({
+                vol.Required(
+                    CONF_FEEDING_ALERT_HOURS,
+                    default=options.get(CONF_FEEDING_ALERT_HOURS, DEFAULT_FEEDING_ALERT_HOURS),
+                ): hours_selector,
+                vol.Required(
+                    CONF_SLEEP_ALERT_HOURS,
+                    default=options.get(CONF_SLEEP_ALERT_HOURS, DEFAULT_SLEEP_ALERT_HOURS),
+                ): hours_selector,
+                vol.Required(
+                    CONF_DIAPER_ALERT_HOURS,
+                    default=options.get(CONF_DIAPER_ALERT_HOURS, DEFAULT_DIAPER_ALERT_HOURS),
+                ): hours_selector,
+            }),
+        )
+
+    async def async_step_storage(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Select the storage backend and the sensors without long-term statistics."""
+        if user_input is not None:
+            return self.async_create_entry(
+                title="",
+                data={**self.config_entry.options, **user_input},
+            )
+
+        current_backend = self.config_entry.options.get(
+            CONF_STORAGE_BACKEND, DEFAULT_STORAGE_BACKEND
+        )
+
+        return self.async_show_form(
+            step_id="storage",
+            data_schema=vol.Schema({
+                vol.Required(
+                    CONF_STORAGE_BACKEND,
+                    default=current_backend,
+                ): selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        options=[
+                            {"value": STORAGE_BACKEND_JSON, "label": "JSON file (default)"},
+                            {"value": STORAGE_BACKEND_SQLITE, "label": "SQLite database"},
+                        ],
+                        mode=selector.SelectSelectorMode.LIST,
+                    )
+                ),
+                vol.Optional(
+                    CONF_UNRECORDED_SENSORS,
+                    default=self.config_entry.options.get(CONF_UNRECORDED_SENSORS, []),
+                ): selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        options=STATISTICS_SENSORS,
+                        multiple=True,
+                        translation_key=CONF_UNRECORDED_SENSORS,
+                    )
+                ),
+            }),
+        )
+
+    async def async_step_sync(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Set the peer Home Assistant the history is synced with, an empty URL disables sync."""
+        errors: dict[str, str] = {}
+        options = self.config_entry.options
 
-        # Get all available button/switch entities
-        entities = []
-        for domain in ["button", "switch", "input_button", "binary_sensor"]:
-            domain_entities = self.hass.states.async_entity_ids(domain)
-            entities.extend(domain_entities)
+        if user_input is not None:
+            if user_input.get(CONF_SYNC_URL) and not user_input.get(CONF_SYNC_TOKEN):
+                errors["base"] = "sync_token_required"
+            else:
+                # Cleared fields are left out of the input, drop their old values
+                data = {
+                    key: value for key, value in options.items() if key not in SYNC_CONFIG_KEYS
+                }
+                if user_input.get(CONF_SYNC_URL):
+                    data.update(user_input)
+                return self.async_create_entry(title="", data=data)
+            options = user_input
 
-        if not entities:
+        return self.async_show_form(
+            step_id="sync",
+            data_schema=vol.Schema({
+                vol.Optional(
+                    CONF_SYNC_URL,
+                    description={"suggested_value": options.get(CONF_SYNC_URL)},
+                ): selector.TextSelector(
+                    selector.TextSelectorConfig(type=selector.TextSelectorType.URL)
+                ),
+                vol.Optional(
+                    CONF_SYNC_TOKEN,
+                    description={"suggested_value": options.get(CONF_SYNC_TOKEN)},
+                ): selector.TextSelector(
+                    selector.TextSelectorConfig(type=selector.TextSelectorType.PASSWORD)
+                ),
+                vol.Optional(
+                    CONF_SYNC_BABY,
+                    description={"suggested_value": options.get(CONF_SYNC_BABY)},
+                ): selector.TextSelector(),
+            }),
+            errors=errors,
+        )
+
+    @property
+    def candidate_index(self) -> MappingCandidateIndex:
+        """Return the mappable entity index, built on first use in this flow."""
+        if self._candidate_index is None:
+            self._candidate_index = MappingCandidateIndex(self.hass, MAPPING_DOMAINS)
+        return self._candidate_index
+
+    def _mapped_entities(self) -> list[str]:
+        """Return the currently mapped entities in mapping order."""
+        return list(dict.fromkeys(
+            mapping["entity_id"] for mapping in get_mappings(self.config_entry.options)
+        ))
+
+    async def async_step_select_entities(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Step 1: Narrow down the entities to choose from."""
+        if user_input is not None:
+            self.candidates, truncated = self.candidate_index.search(
+                user_input.get("search", ""),
+                domain=user_input.get("domain"),
+                area_id=user_input.get("area"),
+                button_devices_only=user_input.get("button_devices_only", False),
+            )
+            self.candidates_truncated = truncated
+            return await self.async_step_pick_entities()
+
+        if not len(self.candidate_index):
             return self.async_show_form(
                 step_id="select_entities",
                 data_schema=vol.Schema({}),
@@ -160,42 +342,74 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                 },
             )
 
-        # Get currently configured entities from options
-        current_options = self.config_entry.options
-        currently_mapped = []
-        current_button_actions = {}
-        
-        # Extract entities from current configuration, handling button actions
-        for config_key in [CONF_FEEDING_START_LEFT, CONF_FEEDING_START_RIGHT, CONF_FEEDING_STOP,
-                          CONF_SLEEP_START, CONF_WAKE_UP, CONF_DIAPER_PEE, CONF_DIAPER_POO, CONF_DIAPER_BOTH]:
-            entity_config = current_options.get(config_key)
-            if entity_config:
-                # Check if this includes a button action
-                if ":" in str(entity_config):
-                    entity_id, button_action = entity_config.split(":", 1)
-                    currently_mapped.append(entity_id)
-                    current_button_actions[entity_id] = button_action
+        return self.async_show_form(
+            step_id="select_entities",
+            data_schema=vol.Schema({
+                vol.Optional("search"): selector.TextSelector(),
+                vol.Optional("domain"): selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        options=sorted(self.candidate_index.by_domain),
+                        mode=selector.SelectSelectorMode.DROPDOWN,
+                    )
+                ),
+                vol.Optional("area"): selector.AreaSelector(),
+                vol.Optional("button_devices_only", default=False): selector.BooleanSelector(),
+            }),
+            description_placeholders={
+                "count": str(len(self.candidate_index)),
+                "limit": str(MAX_CANDIDATES),
+            },
+        )
+
+    async def async_step_pick_entities(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Step 2: Select entities to configure among the search results."""
+        if user_input is not None:
+            self.current_entities = user_input.get("entities", [])
+            if not self.current_entities:
+                # No entities selected, clear all mappings
+                return self.async_create_entry(title="", data=self._non_mapping_options())
+            
+            # The form edits one mapping per entity, keep any others it has
+            self.entity_mappings = {entity: None for entity in self.current_entities}
+            self.entity_button_actions = {}
+            self.extra_mappings = []
+            for mapping in get_mappings(self.config_entry.options):
+                entity = mapping["entity_id"]
+                if entity not in self.entity_mappings:
+                    continue
+                if self.entity_mappings[entity] is None:
+                    self.entity_mappings[entity] = mapping["action"]
+                    self.entity_button_actions[entity] = mapping.get("trigger", "")
                 else:
-                    currently_mapped.append(entity_config)
+                    self.extra_mappings.append(mapping)
+            
+            return await self.async_step_assign_actions()
+
+        # Mapped entities stay selectable so they can be kept or removed
+        currently_mapped = self._mapped_entities()
+        include = list(dict.fromkeys([*currently_mapped, *self.candidates]))
 
         return self.async_show_form(
-            step_id="select_entities",
+            step_id="pick_entities",
             data_schema=vol.Schema({
                 vol.Optional(
                     "entities",
                     default=currently_mapped
                 ): selector.EntitySelector(
                     selector.EntitySelectorConfig(
-                        domain=["button", "switch", "input_button", "binary_sensor"],
+                        include_entities=include,
                         multiple=True,
                     )
                 ),
             }),
             description_placeholders={
-                "help_text": (
-                    "Select the buttons, switches, or other entities you want to use for baby care actions. "
-                    "In the next step, you'll assign specific actions to each entity."
-                )
+                "found": str(len(self.candidates)),
+                "truncated": (
+                    f" Only the first {MAX_CANDIDATES} are offered, refine the search to find others."
+                    if self.candidates_truncated else ""
+                ),
             },
         )
 
@@ -204,34 +418,22 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
     ) -> FlowResult:
         """Step 2: Assign actions to selected entities."""
         if user_input is not None:
-            # Build the final configuration mapping using the correct const keys
-            final_config = {}
+            mappings = list(self.extra_mappings)
             
             for entity in self.current_entities:
                 action = user_input.get(f"action_{entity}")
                 button_action = user_input.get(f"button_action_{entity}", "").strip()
                 
-                if action and action != "none":
-                    # Map action back to config key using constants
-                    action_to_config = {
-                        "feeding_start_left": CONF_FEEDING_START_LEFT,
-                        "feeding_start_right": CONF_FEEDING_START_RIGHT,
-                        "feeding_stop": CONF_FEEDING_STOP,
-                        "sleep_start": CONF_SLEEP_START, 
-                        "wake_up": CONF_WAKE_UP,
-                        "diaper_pee": CONF_DIAPER_PEE,
-                        "diaper_poo": CONF_DIAPER_POO,
-                        "diaper_both": CONF_DIAPER_BOTH,
-                    }
-                    config_key = action_to_config.get(action)
-                    if config_key:
-                        # Store entity with optional button action
-                        if button_action:
-                            final_config[config_key] = f"{entity}:{button_action}"
-                        else:
-                            final_config[config_key] = entity
-
-            return self.async_create_entry(title="", data=final_config)
+                if action in MAPPING_ACTIONS:
+                    # Store entity with optional button action
+                    mapping = {"entity_id": entity, "action": action}
+                    if button_action:
+                        mapping["trigger"] = button_action
+                    mappings.append(mapping)
+
+            return self.async_create_entry(
+                title="", data=mapping_options(self.config_entry.options, mappings)
+            )
 
         # Build form for action assignment
         schema_dict = {}
@@ -265,18 +467,14 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                 )
             )
             
-            # If this is a button entity, add option for specific action selection
-            if entity.startswith("button."):
+            # If this is a button or event entity, add option for specific action selection
+            if entity.startswith(("button.", "event.")):
                 # Get existing button action if any
-                existing_button_action = getattr(self, 'entity_button_actions', {}).get(entity, "")
+                existing_button_action = self.entity_button_actions.get(entity, "")
                 
                 # Add an optional field for specific button action
                 schema_dict[vol.Optional(f"button_action_{entity}", default=existing_button_action, description=f"Specific Action for {entity_name}")] = (
-                    selector.TextSelector(
-                        selector.TextSelectorConfig(
-                            placeholder="e.g., arrow_left_hold, arrow_right_click (optional)"
-                        )
-                    )
+                    selector.TextSelector()
                 )
 
         return self.async_show_form(
@@ -286,7 +484,7 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                 "help_text": (
                     "Assign baby care actions to your selected entities. "
                     "Each entity can trigger one action when its state changes. "
-                    "For buttons with specific actions (like arrow_left_hold), enter the action name below the dropdown. "
+                    "For buttons with specific actions (like arrow_left_hold) or event entities (like double_press), enter the action name below the dropdown. "
                     "Select 'No Action' to leave an entity unmapped."
                 )
             },
@@ -8,6 +8,9 @@ DOMAIN: Final = "baby_care_tracker"
 # Configuration keys
 CONF_BABY_NAME = "baby_name"
 CONF_BIRTH_DATE = "birth_date"
+CONF_SEX = "sex"
+
+BABY_CONFIG_KEYS = [CONF_BIRTH_DATE, CONF_SEX]
 
 # Entity mapping configuration keys
 CONF_FEEDING_START_LEFT = "feeding_start_left_entity"
@@ -18,16 +21,99 @@ CONF_WAKE_UP = "wake_up_entity"
 CONF_DIAPER_PEE = "diaper_pee_entity"
 CONF_DIAPER_POO = "diaper_poo_entity"
 CONF_DIAPER_BOTH = "diaper_both_entity"
+CONF_SLEEP_TOGGLE = "sleep_toggle_entity"
+CONF_FEEDING_TOGGLE = "feeding_toggle_entity"
+
+# Mapping action -> configuration key
+MAPPING_ACTION_CONFIG_KEYS = {
+    "feeding_start_left": CONF_FEEDING_START_LEFT,
+    "feeding_start_right": CONF_FEEDING_START_RIGHT,
+    "feeding_stop": CONF_FEEDING_STOP,
+    "sleep_start": CONF_SLEEP_START,
+    "wake_up": CONF_WAKE_UP,
+    "diaper_pee": CONF_DIAPER_PEE,
+    "diaper_poo": CONF_DIAPER_POO,
+    "diaper_both": CONF_DIAPER_BOTH,
+    "sleep_toggle": CONF_SLEEP_TOGGLE,
+    "feeding_toggle": CONF_FEEDING_TOGGLE,
+}
+
+MAPPING_CONFIG_KEYS = list(MAPPING_ACTION_CONFIG_KEYS.values())
+
+# Domains of entities that can be mapped to actions
+MAPPING_DOMAINS = ["button", "switch", "input_button", "input_boolean", "binary_sensor", "event"]
+
+# Structured button mappings, a list of {"entity_id", "action", "trigger"}
+CONF_MAPPINGS = "mappings"
+
+# Storage configuration keys
+CONF_STORAGE_BACKEND = "storage_backend"
+# Sensors whose history is kept out of long-term statistics
+CONF_UNRECORDED_SENSORS = "unrecorded_sensors"
+
+# Sensors with long-term statistics, all trend sensors share one key
+STATISTICS_SENSOR_TRENDS = "trends"
+STATISTICS_SENSORS = [
+    "current_feeding_duration",
+    "current_sleep_duration",
+    "last_sleep_duration",
+    "daily_feedings",
+    "daily_diapers",
+    "daily_sleep",
+    "daily_feeding_time",
+    "daily_bottle_feedings",
+    "daily_bottle_volume",
+    "night_sleep",
+    "day_sleep",
+    "weight_percentile",
+    "length_percentile",
+    STATISTICS_SENSOR_TRENDS,
+    "history_size",
+    "save_duration",
+]
+
+# Peer sync configuration keys
+CONF_SYNC_URL = "sync_url"
+CONF_SYNC_TOKEN = "sync_token"
+CONF_SYNC_BABY = "sync_baby"
+
+SYNC_CONFIG_KEYS = [CONF_SYNC_URL, CONF_SYNC_TOKEN, CONF_SYNC_BABY]
+
+# Alert configuration keys, thresholds in hours (0 disables)
+CONF_FEEDING_ALERT_HOURS = "feeding_alert_hours"
+CONF_SLEEP_ALERT_HOURS = "sleep_alert_hours"
+CONF_DIAPER_ALERT_HOURS = "diaper_alert_hours"
+
+ALERT_CONFIG_KEYS = [CONF_FEEDING_ALERT_HOURS, CONF_SLEEP_ALERT_HOURS, CONF_DIAPER_ALERT_HOURS]
 
 # Activity types
 ACTIVITY_FEEDING = "feeding"
 ACTIVITY_SLEEPING = "sleeping"
 ACTIVITY_DIAPER = "diaper"
+ACTIVITY_BOTTLE_FEEDING = "bottle_feeding"
+ACTIVITY_GROWTH = "growth"
+
+SESSION_ACTIVITY_TYPES = [
+    ACTIVITY_FEEDING,
+    ACTIVITY_SLEEPING,
+]
+
+ACTIVITY_TYPES = [
+    ACTIVITY_FEEDING,
+    ACTIVITY_SLEEPING,
+    ACTIVITY_DIAPER,
+    ACTIVITY_BOTTLE_FEEDING,
+    ACTIVITY_GROWTH,
+]
 
 # Feeding sides
 FEEDING_LEFT = "left"
 FEEDING_RIGHT = "right"
 
+# Sexes, used for growth percentiles
+SEX_MALE = "male"
+SEX_FEMALE = "female"
+
 # Diaper types
 DIAPER_PEE = "pee"
 DIAPER_POO = "poo"
@@ -41,9 +127,54 @@ SERVICE_LOG_SLEEP_START = "log_sleep_start"
 SERVICE_LOG_WAKE_UP = "log_wake_up"
 SERVICE_LOG_BOTTLE_FEEDING = "log_bottle_feeding"
 SERVICE_LOG_GROWTH = "log_growth"
+SERVICE_UPDATE_BUTTON_MAPPING = "update_button_mapping"
+SERVICE_REMOVE_BUTTON_MAPPING = "remove_button_mapping"
+SERVICE_GET_SESSION_SUMMARY = "get_session_summary"
+SERVICE_GET_GROWTH_CURVE = "get_growth_curve"
+SERVICE_EDIT_ACTIVITY = "edit_activity"
+SERVICE_DELETE_ACTIVITY = "delete_activity"
+SERVICE_UNDO_LAST = "undo_last"
+SERVICE_SYNC_NOW = "sync_now"
+SERVICE_BACKUP_HISTORY = "backup_history"
+SERVICE_RESTORE_HISTORY = "restore_history"
+SERVICE_GENERATE_REPORT = "generate_report"
+
+# Alerts
+ALERT_FEEDING_OVERDUE = "feeding_overdue"
+ALERT_LONG_SLEEP = "long_sleep"
+ALERT_DIAPER_OVERDUE = "diaper_overdue"
+
+ALERT_TYPES = [
+    ALERT_FEEDING_OVERDUE,
+    ALERT_LONG_SLEEP,
+    ALERT_DIAPER_OVERDUE,
+]
+
+EVENT_ALERT = "baby_care_tracker_alert"
+
+# Service call targeting
+ATTR_BABY = "baby"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+
+# Endpoint peers exchange history changes through
+SYNC_API_PATH = "/api/baby_care_tracker_sync"
 
 # Data file
 DATA_FILE = "baby_care_tracker_data.json"
+SQLITE_FILE = "baby_care_tracker_{entry_id}.db"
+BACKUP_DIR = "baby_care_tracker_backups"
+
+# Storage backends
+STORAGE_BACKEND_JSON = "json"
+STORAGE_BACKEND_SQLITE = "sqlite"
 
 # Default configuration
 DEFAULT_NAME = "Baby"
+DEFAULT_STORAGE_BACKEND = STORAGE_BACKEND_JSON
+DEFAULT_FEEDING_ALERT_HOURS = 3.0
+DEFAULT_SLEEP_ALERT_HOURS = 4.0
+DEFAULT_DIAPER_ALERT_HOURS = 4.0
+
+# Night sleep window (local time)
+NIGHT_START_HOUR = 19
+NIGHT_END_HOUR = 7
@@ -4,50 +4,138 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+import os
+from bisect import bisect_right
+from datetime import date, datetime, time, timedelta
+from typing import Any, Callable, Dict, Hashable, List, Optional, TypeVar
+
+import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import EVENT_STATE_CHANGED
-from homeassistant.core import Event, HomeAssistant, ServiceCall, callback
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, ServiceCall, callback
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.event import async_track_state_change_event
-from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-import homeassistant.helpers.config_validation as cv
-import voluptuous as vol
+from homeassistant.util import dt as dt_util
 
 from .const import (
     DOMAIN,
     CONF_BABY_NAME,
-    CONF_FEEDING_START_LEFT,
-    CONF_FEEDING_START_RIGHT,
-    CONF_FEEDING_STOP,
-    CONF_SLEEP_START,
-    CONF_WAKE_UP,
-    CONF_DIAPER_PEE,
-    CONF_DIAPER_POO,
-    CONF_DIAPER_BOTH,
+    CONF_BIRTH_DATE,
+    CONF_SEX,
+    CONF_STORAGE_BACKEND,
+    CONF_UNRECORDED_SENSORS,
+    DEFAULT_STORAGE_BACKEND,
     ACTIVITY_FEEDING,
     ACTIVITY_SLEEPING,
     ACTIVITY_DIAPER,
+    ACTIVITY_BOTTLE_FEEDING,
+    ACTIVITY_GROWTH,
+    ACTIVITY_TYPES,
+    SESSION_ACTIVITY_TYPES,
+    NIGHT_START_HOUR,
+    NIGHT_END_HOUR,
     FEEDING_LEFT,
     FEEDING_RIGHT,
-    DIAPER_PEE,
-    DIAPER_POO,
-    DIAPER_BOTH,
-    SERVICE_START_FEEDING,
-    SERVICE_STOP_FEEDING,
-    SERVICE_LOG_DIAPER,
-    SERVICE_LOG_SLEEP_START,
-    SERVICE_LOG_WAKE_UP,
-    SERVICE_LOG_BOTTLE_FEEDING,
-    SERVICE_LOG_GROWTH,
+)
+from .alerts import AlertManager
+from .backup import HistoryBackup
+from .cache import GenerationCache
+from .charts import (
+    SERIES_BOTTLE,
+    SERIES_FEEDINGS,
+    SERIES_GROWTH,
+    SERIES_SLEEP,
+    bucket_counts,
+    bucket_seconds_for,
+    lttb,
+    bucket_durations,
+    to_millis,
+)
+from .growth import (
+    INDICATOR_MEASUREMENTS,
+    INDICATORS,
+    growth_curve,
+    growth_percentile,
+)
+from .intervals import IntervalIndex, activity_bounds, timestamp_bounds
+from .metrics import (
+    PerformanceMetrics,
+    METRIC_LOAD,
+    METRIC_SAVE,
+    METRIC_SAVE_ACTIVITIES,
+    METRIC_SAVE_NEW_ACTIVITIES,
+    METRIC_UPDATE,
+    METRIC_QUERY_RANGE,
+    METRIC_QUERY_LAST,
+    METRIC_LISTENER_FANOUT,
+    METRIC_COMMAND_BATCH,
+    COUNTER_STATE_TRIGGERED,
+    COUNTER_STATE_IGNORED,
+    COUNTER_BUTTON_TRIGGERED,
+    COUNTER_BUTTON_MISSED,
+    COUNTER_TRIGGER_DEBOUNCED,
+    COUNTER_TRIGGER_DUPLICATE,
+    COUNTER_TRIGGER_RATE_LIMITED,
+)
+from .prediction import PREDICTION_HISTORY, FeedingPredictor
+from .report import DEFAULT_REPORT_DAYS, MAX_REPORT_DAYS, REPORT_DIR, write_report
+from .storage import create_storage, new_activity_id
+from .sync import (
+    ACTIVITY_TIMES_SCHEMA,
+    FIELD_DELETED,
+    FIELD_SEQ,
+    PeerSync,
+    SyncLog,
+    content,
+    peer_options,
+    version,
+)
+from .throttle import DROP_DEBOUNCED, DROP_DUPLICATE, DROP_RATE_LIMITED, TriggerThrottle
+from .trends import TrendTracker
+from .triggers import (
+    MAPPING_ACTIONS,
+    ButtonRoute,
+    StateRoute,
+    compile_mappings,
+    get_mappings,
+    mapping_key,
+    mapping_options,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Bus events of zha and deCONZ remotes
+BUTTON_EVENT_TYPES = ["zha_event", "deconz_event"]
+
+# Drop reason -> counter
+TRIGGER_DROP_COUNTERS = {
+    DROP_DEBOUNCED: COUNTER_TRIGGER_DEBOUNCED,
+    DROP_DUPLICATE: COUNTER_TRIGGER_DUPLICATE,
+    DROP_RATE_LIMITED: COUNTER_TRIGGER_RATE_LIMITED,
+}
+
 UPDATE_INTERVAL = timedelta(seconds=30)
 
+# Values memoized per data generation for entities, a few per entity
+ENTITY_CACHE_SIZE = 256
+
+# Activity fields that edit_activity may change
+EDITABLE_FIELDS = [
+    "timestamp",
+    "start_time",
+    "end_time",
+    "side",
+    "diaper_type",
+    "amount_ml",
+    "weight_kg",
+    "height_cm",
+    "notes",
+]
+
 
 class BabyCareCoordinator(DataUpdateCoordinator):
     """Coordinate baby care data updates."""
@@ -62,9 +150,45 @@ class BabyCareCoordinator(DataUpdateCoordinator):
         )
         self.entry = entry
         self.baby_name = entry.data.get(CONF_BABY_NAME, "Baby")
-        self._store = Store(hass, 1, f"{DOMAIN}_{entry.entry_id}")
+        self.storage_backend = entry.options.get(CONF_STORAGE_BACKEND, DEFAULT_STORAGE_BACKEND)
+        self.unrecorded_sensors = list(entry.options.get(CONF_UNRECORDED_SENSORS, []))
+        self._storage = create_storage(hass, entry.entry_id, self.storage_backend)
         self._data: Dict[str, Any] = {}
-        self._entity_listeners: List[Any] = []
+        self._pending_activities: List[Dict[str, Any]] = []
+        self._pending_updates: Dict[str, Dict[str, Any]] = {}
+        self._pending_deletes: List[str] = []
+        self._commands: asyncio.Queue = asyncio.Queue()
+        self._command_worker: Optional[asyncio.Task] = None
+        self._closing = False
+        self._session_indexes: Dict[str, IntervalIndex] = {
+            activity_type: IntervalIndex() for activity_type in SESSION_ACTIVITY_TYPES
+        }
+        self._time_index = IntervalIndex()
+        # Activities of each type by timestamp, answering the JSON backend's sensor queries
+        self._type_indexes: Dict[str, IntervalIndex] = {
+            activity_type: IntervalIndex() for activity_type in ACTIVITY_TYPES
+        }
+        self._activity_index: Dict[str, Dict[str, Any]] = {}
+        self._latest_growth: Dict[str, Dict[str, Any]] = {}
+        self.trends = TrendTracker()
+        self.feeding_predictor = FeedingPredictor()
+        self.metrics = PerformanceMetrics()
+        self.alerts = AlertManager(self)
+        self.sync = SyncLog()
+        self.sync_peer = peer_options(entry.options)
+        self.peer_sync: Optional[PeerSync] = PeerSync(self, *self.sync_peer) if self.sync_peer else None
+        self.backups = HistoryBackup(self)
+        self._state_listeners: Dict[str, CALLBACK_TYPE] = {}
+        self._button_listeners: List[CALLBACK_TYPE] = []
+        self._state_routes: Dict[str, List[StateRoute]] = {}
+        self._button_routes: Dict[str, Dict[str, ButtonRoute]] = {}
+        self.trigger_throttle = TriggerThrottle()
+        # Bumped whenever the history changes and before entities are updated
+        self.data_generation = 0
+        # Bumped only when the history or the running sessions change, not on refreshes
+        self.history_generation = 0
+        self.chart_cache = GenerationCache()
+        self.entity_cache = GenerationCache(ENTITY_CACHE_SIZE)
         
         # Current activity tracking
         self._current_feeding: Optional[Dict[str, Any]] = None
@@ -76,251 +200,462 @@ class BabyCareCoordinator(DataUpdateCoordinator):
         await super().async_config_entry_first_refresh()
 
     async def _async_update_data(self) -> Dict[str, Any]:
-        """Update data."""
-        return self._data
+        """Query today's activities and the latest activity of each type."""
+        today_start = datetime.combine(datetime.now().date(), time.min)
+        today_end = today_start + timedelta(days=1)
+        daily: Dict[str, List[Dict[str, Any]]] = {}
+        last: Dict[str, Optional[Dict[str, Any]]] = {}
+
+        try:
+            with self.metrics.timer(METRIC_UPDATE):
+                for activity_type in ACTIVITY_TYPES:
+                    with self.metrics.timer(METRIC_QUERY_RANGE):
+                        daily[activity_type] = await self._async_query_range(
+                            activity_type, today_start, today_end
+                        )
+                    with self.metrics.timer(METRIC_QUERY_LAST):
+                        last[activity_type] = await self._async_query_last(activity_type)
+        except Exception as err:
+            raise UpdateFailed(f"Error querying activities: {err}") from err
+
+        self.trends.expire()
+        return {"daily": daily, "last": last}
+
+    async def _async_query_range(
+        self, activity_type: str, start: datetime, end: datetime
+    ) -> List[Dict[str, Any]]:
+        """Return activities of a type with start <= timestamp < end.
+
+        Backends without indexed queries are answered from the in-memory
+        index of the type instead of scanning the history.
+        """
+        if self._storage.indexed_queries:
+            return await self._storage.async_query_range(activity_type, start, end)
+        return [
+            activity
+            for _, _, activity in self._type_indexes[activity_type].overlapping(
+                start.timestamp(), end.timestamp()
+            )
+        ]
+
+    async def _async_query_last(self, activity_type: str) -> Optional[Dict[str, Any]]:
+        """Return the most recent activity of a type."""
+        if self._storage.indexed_queries:
+            return await self._storage.async_query_last(activity_type)
+        return self._type_indexes[activity_type].last()
 
     async def _async_load_data(self) -> None:
         """Load data from storage."""
-        stored_data = await self._store.async_load()
-        if stored_data is None:
-            stored_data = {
-                "activities": [],
-                "current_feeding": None,
-                "current_sleep": None,
-            }
+        with self.metrics.timer(METRIC_LOAD):
+            stored_data = await self._storage.async_load()
         
         self._data = stored_data
         self._current_feeding = stored_data.get("current_feeding")
         self._current_sleep = stored_data.get("current_sleep")
+        self.sync, numbered = SyncLog.from_data(
+            stored_data.get("sync"), stored_data.get("activities", [])
+        )
+        if numbered:
+            _LOGGER.info(f"Numbered {len(numbered)} stored activities for peer sync")
+            self._data["sync"] = self.sync.as_dict()
+            await self._storage.async_save(self._data, [], numbered)
+        self._build_indexes()
+
+    def _build_indexes(self) -> None:
+        """Build the in-memory indexes over the loaded history."""
+        sessions: Dict[str, List[Dict[str, Any]]] = {
+            activity_type: [] for activity_type in SESSION_ACTIVITY_TYPES
+        }
+        by_type: Dict[str, List[Dict[str, Any]]] = {activity_type: [] for activity_type in ACTIVITY_TYPES}
+        self._latest_growth = {}
+        self._activity_index = {}
+        for activity in self._data.get("activities", []):
+            if "id" in activity:
+                self._activity_index[activity["id"]] = activity
+            if activity.get("type") in by_type:
+                by_type[activity["type"]].append(activity)
+            if activity.get("type") in sessions:
+                sessions[activity["type"]].append(activity)
+            elif activity.get("type") == ACTIVITY_GROWTH:
+                self._track_growth(activity)
+        
+        self._session_indexes = {
+            activity_type: IntervalIndex.from_activities(activities)
+            for activity_type, activities in sessions.items()
+        }
+        self._time_index = IntervalIndex.from_activities(
+            self._data.get("activities", []), activity_bounds
+        )
+        self._type_indexes = {
+            activity_type: IntervalIndex.from_activities(activities, timestamp_bounds)
+            for activity_type, activities in by_type.items()
+        }
+        self.trends = TrendTracker.from_activities(self._data.get("activities", []))
+        self.feeding_predictor = FeedingPredictor.from_activities(self._data.get("activities", []))
+        self.data_generation += 1
+        self.history_generation += 1
 
     async def _async_save_data(self) -> None:
-        """Save data to storage."""
+        """Save all pending changes to storage and refresh the snapshot."""
         self._data["current_feeding"] = self._current_feeding
         self._data["current_sleep"] = self._current_sleep
-        await self._store.async_save(self._data)
-        self.async_update_listeners()
-
-    async def async_register_services(self) -> None:
-        """Register services."""
-        # Start feeding service
-        self.hass.services.async_register(
-            DOMAIN,
-            SERVICE_START_FEEDING,
-            self._handle_start_feeding,
-            schema=vol.Schema({
-                vol.Required("side"): vol.In([FEEDING_LEFT, FEEDING_RIGHT]),
-                vol.Optional("notes"): cv.string,
-            }),
-        )
+        self._data["sync"] = self.sync.as_dict()
+        new_activities, self._pending_activities = self._pending_activities, []
+        updated_activities = list(self._pending_updates.values())
+        deleted_ids, self._pending_deletes = self._pending_deletes, []
+        self._pending_updates = {}
+        try:
+            with self.metrics.timer(METRIC_SAVE):
+                await self._storage.async_save(
+                    self._data, new_activities, updated_activities, deleted_ids
+                )
+        except Exception:
+            # The changes stay applied in memory, keep them for the next save
+            self._pending_activities[:0] = new_activities
+            self._pending_updates = {
+                **{activity["id"]: activity for activity in updated_activities},
+                **self._pending_updates,
+            }
+            self._pending_deletes[:0] = deleted_ids
+            raise
+        self.metrics.record(METRIC_SAVE_ACTIVITIES, len(self._data.get("activities", [])))
+        self.metrics.record(METRIC_SAVE_NEW_ACTIVITIES, len(new_activities))
+        await self.async_refresh()
+
+    async def _async_submit(self, mutation: Callable[..., Any], *args: Any) -> Any:
+        """Queue a mutation for the command worker and wait for its result."""
+        if self._closing:
+            raise HomeAssistantError(f"{self.baby_name} tracker is unloading")
+        future = self.hass.loop.create_future()
+        self._commands.put_nowait((mutation, args, future))
+        if self._command_worker is None or self._command_worker.done():
+            self._command_worker = self.hass.async_create_background_task(
+                self._async_process_commands(), f"{DOMAIN} {self.baby_name} command worker"
+            )
+        return await future
+
+    async def _async_process_commands(self) -> None:
+        """Apply queued mutations in batches, saving and notifying once per batch.
+
+        Mutations are synchronous, so each one runs without interleaving with
+        another; callers are answered after their batch has been saved. A
+        None command stops the worker once the commands before it are done.
+        """
+        stopping = False
+        while not stopping:
+            batch = [await self._commands.get()]
+            while not self._commands.empty():
+                batch.append(self._commands.get_nowait())
+            stopping = None in batch
+            batch = [command for command in batch if command is not None]
+            if batch:
+                self.metrics.record(METRIC_COMMAND_BATCH, len(batch))
+            
+            results = []
+            changed = False
+            for mutation, args, future in batch:
+                if future.done():
+                    continue
+                try:
+                    result = mutation(*args)
+                except Exception as err:  # pylint: disable=broad-except
+                    results.append((future, None, err))
+                    continue
+                changed = changed or result is not None
+                results.append((future, result, None))
+            
+            save_error: Optional[Exception] = None
+            if changed:
+                self.data_generation += 1
+                self.history_generation += 1
+                try:
+                    await self._async_save_data()
+                except Exception as err:  # pylint: disable=broad-except
+                    _LOGGER.error(f"Error saving {self.baby_name} data: {err}")
+                    save_error = err
+            
+            for future, result, error in results:
+                if future.done():
+                    continue
+                if error is None:
+                    error = save_error
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
 
-        # Stop feeding service
-        self.hass.services.async_register(
-            DOMAIN,
-            SERVICE_STOP_FEEDING,
-            self._handle_stop_feeding,
-            schema=vol.Schema({
-                vol.Optional("notes"): cv.string,
-            }),
-        )
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all registered listeners, timing the fan-out.
 
-        # Log diaper service
-        self.hass.services.async_register(
-            DOMAIN,
-            SERVICE_LOG_DIAPER,
-            self._handle_log_diaper,
-            schema=vol.Schema({
-                vol.Required("type"): vol.In([DIAPER_PEE, DIAPER_POO, DIAPER_BOTH]),
-                vol.Optional("notes"): cv.string,
-            }),
-        )
+        Starts a new data generation, so entities written in this fan-out
+        share the values memoized by the first of them.
+        """
+        self.data_generation += 1
+        with self.metrics.timer(METRIC_LISTENER_FANOUT):
+            super().async_update_listeners()
 
-        # Sleep start service
-        self.hass.services.async_register(
-            DOMAIN,
-            SERVICE_LOG_SLEEP_START,
-            self._handle_log_sleep_start,
-            schema=vol.Schema({
-                vol.Optional("notes"): cv.string,
-            }),
-        )
+    @property
+    def history_size(self) -> int:
+        """Return the number of activities in the history."""
+        return len(self._data.get("activities", []))
 
-        # Wake up service
-        self.hass.services.async_register(
-            DOMAIN,
-            SERVICE_LOG_WAKE_UP,
-            self._handle_log_wake_up,
-            schema=vol.Schema({
-                vol.Optional("notes"): cv.string,
-            }),
-        )
+    async def async_get_storage_size(self) -> Optional[int]:
+        """Return the size of the storage file in bytes."""
+        return await self._storage.async_get_size()
 
-        # Bottle feeding service
-        self.hass.services.async_register(
-            DOMAIN,
-            SERVICE_LOG_BOTTLE_FEEDING,
-            self._handle_log_bottle_feeding,
-            schema=vol.Schema({
-                vol.Required("amount_ml"): vol.Coerce(int),
-                vol.Optional("notes"): cv.string,
-            }),
-        )
+    def _append_activity(self, activity: Dict[str, Any], synced: bool = False) -> None:
+        """Append an activity to the history and queue it for saving.
 
-        # Growth tracking service
-        self.hass.services.async_register(
-            DOMAIN,
-            SERVICE_LOG_GROWTH,
-            self._handle_log_growth,
-            schema=vol.Schema({
-                vol.Optional("weight_kg"): vol.Coerce(float),
-                vol.Optional("height_cm"): vol.Coerce(float),
-                vol.Optional("notes"): cv.string,
-            }),
-        )
+        Synced activities keep the version they were given by their peer and
+        may be older than the latest activities, so they are inserted at their
+        place in time and leave the prediction alone.
+        """
+        if "activities" not in self._data:
+            self._data["activities"] = []
+        
+        if "id" not in activity:
+            activity["id"] = new_activity_id(activity)
+        if synced:
+            self.sync.track(activity)
+            self._insert_in_order(activity)
+        else:
+            self.sync.stamp(activity)
+            self._data["activities"].append(activity)
+        self._pending_activities.append(activity)
+        self._index_activity(activity)
+        if not synced:
+            self.feeding_predictor.add_activity(activity)
+
+    def _insert_in_order(self, activity: Dict[str, Any]) -> None:
+        """Insert an activity after the activities with the same or an earlier timestamp."""
+        activities = self._data["activities"]
+        position = bisect_right(activities, activity["timestamp"], key=lambda item: item["timestamp"])
+        activities.insert(position, activity)
+
+    def _pop_activity(self, activity: Dict[str, Any]) -> None:
+        """Take an activity out of the history list."""
+        activities = self._data.get("activities", [])
+        # Corrections are usually recent, search from the end
+        for position in range(len(activities) - 1, -1, -1):
+            if activities[position] is activity:
+                del activities[position]
+                break
+
+    def _index_activity(self, activity: Dict[str, Any]) -> None:
+        """Add an activity to the in-memory indexes and aggregates."""
+        self._activity_index[activity["id"]] = activity
+        session_index = self._session_indexes.get(activity.get("type"))
+        if session_index is not None:
+            session_index.add_activity(activity)
+        elif activity.get("type") == ACTIVITY_GROWTH:
+            self._track_growth(activity)
+        self._time_index.add_activity(activity, activity_bounds)
+        type_index = self._type_indexes.get(activity.get("type"))
+        if type_index is not None:
+            type_index.add_activity(activity, timestamp_bounds)
+        self.trends.add_activity(activity)
+
+    def _unindex_activity(self, activity: Dict[str, Any]) -> None:
+        """Remove an activity from the in-memory indexes and aggregates."""
+        self._activity_index.pop(activity["id"], None)
+        session_index = self._session_indexes.get(activity.get("type"))
+        if session_index is not None:
+            session_index.remove_activity(activity)
+        self._time_index.remove_activity(activity, activity_bounds)
+        type_index = self._type_indexes.get(activity.get("type"))
+        if type_index is not None:
+            type_index.remove_activity(activity, timestamp_bounds)
+        self.trends.remove_activity(activity)
+
+    def _reindex_after_change(self, activity: Dict[str, Any]) -> None:
+        """Rebuild the aggregates that cannot forget a single activity."""
+        if activity.get("type") == ACTIVITY_GROWTH:
+            # Walk back from the newest activity until every measurement is found
+            self._latest_growth = {}
+            for candidate in reversed(self._data.get("activities", [])):
+                if candidate.get("type") == ACTIVITY_GROWTH:
+                    self._track_growth(candidate)
+                if len(self._latest_growth) == len(INDICATOR_MEASUREMENTS):
+                    break
+        
+        if activity.get("type") in (ACTIVITY_FEEDING, ACTIVITY_BOTTLE_FEEDING):
+            self._rebuild_feeding_predictor()
 
-        # Button mapping management services
-        self.hass.services.async_register(
-            DOMAIN,
-            "update_button_mapping",
-            self._handle_update_button_mapping,
-            schema=vol.Schema({
-                vol.Required("entity_id"): cv.string,
-                vol.Optional("trigger_action"): cv.string,
-                vol.Required("baby_care_action"): cv.string,
-            }),
+    def _rebuild_feeding_predictor(self) -> None:
+        """Rebuild the feeding prediction from the recent feedings."""
+        now = datetime.now()
+        recent = self._time_index.overlapping(
+            (now - PREDICTION_HISTORY).timestamp(), (now + timedelta(days=1)).timestamp()
         )
-
-        self.hass.services.async_register(
-            DOMAIN,
-            "remove_button_mapping",
-            self._handle_remove_button_mapping,
-            schema=vol.Schema({
-                vol.Required("entity_id"): cv.string,
-                vol.Optional("specific_action"): cv.string,
-            }),
+        self.feeding_predictor = FeedingPredictor.from_activities(
+            recent_activity for _, _, recent_activity in recent
         )
 
-    async def async_unregister_services(self) -> None:
-        """Unregister services."""
-        services = [
-            SERVICE_START_FEEDING,
-            SERVICE_STOP_FEEDING,
-            SERVICE_LOG_DIAPER,
-            SERVICE_LOG_SLEEP_START,
-            SERVICE_LOG_WAKE_UP,
-            SERVICE_LOG_BOTTLE_FEEDING,
-            SERVICE_LOG_GROWTH,
-            "update_button_mapping",
-            "remove_button_mapping",
+    def _is_pending(self, activity: Dict[str, Any]) -> bool:
+        """Return whether an activity has not been saved yet."""
+        return any(pending is activity for pending in self._pending_activities)
+
+    def _queue_delete(self, activity: Dict[str, Any]) -> None:
+        """Queue deleting an activity from storage, or drop it if it was never saved."""
+        if self._is_pending(activity):
+            self._pending_activities = [
+                pending for pending in self._pending_activities if pending is not activity
+            ]
+        else:
+            self._pending_updates.pop(activity["id"], None)
+            self._pending_deletes.append(activity["id"])
+
+    def _remove_activity(
+        self, activity: Dict[str, Any], tombstone: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Remove an activity from the history and the indexes.
+
+        A tombstone is left for peer sync, with the version of the synced
+        tombstone that removed it or a new one for a local deletion.
+        """
+        self._queue_delete(activity)
+        self._unindex_activity(activity)
+        self._pop_activity(activity)
+        self.sync.delete(activity["id"], tombstone)
+        self._reindex_after_change(activity)
+
+    def get_activity(self, activity_id: str) -> Optional[Dict[str, Any]]:
+        """Get an activity by ID."""
+        return self._activity_index.get(activity_id)
+
+    def get_history_snapshot(
+        self, start: Optional[datetime] = None, end: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """Copy the activities, or those overlapping a time range, so they can be read off the event loop."""
+        if start is None or end is None:
+            return [dict(activity) for activity in self._data.get("activities", [])]
+        return [
+            dict(activity)
+            for _, _, activity in self._time_index.overlapping(start.timestamp(), end.timestamp())
         ]
-        
-        for service in services:
-            if self.hass.services.has_service(DOMAIN, service):
-                self.hass.services.async_remove(DOMAIN, service)
 
-    async def async_setup_entity_listeners(self) -> None:
-        """Set up entity state change listeners and event listeners for button mapping."""
-        options = self.entry.options
-        
-        # Parse entity configurations that may include specific button actions
-        parsed_configs = {}
-        button_event_configs = {}
-        
-        config_mappings = {
-            CONF_FEEDING_START_LEFT: ("start_feeding", {"side": FEEDING_LEFT}),
-            CONF_FEEDING_START_RIGHT: ("start_feeding", {"side": FEEDING_RIGHT}),
-            CONF_FEEDING_STOP: ("stop_feeding", {}),
-            CONF_SLEEP_START: ("sleep_start", {}),
-            CONF_WAKE_UP: ("wake_up", {}),
-            CONF_DIAPER_PEE: ("log_diaper", {"type": DIAPER_PEE}),
-            CONF_DIAPER_POO: ("log_diaper", {"type": DIAPER_POO}),
-            CONF_DIAPER_BOTH: ("log_diaper", {"type": DIAPER_BOTH}),
-        }
-        
-        for config_key, (action, params) in config_mappings.items():
-            entity_config = options.get(config_key)
-            if not entity_config:
+    def _track_growth(self, activity: Dict[str, Any]) -> None:
+        """Remember the latest growth activity of each measurement."""
+        for measurement in INDICATOR_MEASUREMENTS.values():
+            if activity.get(measurement) is None:
                 continue
-                
-            # Check if entity has specific button action (format: entity_id:action)
-            if ":" in str(entity_config):
-                entity_id, button_action = entity_config.split(":", 1)
-                button_event_configs[entity_id] = (action, params, button_action)
-                _LOGGER.debug(f"Configured button event: {entity_id} action {button_action} -> {action}")
-            else:
-                # Regular state change listener
-                parsed_configs[entity_config] = (action, params)
-                _LOGGER.debug(f"Configured state change: {entity_config} -> {action}")
-
-        # Set up state change listeners for regular entities
-        if parsed_configs:
-            listener = async_track_state_change_event(
-                self.hass,
-                list(parsed_configs.keys()),
-                self._async_entity_state_changed,
-            )
-            self._entity_listeners.append(listener)
-            self._entity_mappings = parsed_configs
-            
-        # Set up event listeners for button actions
-        if button_event_configs:
-            # Listen to all events that might be from our buttons
-            listener = self.hass.bus.async_listen(
-                "zha_event",  # Zigbee events
-                self._async_button_event_received
-            )
-            self._entity_listeners.append(listener)
-            
-            # Also listen to deconz events for deCONZ users  
-            listener = self.hass.bus.async_listen(
-                "deconz_event",
-                self._async_button_event_received
+            latest = self._latest_growth.get(measurement)
+            if latest is None or activity["timestamp"] >= latest["timestamp"]:
+                self._latest_growth[measurement] = activity
+
+    async def async_migrate_storage(self, backend: str) -> None:
+        """Copy the current data into another storage backend.
+
+        The queued commands are finished and new ones refused first, so no
+        change lands in the old backend after the copy; the entry is reloaded
+        on the new backend afterwards.
+        """
+        await self._async_stop_commands()
+        self._data["current_feeding"] = self._current_feeding
+        self._data["current_sleep"] = self._current_sleep
+        self._data["sync"] = self.sync.as_dict()
+        target = create_storage(self.hass, self.entry.entry_id, backend)
+        try:
+            await target.async_import(self._data)
+        except Exception:
+            self._closing = False
+            raise
+        finally:
+            await target.async_close()
+        _LOGGER.info(f"Migrated {len(self._data.get('activities', []))} activities to {backend} storage")
+
+    async def _async_stop_commands(self) -> None:
+        """Refuse new commands and wait for the queued ones to finish."""
+        self._closing = True
+        if self._command_worker is not None and not self._command_worker.done():
+            self._commands.put_nowait(None)
+            await self._command_worker
+        self._command_worker = None
+
+    async def async_close(self) -> None:
+        """Finish the queued commands and close the storage backend."""
+        await self._async_stop_commands()
+        await self._storage.async_close()
+
+    async def async_setup_entity_listeners(self) -> None:
+        """Set up or update the listeners for the entry's button mappings."""
+        self._async_apply_mappings(get_mappings(self.entry.options))
+
+    @callback
+    def _async_apply_mappings(self, mappings: List[Dict[str, Any]]) -> None:
+        """Swap in new routing tables, subscribing only entities that changed."""
+        state_routes, button_routes = compile_mappings(self.hass, mappings)
+
+        removed = self._state_listeners.keys() - state_routes.keys()
+        added = state_routes.keys() - self._state_listeners.keys()
+        for entity_id in removed:
+            self._state_listeners.pop(entity_id)()
+        for entity_id in added:
+            self._state_listeners[entity_id] = async_track_state_change_event(
+                self.hass, [entity_id], self._async_entity_state_changed
             )
-            self._entity_listeners.append(listener)
-            
-            # Store button event mappings
-            self._button_event_mappings = button_event_configs
+
+        # zha and deCONZ events are only listened to while a button action is mapped
+        if button_routes and not self._button_listeners:
+            self._button_listeners = [
+                self.hass.bus.async_listen(event_type, self._async_button_event_received)
+                for event_type in BUTTON_EVENT_TYPES
+            ]
+        elif not button_routes and self._button_listeners:
+            for listener in self._button_listeners:
+                listener()
+            self._button_listeners = []
+
+        self._state_routes, self._button_routes = state_routes, button_routes
+        _LOGGER.debug(
+            f"Button mappings for {self.baby_name}: {len(added)} entities subscribed, "
+            f"{len(removed)} unsubscribed, {len(state_routes)} listened to"
+        )
 
     async def async_remove_entity_listeners(self) -> None:
         """Remove entity state change listeners."""
-        for listener in self._entity_listeners:
+        for listener in [*self._state_listeners.values(), *self._button_listeners]:
             listener()
-        self._entity_listeners.clear()
+        self._state_listeners = {}
+        self._button_listeners = []
+        self._state_routes, self._button_routes = {}, {}
 
     @callback
     def _async_entity_state_changed(self, event: Event) -> None:
         """Handle entity state changes for button mapping."""
         entity_id = event.data.get("entity_id")
-        old_state = event.data.get("old_state")
         new_state = event.data.get("new_state")
-
-        if not entity_id or not new_state:
-            return
-
-        # Check if this entity is mapped to an action
-        if entity_id not in getattr(self, '_entity_mappings', {}):
+        routes = self._state_routes.get(entity_id)
+        if not routes or not new_state:
             return
 
-        action, params = self._entity_mappings[entity_id]
-
-        # Determine if we should trigger based on state change
-        should_trigger = False
+        old_state = event.data.get("old_state")
+        triggered = False
+        for matcher, action, params in routes:
+            if not matcher.matches(old_state, new_state):
+                continue
+            triggered = True
+            self.metrics.increment(COUNTER_STATE_TRIGGERED)
+            _LOGGER.info(f"Entity {entity_id} triggered action: {action} with params: {params}")
+            self._async_schedule_action(entity_id, action, params)
 
-        # For buttons and input_buttons, trigger on any state change to 'on' or recent timestamp
-        if new_state.domain in ["button", "input_button"]:
-            should_trigger = True
-        # For switches and binary_sensors, trigger on transition to 'on'
-        elif new_state.domain in ["switch", "binary_sensor"]:
-            if old_state and old_state.state != "on" and new_state.state == "on":
-                should_trigger = True
-        # For other entities, trigger on any state change
-        else:
-            if old_state and old_state.state != new_state.state:
-                should_trigger = True
+        if not triggered:
+            self.metrics.increment(COUNTER_STATE_IGNORED)
 
-        if should_trigger:
-            _LOGGER.info(f"Entity {entity_id} triggered action: {action} with params: {params}")
-            # Schedule the action to run
-            self.hass.async_create_task(self._async_trigger_action(action, params))
+    @callback
+    def _async_schedule_action(self, entity_id: str, action: str, params: Dict[str, Any]) -> None:
+        """Run a mapped action unless the trigger is a bounce, duplicate or flood."""
+        reason = self.trigger_throttle.check(entity_id, action, params)
+        if reason is not None:
+            self.metrics.increment(TRIGGER_DROP_COUNTERS[reason])
+            if reason == DROP_RATE_LIMITED:
+                # A real press is lost, bounces and duplicates are the same press
+                _LOGGER.warning(f"Dropped {action} trigger from {entity_id}: too many triggers from this entity")
+            else:
+                _LOGGER.debug(f"Dropped {action} trigger from {entity_id}: {reason}")
+            return
+        self.hass.async_create_task(self._async_trigger_action(action, params))
 
     async def _async_trigger_action(self, action: str, params: Dict[str, Any]) -> None:
         """Trigger a baby care action from entity state change."""
@@ -335,55 +670,53 @@ class BabyCareCoordinator(DataUpdateCoordinator):
                 await self._handle_log_sleep_start_internal("Button triggered")
             elif action == "wake_up":
                 await self._handle_log_wake_up_internal("Button triggered")
+            elif action == "toggle_sleep":
+                await self._handle_toggle_sleep_internal("Button triggered")
+            elif action == "toggle_feeding":
+                await self._handle_toggle_feeding_internal("Button triggered")
         except Exception as e:
             _LOGGER.error(f"Error triggering action {action}: {e}")
 
     @callback
     def _async_button_event_received(self, event: Event) -> None:
         """Handle button events for specific button actions."""
-        if not hasattr(self, '_button_event_mappings'):
-            return
-            
         event_data = event.data
-        device_id = event_data.get("device_id")
-        command = event_data.get("command")
-        
-        if not device_id or not command:
+        route = self._button_routes.get(event_data.get("device_id"), {}).get(event_data.get("command"))
+        if route is None:
+            self.metrics.increment(COUNTER_BUTTON_MISSED)
             return
-            
-        # Find entity_id from device_id
-        entity_registry = self.hass.helpers.entity_registry.async_get(self.hass)
-        device_registry = self.hass.helpers.device_registry.async_get(self.hass)
-        
-        # Get entities for this device
-        entities = self.hass.helpers.entity_registry.async_entries_for_device(
-            entity_registry, device_id
-        )
-        
-        for entity_entry in entities:
-            entity_id = entity_entry.entity_id
-            if entity_id in self._button_event_mappings:
-                action, params, button_action = self._button_event_mappings[entity_id]
-                
-                # Check if this is the specific button action we're looking for
-                if command == button_action:
-                    _LOGGER.info(f"Button event {entity_id} action {command} triggered: {action} with params: {params}")
-                    # Schedule the action to run
-                    self.hass.async_create_task(self._async_trigger_action(action, params))
-                    break
+
+        entity_id, action, params = route
+        self.metrics.increment(COUNTER_BUTTON_TRIGGERED)
+        _LOGGER.info(f"Button event {entity_id} action {event_data['command']} triggered: {action} with params: {params}")
+        self._async_schedule_action(entity_id, action, params)
 
     # Service handlers
-    async def _handle_start_feeding(self, call: ServiceCall) -> None:
+    def _service_response(self, activity: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Build the response returned by activity services."""
+        return {
+            "baby": self.baby_name,
+            "changed": activity is not None,
+            "activity": dict(activity) if activity else None,
+            "summary": self.get_daily_summary(),
+        }
+
+    async def _handle_start_feeding(self, call: ServiceCall) -> Dict[str, Any]:
         """Handle start feeding service call."""
         side = call.data["side"]
         notes = call.data.get("notes", "")
-        await self._handle_start_feeding_internal(side, notes)
+        activity = await self._handle_start_feeding_internal(side, notes)
+        return self._service_response(activity)
+
+    async def _handle_start_feeding_internal(self, side: str, notes: str = "") -> Optional[Dict[str, Any]]:
+        """Queue starting a feeding."""
+        return await self._async_submit(self._apply_start_feeding, side, notes)
 
-    async def _handle_start_feeding_internal(self, side: str, notes: str = "") -> None:
-        """Internal handler for starting feeding."""
+    def _apply_start_feeding(self, side: str, notes: str = "") -> Optional[Dict[str, Any]]:
+        """Start a feeding session, switching sides if one is in progress."""
         # Stop any current feeding
         if self._current_feeding:
-            await self._handle_stop_feeding_internal("Switching sides")
+            self._finish_feeding("Switching sides")
 
         now = datetime.now()
         self._current_feeding = {
@@ -392,20 +725,19 @@ class BabyCareCoordinator(DataUpdateCoordinator):
             "start_time": now.isoformat(),
             "notes": notes,
         }
-        
-        await self._async_save_data()
         _LOGGER.info(f"Started feeding on {side} side")
+        return self._current_feeding
 
-    async def _handle_stop_feeding(self, call: ServiceCall) -> None:
+    async def _handle_stop_feeding(self, call: ServiceCall) -> Dict[str, Any]:
         """Handle stop feeding service call."""
         notes = call.data.get("notes", "")
-        await self._handle_stop_feeding_internal(notes)
+        activity = await self._handle_stop_feeding_internal(notes)
+        return self._service_response(activity)
 
-    async def _handle_stop_feeding_internal(self, notes: str = "") -> None:
-        """Internal handler for stopping feeding."""
+    def _finish_feeding(self, notes: str = "") -> Optional[Dict[str, Any]]:
+        """Close the current feeding session and append it to the history."""
         if not self._current_feeding:
-            _LOGGER.warning("No active feeding session to stop")
-            return
+            return None
 
         now = datetime.now()
         start_time = datetime.fromisoformat(self._current_feeding["start_time"])
@@ -421,23 +753,36 @@ class BabyCareCoordinator(DataUpdateCoordinator):
             "timestamp": now.isoformat(),
         }
 
-        if "activities" not in self._data:
-            self._data["activities"] = []
-        
-        self._data["activities"].append(activity)
+        self._append_activity(activity)
         self._current_feeding = None
-        
-        await self._async_save_data()
-        _LOGGER.info(f"Stopped feeding session, duration: {duration/60:.1f} minutes")
+        return activity
+
+    async def _handle_stop_feeding_internal(self, notes: str = "") -> Optional[Dict[str, Any]]:
+        """Queue stopping the feeding."""
+        return await self._async_submit(self._apply_stop_feeding, notes)
 
-    async def _handle_log_diaper(self, call: ServiceCall) -> None:
+    def _apply_stop_feeding(self, notes: str = "") -> Optional[Dict[str, Any]]:
+        """Stop the current feeding session."""
+        activity = self._finish_feeding(notes)
+        if activity is None:
+            _LOGGER.warning("No active feeding session to stop")
+            return None
+        _LOGGER.info(f"Stopped feeding session, duration: {activity['duration_seconds']/60:.1f} minutes")
+        return activity
+
+    async def _handle_log_diaper(self, call: ServiceCall) -> Dict[str, Any]:
         """Handle log diaper service call."""
         diaper_type = call.data["type"]
         notes = call.data.get("notes", "")
-        await self._handle_log_diaper_internal(diaper_type, notes)
+        activity = await self._handle_log_diaper_internal(diaper_type, notes)
+        return self._service_response(activity)
+
+    async def _handle_log_diaper_internal(self, diaper_type: str, notes: str = "") -> Dict[str, Any]:
+        """Queue logging a diaper change."""
+        return await self._async_submit(self._apply_log_diaper, diaper_type, notes)
 
-    async def _handle_log_diaper_internal(self, diaper_type: str, notes: str = "") -> None:
-        """Internal handler for logging diaper change."""
+    def _apply_log_diaper(self, diaper_type: str, notes: str = "") -> Dict[str, Any]:
+        """Log a diaper change."""
         now = datetime.now()
         activity = {
             "type": ACTIVITY_DIAPER,
@@ -446,23 +791,25 @@ class BabyCareCoordinator(DataUpdateCoordinator):
             "notes": notes,
         }
 
-        if "activities" not in self._data:
-            self._data["activities"] = []
-        
-        self._data["activities"].append(activity)
-        await self._async_save_data()
+        self._append_activity(activity)
         _LOGGER.info(f"Logged diaper change: {diaper_type}")
+        return activity
 
-    async def _handle_log_sleep_start(self, call: ServiceCall) -> None:
+    async def _handle_log_sleep_start(self, call: ServiceCall) -> Dict[str, Any]:
         """Handle log sleep start service call."""
         notes = call.data.get("notes", "")
-        await self._handle_log_sleep_start_internal(notes)
+        activity = await self._handle_log_sleep_start_internal(notes)
+        return self._service_response(activity)
+
+    async def _handle_log_sleep_start_internal(self, notes: str = "") -> Optional[Dict[str, Any]]:
+        """Queue starting a sleep."""
+        return await self._async_submit(self._apply_log_sleep_start, notes)
 
-    async def _handle_log_sleep_start_internal(self, notes: str = "") -> None:
-        """Internal handler for logging sleep start."""
+    def _apply_log_sleep_start(self, notes: str = "") -> Optional[Dict[str, Any]]:
+        """Start a sleep session, ending one that is in progress."""
         # End any current sleep session
         if self._current_sleep:
-            await self._handle_log_wake_up_internal("New sleep session started")
+            self._finish_sleep("New sleep session started")
 
         now = datetime.now()
         self._current_sleep = {
@@ -470,20 +817,19 @@ class BabyCareCoordinator(DataUpdateCoordinator):
             "start_time": now.isoformat(),
             "notes": notes,
         }
-        
-        await self._async_save_data()
         _LOGGER.info("Started sleep session")
+        return self._current_sleep
 
-    async def _handle_log_wake_up(self, call: ServiceCall) -> None:
+    async def _handle_log_wake_up(self, call: ServiceCall) -> Dict[str, Any]:
         """Handle log wake up service call."""
         notes = call.data.get("notes", "")
-        await self._handle_log_wake_up_internal(notes)
+        activity = await self._handle_log_wake_up_internal(notes)
+        return self._service_response(activity)
 
-    async def _handle_log_wake_up_internal(self, notes: str = "") -> None:
-        """Internal handler for logging wake up."""
+    def _finish_sleep(self, notes: str = "") -> Optional[Dict[str, Any]]:
+        """Close the current sleep session and append it to the history."""
         if not self._current_sleep:
-            _LOGGER.warning("No active sleep session to end")
-            return
+            return None
 
         now = datetime.now()
         start_time = datetime.fromisoformat(self._current_sleep["start_time"])
@@ -498,44 +844,97 @@ class BabyCareCoordinator(DataUpdateCoordinator):
             "timestamp": now.isoformat(),
         }
 
-        if "activities" not in self._data:
-            self._data["activities"] = []
-        
-        self._data["activities"].append(activity)
+        self._append_activity(activity)
         self._current_sleep = None
-        
-        await self._async_save_data()
-        _LOGGER.info(f"Ended sleep session, duration: {duration/3600:.1f} hours")
+        return activity
+
+    async def _handle_log_wake_up_internal(self, notes: str = "") -> Optional[Dict[str, Any]]:
+        """Queue ending the sleep."""
+        return await self._async_submit(self._apply_log_wake_up, notes)
+
+    def _apply_log_wake_up(self, notes: str = "") -> Optional[Dict[str, Any]]:
+        """End the current sleep session."""
+        activity = self._finish_sleep(notes)
+        if activity is None:
+            _LOGGER.warning("No active sleep session to end")
+            return None
+        _LOGGER.info(f"Ended sleep session, duration: {activity['duration_seconds']/3600:.1f} hours")
+        return activity
+
+    async def _handle_toggle_sleep_internal(self, notes: str = "") -> Optional[Dict[str, Any]]:
+        """Queue toggling between sleep and wake."""
+        return await self._async_submit(self._apply_toggle_sleep, notes)
+
+    def _apply_toggle_sleep(self, notes: str = "") -> Optional[Dict[str, Any]]:
+        """End the current sleep, or start one if the baby is awake."""
+        if self._current_sleep:
+            return self._apply_log_wake_up(notes)
+        return self._apply_log_sleep_start(notes)
+
+    async def _handle_toggle_feeding_internal(self, notes: str = "") -> Optional[Dict[str, Any]]:
+        """Queue toggling the feeding."""
+        return await self._async_submit(self._apply_toggle_feeding, notes)
 
-    async def _handle_log_bottle_feeding(self, call: ServiceCall) -> None:
+    def _apply_toggle_feeding(self, notes: str = "") -> Optional[Dict[str, Any]]:
+        """Stop the current feeding, or start one on the side not used last time."""
+        if self._current_feeding:
+            return self._apply_stop_feeding(notes)
+        last = self._session_indexes[ACTIVITY_FEEDING].last()
+        side = FEEDING_RIGHT if last and last.get("side") == FEEDING_LEFT else FEEDING_LEFT
+        return self._apply_start_feeding(side, notes)
+
+    async def _handle_log_bottle_feeding(self, call: ServiceCall) -> Dict[str, Any]:
         """Handle log bottle feeding service call."""
         amount_ml = call.data["amount_ml"]
         notes = call.data.get("notes", "")
-        
+        activity = await self._handle_log_bottle_feeding_internal(amount_ml, notes)
+        return self._service_response(activity)
+
+    async def _handle_log_bottle_feeding_internal(self, amount_ml: int, notes: str = "") -> Dict[str, Any]:
+        """Queue logging a bottle feeding."""
+        return await self._async_submit(self._apply_log_bottle_feeding, amount_ml, notes)
+
+    def _apply_log_bottle_feeding(self, amount_ml: int, notes: str = "") -> Dict[str, Any]:
+        """Log a bottle feeding."""
         now = datetime.now()
         activity = {
-            "type": "bottle_feeding",
+            "type": ACTIVITY_BOTTLE_FEEDING,
             "amount_ml": amount_ml,
             "timestamp": now.isoformat(),
             "notes": notes,
         }
 
-        if "activities" not in self._data:
-            self._data["activities"] = []
-        
-        self._data["activities"].append(activity)
-        await self._async_save_data()
+        self._append_activity(activity)
         _LOGGER.info(f"Logged bottle feeding: {amount_ml}ml")
+        return activity
 
-    async def _handle_log_growth(self, call: ServiceCall) -> None:
+    async def _handle_log_growth(self, call: ServiceCall) -> Dict[str, Any]:
         """Handle log growth service call."""
         weight_kg = call.data.get("weight_kg")
         height_cm = call.data.get("height_cm")
         notes = call.data.get("notes", "")
-        
+        activity = await self._handle_log_growth_internal(weight_kg, height_cm, notes)
+        return self._service_response(activity)
+
+    async def _handle_log_growth_internal(
+        self,
+        weight_kg: Optional[float] = None,
+        height_cm: Optional[float] = None,
+        notes: str = "",
+    ) -> Dict[str, Any]:
+        """Queue logging a growth measurement."""
+        return await self._async_submit(self._apply_log_growth, weight_kg, height_cm, notes)
+
+    def _apply_log_growth(
+        self,
+        weight_kg: Optional[float] = None,
+        height_cm: Optional[float] = None,
+        notes: str = "",
+    ) -> Dict[str, Any]:
+        """Log a growth measurement."""
         now = datetime.now()
         activity = {
-            "type": "growth",
+            "type": ACTIVITY_GROWTH,
             "timestamp": now.isoformat(),
             "notes": notes,
         }
@@ -545,57 +944,180 @@ class BabyCareCoordinator(DataUpdateCoordinator):
         if height_cm is not None:
             activity["height_cm"] = height_cm
 
-        if "activities" not in self._data:
-            self._data["activities"] = []
-        
-        self._data["activities"].append(activity)
-        await self._async_save_data()
+        self._append_activity(activity)
         _LOGGER.info(f"Logged growth measurement")
+        return activity
+
+    def _get_activity_or_raise(self, activity_id: str) -> Dict[str, Any]:
+        """Get an activity by ID or raise an error for service calls."""
+        activity = self._activity_index.get(activity_id)
+        if activity is None:
+            raise HomeAssistantError(f"No activity with ID {activity_id} for {self.baby_name}")
+        return activity
+
+    async def _handle_edit_activity(self, call: ServiceCall) -> Dict[str, Any]:
+        """Handle edit activity service call."""
+        # History times are naive local time, whatever offset the caller used
+        changes = {
+            field: (
+                dt_util.as_local(value).replace(tzinfo=None).isoformat()
+                if isinstance(value, datetime)
+                else value
+            )
+            for field, value in call.data.items()
+            if field in EDITABLE_FIELDS
+        }
+        activity = await self._handle_edit_activity_internal(call.data["activity_id"], changes)
+        return self._service_response(activity)
+
+    async def _handle_edit_activity_internal(
+        self, activity_id: str, changes: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """Queue editing an activity."""
+        return await self._async_submit(self._apply_edit_activity, activity_id, changes)
+
+    def _apply_edit_activity(
+        self, activity_id: str, changes: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """Edit an activity in place and reindex it."""
+        activity = self._get_activity_or_raise(activity_id)
+        if all(activity.get(field) == value for field, value in changes.items()):
+            return None
+        
+        edited = {**activity, **changes}
+        if edited.get("start_time") and edited.get("end_time"):
+            start_time = datetime.fromisoformat(edited["start_time"])
+            end_time = datetime.fromisoformat(edited["end_time"])
+            if end_time < start_time:
+                raise HomeAssistantError("The end time must not be before the start time")
+            edited["duration_seconds"] = (end_time - start_time).total_seconds()
+            if "end_time" in changes and "timestamp" not in changes:
+                # Sessions are timestamped when they end
+                edited["timestamp"] = edited["end_time"]
+        
+        # Update the record in place so every reference to it sees the change
+        self._unindex_activity(activity)
+        moved = edited["timestamp"] != activity["timestamp"]
+        if moved:
+            self._pop_activity(activity)
+        activity.update(edited)
+        if moved:
+            self._insert_in_order(activity)
+        self.sync.stamp(activity)
+        self._index_activity(activity)
+        self._reindex_after_change(activity)
+        if not self._is_pending(activity):
+            self._pending_updates[activity["id"]] = activity
+        _LOGGER.info(f"Edited {activity.get('type')} activity {activity_id}")
+        return activity
+
+    async def _handle_delete_activity(self, call: ServiceCall) -> Dict[str, Any]:
+        """Handle delete activity service call."""
+        activity = await self._handle_delete_activity_internal(call.data["activity_id"])
+        return self._service_response(activity)
+
+    async def _handle_delete_activity_internal(self, activity_id: str) -> Dict[str, Any]:
+        """Queue deleting an activity."""
+        return await self._async_submit(self._apply_delete_activity, activity_id)
+
+    def _apply_delete_activity(self, activity_id: str) -> Dict[str, Any]:
+        """Delete an activity."""
+        activity = self._get_activity_or_raise(activity_id)
+        self._remove_activity(activity)
+        _LOGGER.info(f"Deleted {activity.get('type')} activity {activity_id}")
+        return activity
+
+    async def _handle_undo_last(self, call: ServiceCall) -> Dict[str, Any]:
+        """Handle undo last service call."""
+        activity = await self._handle_undo_last_internal()
+        return self._service_response(activity)
+
+    async def _handle_undo_last_internal(self) -> Optional[Dict[str, Any]]:
+        """Queue undoing the most recent action."""
+        return await self._async_submit(self._apply_undo_last)
+
+    def _apply_undo_last(self) -> Optional[Dict[str, Any]]:
+        """Undo the most recent action.
+
+        A feeding or sleep started after the last activity logged here is
+        cancelled. Otherwise that activity is deleted, and a feeding or sleep
+        it finished is resumed. Activities synced from a peer are skipped.
+        """
+        last = next(
+            (
+                activity
+                for activity in reversed(self._data.get("activities", []))
+                if self.sync.is_local(activity)
+            ),
+            None,
+        )
+        
+        sessions = [
+            session for session in (self._current_feeding, self._current_sleep)
+            if session and (last is None or session["start_time"] >= last["timestamp"])
+        ]
+        if sessions:
+            session = max(sessions, key=lambda x: x["start_time"])
+            if session is self._current_feeding:
+                self._current_feeding = None
+            else:
+                self._current_sleep = None
+            _LOGGER.info(f"Cancelled {session.get('type')} started at {session['start_time']}")
+            return session
+        
+        if last is None:
+            return None
+        
+        self._remove_activity(last)
+        if last.get("type") == ACTIVITY_FEEDING and self._current_feeding is None:
+            self._current_feeding = {
+                "type": ACTIVITY_FEEDING,
+                "side": last.get("side"),
+                "start_time": last["start_time"],
+                "notes": last.get("notes", ""),
+            }
+        elif last.get("type") == ACTIVITY_SLEEPING and self._current_sleep is None:
+            self._current_sleep = {
+                "type": ACTIVITY_SLEEPING,
+                "start_time": last["start_time"],
+                "notes": last.get("notes", ""),
+            }
+        _LOGGER.info(f"Undid {last.get('type')} activity {last['id']}")
+        return last
+
+    @callback
+    def _async_save_mappings(self, mappings: List[Dict[str, Any]]) -> bool:
+        """Store the button mappings and rewire the entities that changed."""
+        new_options = mapping_options(self.entry.options, mappings)
+        if new_options == dict(self.entry.options):
+            return False
+        self.hass.config_entries.async_update_entry(self.entry, options=new_options)
+        self._async_apply_mappings(mappings)
+        return True
 
     async def _handle_update_button_mapping(self, call: ServiceCall) -> None:
         """Handle update button mapping service call."""
         entity_id = call.data["entity_id"]
-        trigger_action = call.data.get("trigger_action")
+        trigger_action = call.data.get("trigger_action") or None
         baby_care_action = call.data["baby_care_action"]
         
-        # Map baby care action to config key
-        action_to_config = {
-            "feeding_start_left": CONF_FEEDING_START_LEFT,
-            "feeding_start_right": CONF_FEEDING_START_RIGHT,
-            "feeding_stop": CONF_FEEDING_STOP,
-            "sleep_start": CONF_SLEEP_START,
-            "wake_up": CONF_WAKE_UP,
-            "diaper_pee": CONF_DIAPER_PEE,
-            "diaper_poo": CONF_DIAPER_POO,
-            "diaper_both": CONF_DIAPER_BOTH,
-        }
-        
-        config_key = action_to_config.get(baby_care_action)
-        if not config_key:
+        if baby_care_action not in MAPPING_ACTIONS:
             _LOGGER.error(f"Invalid baby care action: {baby_care_action}")
             return
-            
-        # Update the config entry options
-        new_options = dict(self.entry.options)
-        
-        # Remove any existing mapping for this config key
-        new_options.pop(config_key, None)
         
-        # Add new mapping
+        # A trigger runs one action, so replace any mapping of the same trigger
+        mapping = {"entity_id": entity_id, "action": baby_care_action}
         if trigger_action:
-            new_options[config_key] = f"{entity_id}:{trigger_action}"
-        else:
-            new_options[config_key] = entity_id
-            
-        # Update the config entry
-        self.hass.config_entries.async_update_entry(
-            self.entry, options=new_options
-        )
-        
-        # Restart entity listeners
-        await self.async_remove_entity_listeners()
-        await self.async_setup_entity_listeners()
+            mapping["trigger"] = trigger_action
+        mappings = [
+            existing for existing in get_mappings(self.entry.options)
+            if mapping_key(existing) != (entity_id, trigger_action)
+        ]
+        mappings.append(mapping)
         
+        if not self._async_save_mappings(mappings):
+            _LOGGER.debug(f"Button mapping unchanged: {entity_id} -> {baby_care_action}")
+            return
         _LOGGER.info(f"Updated button mapping: {entity_id} -> {baby_care_action}")
 
     async def _handle_remove_button_mapping(self, call: ServiceCall) -> None:
@@ -603,60 +1125,564 @@ class BabyCareCoordinator(DataUpdateCoordinator):
         entity_id = call.data["entity_id"]
         specific_action = call.data.get("specific_action")
         
-        # Find and remove the mapping
-        new_options = dict(self.entry.options)
-        
-        # Look for the entity in all config keys
-        for config_key in [CONF_FEEDING_START_LEFT, CONF_FEEDING_START_RIGHT, CONF_FEEDING_STOP,
-                          CONF_SLEEP_START, CONF_WAKE_UP, CONF_DIAPER_PEE, CONF_DIAPER_POO, CONF_DIAPER_BOTH]:
-            entity_config = new_options.get(config_key)
-            if entity_config:
-                # Check if this matches our entity (with or without specific action)
-                if ":" in str(entity_config):
-                    config_entity, config_action = entity_config.split(":", 1)
-                    if config_entity == entity_id and (not specific_action or config_action == specific_action):
-                        new_options.pop(config_key, None)
-                        break
-                elif entity_config == entity_id and not specific_action:
-                    new_options.pop(config_key, None)
-                    break
+        mappings = [
+            mapping for mapping in get_mappings(self.entry.options)
+            if mapping["entity_id"] != entity_id
+            or (specific_action and mapping.get("trigger") != specific_action)
+        ]
         
-        # Update the config entry
-        self.hass.config_entries.async_update_entry(
-            self.entry, options=new_options
+        if not self._async_save_mappings(mappings):
+            _LOGGER.debug(f"No button mapping found for {entity_id}")
+            return
+        _LOGGER.info(f"Removed button mapping: {entity_id}")
+
+    # Peer sync
+    async def _handle_sync_now(self, call: ServiceCall) -> Dict[str, Any]:
+        """Handle sync now service call."""
+        if self.peer_sync is None:
+            raise HomeAssistantError(
+                f"Set up a peer for {self.baby_name} under Configure → Peer Sync first"
+            )
+        return await self.peer_sync.async_sync()
+
+    async def async_sync_exchange(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply a peer's changes and answer with ours after its cursor."""
+        applied = await self.async_apply_sync_changes(request["changes"])
+        changes, cursor, more = self.sync.changes_since(
+            request["since"], self.get_activity, applied
         )
+        return {
+            "protocol": request["protocol"],
+            "instance_id": self.sync.instance_id,
+            "ack": request["cursor"],
+            "cursor": cursor,
+            "changes": changes,
+            "more": more,
+        }
+
+    async def async_apply_sync_changes(
+        self,
+        changes: List[Dict[str, Any]],
+        peer: Optional[str] = None,
+        peer_state: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, int]:
+        """Queue applying a peer's changes, returning the sequence numbers they got."""
+        return await self._async_submit(self._apply_sync_changes, changes, peer, peer_state) or {}
+
+    def _apply_sync_changes(
+        self,
+        changes: List[Dict[str, Any]],
+        peer: Optional[str] = None,
+        peer_state: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Dict[str, int]]:
+        """Apply the changes that are newer than ours and remember the peer's cursors.
+
+        A change replaces the activity or tombstone with the same ID only if
+        its version is higher, so applying changes in any order, or twice,
+        ends with the same history on every instance.
+        """
+        applied: Dict[str, int] = {}
+        rebuild_prediction = False
+        for change in changes:
+            activity_id = change["id"]
+            activity = self._activity_index.get(activity_id)
+            current = activity if activity is not None else self.sync.tombstones.get(activity_id)
+            if current is not None and version(change) <= version(current):
+                continue
+
+            if not change.get(FIELD_DELETED):
+                if change.get("type") not in ACTIVITY_TYPES:
+                    _LOGGER.warning(f"Ignoring synced activity {activity_id} of type {change.get('type')}")
+                    continue
+                try:
+                    change = ACTIVITY_TIMES_SCHEMA(change)
+                except vol.Invalid as err:
+                    _LOGGER.warning(f"Ignoring synced activity {activity_id} with invalid times: {err}")
+                    continue
+
+            if change.get(FIELD_DELETED):
+                if activity is not None:
+                    self._remove_activity(activity, change)
+                else:
+                    self.sync.delete(activity_id, change)
+            elif activity is None:
+                synced = {key: value for key, value in change.items() if key != FIELD_SEQ}
+                self._append_activity(synced, synced=True)
+                if synced["type"] in (ACTIVITY_FEEDING, ACTIVITY_BOTTLE_FEEDING):
+                    rebuild_prediction = True
+            else:
+                self._unindex_activity(activity)
+                moved = activity["timestamp"] != change["timestamp"]
+                if moved:
+                    self._pop_activity(activity)
+                activity.clear()
+                activity.update({key: value for key, value in change.items() if key != FIELD_SEQ})
+                if moved:
+                    self._insert_in_order(activity)
+                self.sync.track(activity)
+                self._index_activity(activity)
+                self._reindex_after_change(activity)
+                if not self._is_pending(activity):
+                    self._pending_updates[activity_id] = activity
+            applied[activity_id] = self.sync.sequence
         
-        # Restart entity listeners
-        await self.async_remove_entity_listeners()
-        await self.async_setup_entity_listeners()
+        if rebuild_prediction:
+            self._rebuild_feeding_predictor()
+        if applied:
+            _LOGGER.info(f"Applied {len(applied)} synced changes to {self.baby_name}")
         
-        _LOGGER.info(f"Removed button mapping: {entity_id}")
+        if peer is not None and self.sync.peers.get(peer) != peer_state:
+            self.sync.peers[peer] = peer_state
+            return applied
+        return applied or None
+
+    # Backups
+    async def _handle_backup_history(self, call: ServiceCall) -> Dict[str, Any]:
+        """Handle backup history service call."""
+        return await self.backups.async_backup(call.data.get("full", False))
+
+    async def _handle_restore_history(self, call: ServiceCall) -> Dict[str, Any]:
+        """Handle restore history service call."""
+        return await self.backups.async_restore(call.data.get("at"))
+
+    async def async_restore_history(
+        self, activities: List[Dict[str, Any]], sessions: Dict[str, Any]
+    ) -> Dict[str, int]:
+        """Queue replacing the history with a restored one."""
+        return await self._async_submit(self._apply_restore_history, activities, sessions)
+
+    def _apply_restore_history(
+        self, activities: List[Dict[str, Any]], sessions: Dict[str, Any]
+    ) -> Dict[str, int]:
+        """Replace the history and running sessions with restored ones.
+
+        Only the differences are written, as local changes: restored
+        activities that differ get a new version and missing ones a
+        tombstone, so peers and the next backup pick up the restore.
+        """
+        counts = {"added": 0, "updated": 0, "removed": 0}
+        pending = {id(activity) for activity in self._pending_activities}
+        history = []
+        for restored in activities:
+            activity = self._activity_index.get(restored["id"])
+            if activity is None:
+                activity = restored
+                self._pending_activities.append(activity)
+                self.sync.stamp(activity)
+                counts["added"] += 1
+            elif content(activity) != content(restored):
+                activity.clear()
+                activity.update(restored)
+                self.sync.stamp(activity)
+                if id(activity) not in pending:
+                    self._pending_updates[activity["id"]] = activity
+                counts["updated"] += 1
+            history.append(activity)
+        
+        restored_ids = {activity["id"] for activity in history}
+        for activity in self._data.get("activities", []):
+            if activity["id"] not in restored_ids:
+                self._queue_delete(activity)
+                self.sync.delete(activity["id"])
+                counts["removed"] += 1
+        
+        # Backups keep activities in the order they were first backed up, the history is kept in time
+        history.sort(key=lambda activity: activity["timestamp"])
+        self._data["activities"] = history
+        self._current_feeding = sessions.get("current_feeding")
+        self._current_sleep = sessions.get("current_sleep")
+        self._build_indexes()
+        return counts
+
+    # Reports
+    async def _handle_generate_report(self, call: ServiceCall) -> Dict[str, Any]:
+        """Handle generate report service call."""
+        end = call.data.get("end", datetime.now().date())
+        start = call.data.get("start", end - timedelta(days=DEFAULT_REPORT_DAYS - 1))
+        if end < start:
+            raise HomeAssistantError("The end date must not be before the start date")
+        if (end - start).days >= MAX_REPORT_DAYS:
+            raise HomeAssistantError(f"A report covers at most {MAX_REPORT_DAYS} days")
+        
+        # Aggregate a copy off the event loop, long ranges take a while
+        activities = self.get_history_snapshot(
+            datetime.combine(start, time.min), datetime.combine(end + timedelta(days=1), time.min)
+        )
+        media_dir = self.hass.config.media_dirs.get("local", self.hass.config.path("media"))
+        result = await self.hass.async_add_executor_job(
+            write_report,
+            os.path.join(media_dir, REPORT_DIR),
+            self.baby_name,
+            activities,
+            start,
+            end,
+            self.birth_date,
+            self.sex,
+            datetime.now(),
+        )
+        _LOGGER.info(f"Generated {self.baby_name} report for {start} to {end}: {result['path']}")
+        
+        return {
+            "baby": self.baby_name,
+            "file": result["path"],
+            "media_content_id": f"media-source://media_source/local/{REPORT_DIR}/{result['file_name']}",
+            **{key: value for key, value in result["report"].items() if key != "daily"},
+        }
 
     # Helper methods for sensors
+    def memoize(self, key: Hashable, compute: Callable[[], T]) -> T:
+        """Return a value derived from the current data, computed once per data generation."""
+        return self.entity_cache.get(self.data_generation, key, compute)
+
     def get_daily_activities(self, activity_type: str) -> List[Dict[str, Any]]:
         """Get activities for today by type."""
-        today = datetime.now().date()
-        activities = self._data.get("activities", [])
-        
-        return [
-            activity for activity in activities
-            if activity.get("type") == activity_type
-            and datetime.fromisoformat(activity["timestamp"]).date() == today
-        ]
+        if not self.data:
+            return []
+        return self.data["daily"].get(activity_type, [])
 
     def get_last_activity(self, activity_type: str) -> Optional[Dict[str, Any]]:
         """Get the most recent activity of a specific type."""
-        activities = self._data.get("activities", [])
+        if not self.data:
+            return None
+        return self.data["last"].get(activity_type)
+
+    def get_last_activity_time(self, activity_type: str) -> Optional[datetime]:
+        """Get the time of the most recent activity of a specific type."""
+        return self.memoize(
+            ("last_activity_time", activity_type), lambda: self._last_activity_time(activity_type)
+        )
+
+    def _last_activity_time(self, activity_type: str) -> Optional[datetime]:
+        """Parse the time of the most recent activity of a specific type."""
+        activity = self.get_last_activity(activity_type)
+        if not activity:
+            return None
+        return datetime.fromisoformat(activity["timestamp"])
+
+    def get_session_start(self, activity_type: str) -> Optional[datetime]:
+        """Get the start of the in-progress feeding or sleep."""
+        return self.memoize(("session_start", activity_type), lambda: self._session_start(activity_type))
+
+    def _session_start(self, activity_type: str) -> Optional[datetime]:
+        """Parse the start of the in-progress feeding or sleep."""
+        current = self._current_session(activity_type)
+        if not current:
+            return None
+        return datetime.fromisoformat(current["start_time"])
+
+    def get_daily_summary(self) -> Dict[str, Any]:
+        """Get today's aggregates and the current activity state."""
+        return self.memoize("daily_summary", self._daily_summary)
+
+    def _daily_summary(self) -> Dict[str, Any]:
+        """Compute today's aggregates and the current activity state."""
+        feedings = self.get_daily_activities(ACTIVITY_FEEDING)
+        bottles = self.get_daily_activities(ACTIVITY_BOTTLE_FEEDING)
+        
+        return {
+            "daily_feedings": len(feedings),
+            "daily_feeding_minutes": round(
+                sum(f.get("duration_seconds", 0) for f in feedings) / 60, 1
+            ),
+            "daily_bottle_feedings": len(bottles),
+            "daily_bottle_ml": sum(b.get("amount_ml", 0) for b in bottles),
+            "daily_diapers": len(self.get_daily_activities(ACTIVITY_DIAPER)),
+            "daily_sleep_hours": self.get_sleep_totals(datetime.now().date())["total_hours"],
+            "currently_feeding": self.is_currently_feeding,
+            "currently_sleeping": self.is_currently_sleeping,
+        }
+
+    def _current_session(self, activity_type: str) -> Optional[Dict[str, Any]]:
+        """Get the in-progress session of a type."""
+        if activity_type == ACTIVITY_FEEDING:
+            return self._current_feeding
+        if activity_type == ACTIVITY_SLEEPING:
+            return self._current_sleep
+        return None
+
+    def get_sessions(
+        self, activity_type: str, start: datetime, end: datetime
+    ) -> List[Dict[str, Any]]:
+        """Get sessions overlapping a time range, clipped to it."""
+        range_start = start.timestamp()
+        range_end = end.timestamp()
+        sessions = [
+            {
+                "start_time": activity["start_time"],
+                "end_time": activity["end_time"],
+                "in_progress": False,
+                "duration_seconds": min(session_end, range_end) - max(session_start, range_start),
+            }
+            for session_start, session_end, activity in self._session_indexes[activity_type].overlapping(
+                range_start, range_end
+            )
+        ]
         
-        type_activities = [
-            activity for activity in activities
-            if activity.get("type") == activity_type
+        current = self._current_session(activity_type)
+        if current:
+            session_start = datetime.fromisoformat(current["start_time"]).timestamp()
+            session_end = min(datetime.now().timestamp(), range_end)
+            if session_start < range_end and session_end > range_start:
+                sessions.append({
+                    "start_time": current["start_time"],
+                    "end_time": None,
+                    "in_progress": True,
+                    "duration_seconds": session_end - max(session_start, range_start),
+                })
+        
+        return sessions
+
+    def get_activities_between(self, start: datetime, end: datetime) -> List[Dict[str, Any]]:
+        """Get activities overlapping a time range, including sessions in progress."""
+        range_start = start.timestamp()
+        range_end = end.timestamp()
+        activities = [
+            activity
+            for _, _, activity in self._time_index.overlapping(range_start, range_end)
         ]
         
-        if not type_activities:
+        now = datetime.now().timestamp()
+        for current in (self._current_feeding, self._current_sleep):
+            if current:
+                session_start = datetime.fromisoformat(current["start_time"]).timestamp()
+                if session_start < range_end and now > range_start:
+                    activities.append(current)
+        
+        return activities
+
+    def get_session_duration(self, activity_type: str, start: datetime, end: datetime) -> float:
+        """Get the seconds covered by sessions within a time range."""
+        return sum(
+            session["duration_seconds"]
+            for session in self.get_sessions(activity_type, start, end)
+        )
+
+    def get_sleep_totals(self, day: date) -> Dict[str, float]:
+        """Get sleep hours within a calendar day, split into night and day."""
+        return self.memoize(("sleep_totals", day), lambda: self._sleep_totals(day))
+
+    def _sleep_totals(self, day: date) -> Dict[str, float]:
+        """Compute sleep hours within a calendar day, split into night and day."""
+        day_start = datetime.combine(day, time.min)
+        night_end = day_start + timedelta(hours=NIGHT_END_HOUR)
+        night_start = day_start + timedelta(hours=NIGHT_START_HOUR)
+        day_end = day_start + timedelta(days=1)
+        
+        night = (
+            self.get_session_duration(ACTIVITY_SLEEPING, day_start, night_end)
+            + self.get_session_duration(ACTIVITY_SLEEPING, night_start, day_end)
+        )
+        daytime = self.get_session_duration(ACTIVITY_SLEEPING, night_end, night_start)
+        
+        return {
+            "total_hours": round((night + daytime) / 3600, 2),
+            "night_hours": round(night / 3600, 2),
+            "day_hours": round(daytime / 3600, 2),
+        }
+
+    async def _handle_get_session_summary(self, call: ServiceCall) -> Dict[str, Any]:
+        """Handle get session summary service call."""
+        activity_type = call.data["activity_type"]
+        start = call.data["start"]
+        end = call.data["end"]
+        if end <= start:
+            raise HomeAssistantError("The end of the range must be after its start")
+        
+        sessions = self.get_sessions(activity_type, start, end)
+        total = sum(session["duration_seconds"] for session in sessions)
+        
+        return {
+            "baby": self.baby_name,
+            "activity_type": activity_type,
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "total_hours": round(total / 3600, 2),
+            "sessions": sessions,
+        }
+
+    def get_chart_series(
+        self, series: str, start: float, end: float, points: int
+    ) -> Dict[str, Any]:
+        """Get a chart series over [start, end) epoch seconds, cached until the history changes.
+
+        A running sleep is drawn up to now, so its series is also cached per minute.
+        """
+        open_minute = None
+        if series == SERIES_SLEEP and self._current_sleep:
+            open_minute = int(datetime.now().timestamp() // 60)
+        return self.chart_cache.get(
+            self.history_generation,
+            (series, start, end, points, open_minute),
+            lambda: self._build_chart_series(series, start, end, points),
+        )
+
+    def _build_chart_series(
+        self, series: str, start: float, end: float, points: int
+    ) -> Dict[str, Any]:
+        """Build a chart series from the in-memory indexes."""
+        now = datetime.now().timestamp()
+        
+        if series == SERIES_FEEDINGS:
+            starts = [
+                session_start
+                for session_start, _, _ in self._session_indexes[ACTIVITY_FEEDING].overlapping(start, end)
+            ]
+            starts.extend(
+                timestamp
+                for timestamp, _, activity in self._time_index.overlapping(start, end)
+                if activity.get("type") == ACTIVITY_BOTTLE_FEEDING
+            )
+            if self._current_feeding:
+                starts.append(datetime.fromisoformat(self._current_feeding["start_time"]).timestamp())
+            bucket_seconds = bucket_seconds_for(start, end, points)
+            return {
+                "bucket_seconds": bucket_seconds,
+                "points": to_millis(bucket_counts(starts, start, end, bucket_seconds)),
+            }
+        
+        if series == SERIES_SLEEP:
+            intervals = [
+                (max(session_start, start), min(session_end, end))
+                for session_start, session_end, _ in self._session_indexes[ACTIVITY_SLEEPING].overlapping(
+                    start, end
+                )
+            ]
+            if self._current_sleep:
+                session_start = datetime.fromisoformat(self._current_sleep["start_time"]).timestamp()
+                if session_start < end and now > start:
+                    intervals.append((max(session_start, start), min(now, end)))
+            if len(intervals) <= points:
+                return {
+                    "intervals": [
+                        [int(interval_start * 1000), int(interval_end * 1000)]
+                        for interval_start, interval_end in intervals
+                    ],
+                }
+            # Too many sleeps to draw one by one, chart the time asleep per bucket
+            bucket_seconds = bucket_seconds_for(start, end, points)
+            return {
+                "source_intervals": len(intervals),
+                "bucket_seconds": bucket_seconds,
+                "points": to_millis(bucket_durations(intervals, start, end, bucket_seconds)),
+            }
+        
+        if series == SERIES_BOTTLE:
+            amounts = [
+                (timestamp, activity.get("amount_ml", 0))
+                for timestamp, _, activity in self._time_index.overlapping(start, end)
+                if activity.get("type") == ACTIVITY_BOTTLE_FEEDING
+            ]
+            return {"source_points": len(amounts), "points": to_millis(lttb(amounts, points))}
+        
+        if series == SERIES_GROWTH:
+            growth = [
+                (timestamp, activity)
+                for timestamp, _, activity in self._time_index.overlapping(start, end)
+                if activity.get("type") == ACTIVITY_GROWTH
+            ]
+            response: Dict[str, Any] = {}
+            for measurement in INDICATOR_MEASUREMENTS.values():
+                values = [
+                    (timestamp, activity[measurement])
+                    for timestamp, activity in growth
+                    if activity.get(measurement) is not None
+                ]
+                response[measurement] = {
+                    "source_points": len(values),
+                    "points": to_millis(lttb(values, points)),
+                }
+            return response
+        
+        raise HomeAssistantError(f"Unknown chart series: {series}")
+
+    @property
+    def birth_date(self) -> Optional[date]:
+        """Return the birth date from the options or the initial setup."""
+        value = self.entry.options.get(CONF_BIRTH_DATE, self.entry.data.get(CONF_BIRTH_DATE))
+        if not value:
+            return None
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            _LOGGER.warning(f"Invalid birth date for {self.baby_name}: {value}")
+            return None
+
+    @property
+    def sex(self) -> Optional[str]:
+        """Return the sex used for growth percentiles."""
+        return self.entry.options.get(CONF_SEX, self.entry.data.get(CONF_SEX))
+
+    def _growth_point(
+        self, indicator: str, activity: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """Return the percentile of a growth activity's measurement."""
+        birth_date = self.birth_date
+        if birth_date is None or self.sex is None:
+            return None
+        
+        measurement = INDICATOR_MEASUREMENTS[indicator]
+        age_days = (datetime.fromisoformat(activity["timestamp"]).date() - birth_date).days
+        result = growth_percentile(indicator, self.sex, age_days, activity[measurement])
+        if result is None:
+            return None
+        
+        return {
+            measurement: activity[measurement],
+            "age_days": age_days,
+            "measured_at": activity["timestamp"],
+            **result,
+        }
+
+    def get_growth_percentile(self, indicator: str) -> Optional[Dict[str, Any]]:
+        """Return the percentile of the latest measurement of an indicator."""
+        return self.memoize(("growth_percentile", indicator), lambda: self._growth_percentile(indicator))
+
+    def _growth_percentile(self, indicator: str) -> Optional[Dict[str, Any]]:
+        """Compute the percentile of the latest measurement of an indicator."""
+        activity = self._latest_growth.get(INDICATOR_MEASUREMENTS[indicator])
+        if activity is None:
             return None
+        return self._growth_point(indicator, activity)
+
+    def get_feeding_prediction(self) -> Optional[Dict[str, Any]]:
+        """Return the predicted next feeding time and duration."""
+        return self.memoize("feeding_prediction", self.feeding_predictor.predict)
+
+    async def _handle_get_growth_curve(self, call: ServiceCall) -> Dict[str, Any]:
+        """Handle get growth curve service call."""
+        birth_date = self.birth_date
+        if birth_date is None or self.sex is None:
+            raise HomeAssistantError(
+                f"Set the birth date and sex of {self.baby_name} in the integration options first"
+            )
         
-        return max(type_activities, key=lambda x: x["timestamp"])
+        indicators = [call.data["indicator"]] if "indicator" in call.data else INDICATORS
+        percentiles = call.data.get("percentiles")
+        step_days = call.data.get("step_days", 7)
+        measurements = await self._async_query_range(
+            ACTIVITY_GROWTH,
+            datetime.combine(birth_date, time.min),
+            datetime.now() + timedelta(seconds=1),
+        )
+        
+        response: Dict[str, Any] = {
+            "baby": self.baby_name,
+            "sex": self.sex,
+            "birth_date": birth_date.isoformat(),
+            "indicators": {},
+        }
+        for indicator in indicators:
+            measurement = INDICATOR_MEASUREMENTS[indicator]
+            points = [
+                self._growth_point(indicator, activity)
+                for activity in measurements
+                if activity.get(measurement) is not None
+            ]
+            response["indicators"][indicator] = {
+                "curves": growth_curve(indicator, self.sex, percentiles, step_days),
+                "measurements": [point for point in points if point is not None],
+            }
+        return response
 
     @property
     def is_currently_feeding(self) -> bool:
@@ -0,0 +1,195 @@
+"""Cached catalog of mappable devices and their triggers for the panel."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.components.device_automation import (
+    DeviceAutomationType,
+    async_get_device_automations,
+)
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback, split_entity_id
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.start import async_at_started
+
+from .const import DOMAIN, MAPPING_DOMAINS
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_DEVICE_CATALOG = f"{DOMAIN}_device_catalog"
+
+WS_TYPE_DEVICE_CATALOG = f"{DOMAIN}/device_catalog"
+
+
+class DeviceTriggerCatalog:
+    """Devices with mappable entities and the trigger subtypes they offer.
+
+    Built in the background once Home Assistant has started. Registry
+    updates mark single devices stale, and stale devices are rebuilt on the
+    next request, so the panel gets everything in one round trip.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the catalog."""
+        self.hass = hass
+        self._devices: Dict[str, Dict[str, Any]] = {}
+        self._stale: Set[str] = set()
+        self._build_task: Optional[asyncio.Task] = None
+        self._unsubs: List[CALLBACK_TYPE] = []
+
+    @callback
+    def async_start(self) -> None:
+        """Follow registry updates and build the catalog once started."""
+        self._unsubs = [
+            self.hass.bus.async_listen(dr.EVENT_DEVICE_REGISTRY_UPDATED, self._async_device_updated),
+            self.hass.bus.async_listen(er.EVENT_ENTITY_REGISTRY_UPDATED, self._async_entity_updated),
+            async_at_started(self.hass, self._async_schedule_build),
+        ]
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop following registry updates."""
+        for unsub in self._unsubs:
+            unsub()
+        self._unsubs = []
+        if self._build_task is not None:
+            self._build_task.cancel()
+
+    async def _async_schedule_build(self, hass: HomeAssistant) -> None:
+        """Start the initial build in the background."""
+        if self._build_task is None:
+            self._build_task = hass.async_create_background_task(
+                self._async_build(), f"{DOMAIN} device trigger catalog"
+            )
+
+    @callback
+    def _async_device_updated(self, event: Event) -> None:
+        """Drop removed devices and mark changed ones stale."""
+        device_id = event.data["device_id"]
+        if event.data["action"] == "remove":
+            self._devices.pop(device_id, None)
+            self._stale.discard(device_id)
+        else:
+            self._stale.add(device_id)
+
+    @callback
+    def _async_entity_updated(self, event: Event) -> None:
+        """Mark the devices an entity moved from or to stale."""
+        entity_id = event.data["entity_id"]
+        if split_entity_id(entity_id)[0] not in MAPPING_DOMAINS:
+            return
+        if old_device_id := event.data.get("changes", {}).get("device_id"):
+            self._stale.add(old_device_id)
+        entry = er.async_get(self.hass).async_get(entity_id)
+        if entry is not None and entry.device_id:
+            self._stale.add(entry.device_id)
+        elif event.data["action"] == "remove":
+            # The entry is gone, so its device is unknown; rebuild every device
+            self._stale.update(self._devices)
+
+    async def _async_build(self, device_ids: Optional[Iterable[str]] = None) -> None:
+        """Build the entries of some devices, or of all of them."""
+        entity_registry = er.async_get(self.hass)
+        device_registry = dr.async_get(self.hass)
+        wanted = set(device_ids) if device_ids is not None else None
+
+        entities: Dict[str, List[Dict[str, Any]]] = {}
+        for entry in entity_registry.entities.values():
+            if not entry.device_id or (wanted is not None and entry.device_id not in wanted):
+                continue
+            domain = split_entity_id(entry.entity_id)[0]
+            if domain not in MAPPING_DOMAINS or entry.disabled_by is not None:
+                continue
+            state = self.hass.states.get(entry.entity_id)
+            entities.setdefault(entry.device_id, []).append({
+                "entity_id": entry.entity_id,
+                "name": state.name if state else entry.name or entry.original_name or entry.entity_id,
+                "domain": domain,
+            })
+
+        triggers = await async_get_device_automations(
+            self.hass, DeviceAutomationType.TRIGGER, list(entities)
+        )
+
+        for device_id in wanted if wanted is not None else list(self._devices):
+            self._devices.pop(device_id, None)
+        for device_id, device_entities in entities.items():
+            device = device_registry.async_get(device_id)
+            if device is None:
+                continue
+            subtypes = {}
+            for trigger in triggers.get(device_id, []):
+                key = (trigger.get("entity_id"), trigger.get("type"), trigger.get("subtype"))
+                subtypes[key] = {
+                    "entity_id": trigger.get("entity_id"),
+                    "type": trigger.get("type"),
+                    "subtype": trigger.get("subtype"),
+                }
+            self._devices[device_id] = {
+                "id": device_id,
+                "name": device.name_by_user or device.name or device.model or "Unknown Device",
+                "model": device.model,
+                "manufacturer": device.manufacturer,
+                "area_id": device.area_id,
+                "entities": device_entities,
+                "triggers": list(subtypes.values()),
+            }
+        _LOGGER.debug(f"Device trigger catalog built for {len(entities)} devices")
+
+    async def async_get_devices(self) -> List[Dict[str, Any]]:
+        """Return the catalog, rebuilding stale devices first."""
+        if self._build_task is None:
+            self._build_task = self.hass.async_create_background_task(
+                self._async_build(), f"{DOMAIN} device trigger catalog"
+            )
+        await asyncio.shield(self._build_task)
+        if self._stale:
+            stale, self._stale = self._stale, set()
+            await self._async_build(stale)
+        return list(self._devices.values())
+
+    @callback
+    def async_get_unassigned_entities(self) -> List[Dict[str, Any]]:
+        """Return mappable entities that belong to no device."""
+        entity_registry = er.async_get(self.hass)
+        unassigned = []
+        for domain in MAPPING_DOMAINS:
+            for state in self.hass.states.async_all(domain):
+                entry = entity_registry.async_get(state.entity_id)
+                if entry is not None and entry.device_id:
+                    continue
+                unassigned.append({
+                    "entity_id": state.entity_id,
+                    "name": state.name,
+                    "domain": domain,
+                })
+        return unassigned
+
+
+@websocket_api.websocket_command({vol.Required("type"): WS_TYPE_DEVICE_CATALOG})
+@websocket_api.async_response
+async def websocket_device_catalog(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: Dict[str, Any]
+) -> None:
+    """Send the devices, their triggers and the entities without a device."""
+    catalog: DeviceTriggerCatalog = hass.data[DATA_DEVICE_CATALOG]
+    connection.send_result(
+        msg["id"],
+        {
+            "devices": await catalog.async_get_devices(),
+            "entities": catalog.async_get_unassigned_entities(),
+        },
+    )
+
+
+@callback
+def async_setup_device_catalog(hass: HomeAssistant) -> None:
+    """Create the catalog and register its websocket command."""
+    catalog = hass.data[DATA_DEVICE_CATALOG] = DeviceTriggerCatalog(hass)
+    catalog.async_start()
+    websocket_api.async_register_command(hass, websocket_device_catalog)
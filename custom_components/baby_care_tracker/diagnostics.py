@@ -0,0 +1,47 @@
+"""Diagnostics support for Baby Care Tracker."""
+from __future__ import annotations
+
+from typing import Any, Dict
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, CONF_SYNC_TOKEN
+from .coordinator import BabyCareCoordinator
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> Dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: BabyCareCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    return {
+        "entry": {
+            "title": entry.title,
+            "data": dict(entry.data),
+            "options": async_redact_data(entry.options, {CONF_SYNC_TOKEN}),
+        },
+        "storage": {
+            "backend": coordinator.storage_backend,
+            "history_size": coordinator.history_size,
+            "size_bytes": await coordinator.async_get_storage_size(),
+        },
+        "state": {
+            "currently_feeding": coordinator.is_currently_feeding,
+            "currently_sleeping": coordinator.is_currently_sleeping,
+            "last_update_success": coordinator.last_update_success,
+        },
+        "sync": {
+            "instance_id": coordinator.sync.instance_id,
+            "sequence": coordinator.sync.sequence,
+            "tombstones": len(coordinator.sync.tombstones),
+            "peer": coordinator.peer_sync.as_dict() if coordinator.peer_sync else None,
+        },
+        "performance": coordinator.metrics.as_dict(),
+        "caches": {
+            "chart_series": coordinator.chart_cache.as_dict(),
+            "entities": coordinator.entity_cache.as_dict(),
+        },
+    }
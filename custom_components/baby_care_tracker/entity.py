@@ -0,0 +1,118 @@
+"""Base entity for Baby Care Tracker."""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple, TypeVar
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.entity import EntityDescription
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN
+from .coordinator import BabyCareCoordinator
+from .metrics import COUNTER_STATE_WRITES, COUNTER_STATE_WRITES_SKIPPED
+
+# Key of the state in significant change thresholds
+SIGNIFICANT_STATE = "state"
+
+_DescriptionT = TypeVar("_DescriptionT", bound=EntityDescription)
+
+
+def build_unique_id(baby_name: str, key: str) -> str:
+    """Return the unique id of a baby's entity."""
+    return f"{DOMAIN}_{baby_name}_{key}".lower().replace(" ", "_")
+
+
+def async_enabled_descriptions(
+    hass: HomeAssistant,
+    platform: str,
+    baby_name: str,
+    descriptions: Iterable[_DescriptionT],
+) -> List[_DescriptionT]:
+    """Return the descriptions of entities that are not disabled in the entity registry.
+
+    Disabled entities are not created at all, so they neither listen to the
+    coordinator nor compute their state. Entities not registered yet are
+    created once so the registry learns about them; enabling one later
+    reloads the config entry, which creates it then.
+    """
+    registry = er.async_get(hass)
+    enabled = []
+    for description in descriptions:
+        entity_id = registry.async_get_entity_id(
+            platform, DOMAIN, build_unique_id(baby_name, description.key)
+        )
+        if entity_id is not None and registry.async_get(entity_id).disabled:
+            continue
+        enabled.append(description)
+    return enabled
+
+
+def _is_significant(old: Any, new: Any, threshold: Optional[float]) -> bool:
+    """Return whether a value changed by at least the threshold."""
+    if old == new:
+        return False
+    if threshold is None or old is None or new is None:
+        return True
+    try:
+        return abs(float(new) - float(old)) >= threshold
+    except (TypeError, ValueError):
+        return True
+
+
+class BabyCareEntity(CoordinatorEntity):
+    """Entity of a baby that only writes its state when it changes.
+
+    Coordinator updates arrive every poll, but most leave an entity as it
+    was; those are skipped instead of being written and recorded again.
+    Live durations only move on when they change by their significant
+    change threshold, so a running feeding is not recorded every poll, and
+    unrecorded attributes without a threshold never cause a write alone.
+    """
+
+    # "state" or an attribute -> smallest change that is written
+    _significant_changes: Dict[str, float] = {}
+
+    def __init__(self, coordinator: BabyCareCoordinator, baby_name: str, sensor_type: str) -> None:
+        """Initialize the entity."""
+        super().__init__(coordinator)
+        self._baby_name = baby_name
+        self._sensor_type = sensor_type
+        self._attr_unique_id = build_unique_id(baby_name, sensor_type)
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, baby_name)},
+            "name": f"Baby Care - {baby_name}",
+            "manufacturer": "Baby Care Tracker",
+            "model": "Baby Monitor",
+        }
+        self._last_written: Optional[Tuple[bool, Any, Dict[str, Any]]] = None
+
+    def _has_changed(self, written: Tuple[bool, Any, Dict[str, Any]]) -> bool:
+        """Return whether the entity changed significantly since its last write."""
+        if self._last_written is None:
+            return True
+        old_available, old_state, old_attributes = self._last_written
+        available, state, attributes = written
+        if available != old_available or old_attributes.keys() != attributes.keys():
+            return True
+        if _is_significant(old_state, state, self._significant_changes.get(SIGNIFICANT_STATE)):
+            return True
+        for key, value in attributes.items():
+            threshold = self._significant_changes.get(key)
+            if threshold is None and key in self._unrecorded_attributes:
+                # Refreshed with the next write, the recorder would not keep it anyway
+                continue
+            if _is_significant(old_attributes[key], value, threshold):
+                return True
+        return False
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state if it changed significantly."""
+        written = (self.available, self.state, dict(self.extra_state_attributes or {}))
+        if not self._has_changed(written):
+            self.coordinator.metrics.increment(COUNTER_STATE_WRITES_SKIPPED)
+            return
+        self._last_written = written
+        self.coordinator.metrics.increment(COUNTER_STATE_WRITES)
+        self.async_write_ha_state()
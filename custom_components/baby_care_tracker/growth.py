@@ -0,0 +1,212 @@
+"""WHO growth standard percentiles for Baby Care Tracker.
+
+Reference values are the WHO Child Growth Standards LMS parameters for
+weight-for-age and length-for-age, by completed month from birth to 24 months.
+"""
+from __future__ import annotations
+
+import math
+from array import array
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from .const import SEX_FEMALE, SEX_MALE
+
+# Growth indicators
+INDICATOR_WEIGHT = "weight_for_age"
+INDICATOR_LENGTH = "length_for_age"
+
+INDICATORS = [INDICATOR_WEIGHT, INDICATOR_LENGTH]
+
+# Measurement stored on growth activities for each indicator
+INDICATOR_MEASUREMENTS = {
+    INDICATOR_WEIGHT: "weight_kg",
+    INDICATOR_LENGTH: "height_cm",
+}
+
+# Average days per month used by the WHO standards
+DAYS_PER_MONTH = 30.4375
+
+# Percentiles drawn by default on growth charts
+DEFAULT_CURVE_PERCENTILES = [3, 15, 50, 85, 97]
+
+# (L, M, S) per month 0-24
+_WHO_LMS: Dict[Tuple[str, str], List[Tuple[float, float, float]]] = {
+    (INDICATOR_WEIGHT, SEX_MALE): [
+        (0.3487, 3.3464, 0.14602), (0.2297, 4.4709, 0.13395), (0.1970, 5.5675, 0.12385),
+        (0.1738, 6.3762, 0.11727), (0.1553, 7.0023, 0.11316), (0.1395, 7.5105, 0.11080),
+        (0.1257, 7.9340, 0.10958), (0.1134, 8.2970, 0.10902), (0.1021, 8.6151, 0.10882),
+        (0.0917, 8.9014, 0.10881), (0.0820, 9.1649, 0.10891), (0.0730, 9.4122, 0.10906),
+        (0.0644, 9.6479, 0.10925), (0.0563, 9.8749, 0.10949), (0.0487, 10.0953, 0.10976),
+        (0.0413, 10.3108, 0.11007), (0.0343, 10.5228, 0.11041), (0.0275, 10.7319, 0.11079),
+        (0.0211, 10.9385, 0.11119), (0.0148, 11.1430, 0.11164), (0.0087, 11.3462, 0.11211),
+        (0.0029, 11.5486, 0.11261), (-0.0028, 11.7504, 0.11314), (-0.0083, 11.9514, 0.11369),
+        (-0.0137, 12.1515, 0.11426),
+    ],
+    (INDICATOR_WEIGHT, SEX_FEMALE): [
+        (0.3809, 3.2322, 0.14171), (0.1714, 4.1873, 0.13724), (0.0962, 5.1282, 0.13000),
+        (0.0402, 5.8458, 0.12619), (-0.0050, 6.4237, 0.12402), (-0.0430, 6.8985, 0.12274),
+        (-0.0756, 7.2970, 0.12204), (-0.1039, 7.6422, 0.12178), (-0.1288, 7.9487, 0.12181),
+        (-0.1507, 8.2254, 0.12199), (-0.1700, 8.4800, 0.12223), (-0.1872, 8.7192, 0.12247),
+        (-0.2024, 8.9481, 0.12268), (-0.2158, 9.1699, 0.12283), (-0.2278, 9.3870, 0.12294),
+        (-0.2384, 9.6008, 0.12299), (-0.2478, 9.8124, 0.12303), (-0.2562, 10.0226, 0.12306),
+        (-0.2637, 10.2315, 0.12309), (-0.2703, 10.4393, 0.12315), (-0.2762, 10.6464, 0.12323),
+        (-0.2815, 10.8534, 0.12335), (-0.2862, 11.0608, 0.12350), (-0.2903, 11.2688, 0.12369),
+        (-0.2941, 11.4775, 0.12390),
+    ],
+    (INDICATOR_LENGTH, SEX_MALE): [
+        (1, 49.8842, 0.03795), (1, 54.7244, 0.03557), (1, 58.4249, 0.03424),
+        (1, 61.4292, 0.03328), (1, 63.8860, 0.03257), (1, 65.9026, 0.03204),
+        (1, 67.6236, 0.03165), (1, 69.1645, 0.03139), (1, 70.5994, 0.03124),
+        (1, 71.9687, 0.03117), (1, 73.2812, 0.03118), (1, 74.5388, 0.03125),
+        (1, 75.7488, 0.03137), (1, 76.9186, 0.03154), (1, 78.0497, 0.03174),
+        (1, 79.1458, 0.03197), (1, 80.2113, 0.03222), (1, 81.2487, 0.03250),
+        (1, 82.2587, 0.03279), (1, 83.2418, 0.03310), (1, 84.1996, 0.03342),
+        (1, 85.1348, 0.03376), (1, 86.0477, 0.03410), (1, 86.9410, 0.03445),
+        (1, 87.8161, 0.03479),
+    ],
+    (INDICATOR_LENGTH, SEX_FEMALE): [
+        (1, 49.1477, 0.03790), (1, 53.6872, 0.03640), (1, 57.0673, 0.03568),
+        (1, 59.8029, 0.03520), (1, 62.0899, 0.03486), (1, 64.0301, 0.03463),
+        (1, 65.7311, 0.03448), (1, 67.2873, 0.03441), (1, 68.7498, 0.03440),
+        (1, 70.1435, 0.03444), (1, 71.4818, 0.03452), (1, 72.7710, 0.03464),
+        (1, 74.0150, 0.03479), (1, 75.2176, 0.03496), (1, 76.3817, 0.03514),
+        (1, 77.5099, 0.03534), (1, 78.6055, 0.03555), (1, 79.6710, 0.03576),
+        (1, 80.7079, 0.03598), (1, 81.7182, 0.03620), (1, 82.7036, 0.03643),
+        (1, 83.6654, 0.03666), (1, 84.6040, 0.03688), (1, 85.5202, 0.03711),
+        (1, 86.4153, 0.03734),
+    ],
+}
+
+
+class LmsTable:
+    """LMS parameters of one indicator and sex in compact arrays."""
+
+    def __init__(self, rows: List[Tuple[float, float, float]]) -> None:
+        """Initialize the table from monthly rows."""
+        self.ages = array("d", (month * DAYS_PER_MONTH for month in range(len(rows))))
+        self.l_values = array("d", (row[0] for row in rows))
+        self.m_values = array("d", (row[1] for row in rows))
+        self.s_values = array("d", (row[2] for row in rows))
+
+    @property
+    def max_age_days(self) -> float:
+        """Return the oldest age covered by the table."""
+        return self.ages[-1]
+
+    def lms(self, age_days: float) -> Optional[Tuple[float, float, float]]:
+        """Return the LMS parameters at an age, interpolated linearly."""
+        if age_days < 0 or age_days > self.max_age_days:
+            return None
+        upper = min(bisect_right(self.ages, age_days), len(self.ages) - 1)
+        lower = max(upper - 1, 0)
+        if upper == lower:
+            return self.l_values[lower], self.m_values[lower], self.s_values[lower]
+
+        fraction = (age_days - self.ages[lower]) / (self.ages[upper] - self.ages[lower])
+        return (
+            self.l_values[lower] + fraction * (self.l_values[upper] - self.l_values[lower]),
+            self.m_values[lower] + fraction * (self.m_values[upper] - self.m_values[lower]),
+            self.s_values[lower] + fraction * (self.s_values[upper] - self.s_values[lower]),
+        )
+
+
+_TABLES: Dict[Tuple[str, str], LmsTable] = {}
+
+
+def get_table(indicator: str, sex: str) -> LmsTable:
+    """Return the reference table of an indicator and sex, loading it once."""
+    key = (indicator, sex)
+    table = _TABLES.get(key)
+    if table is None:
+        table = _TABLES[key] = LmsTable(_WHO_LMS[key])
+    return table
+
+
+def lms_value(z_score: float, l_value: float, m_value: float, s_value: float) -> float:
+    """Return the measurement at a z-score."""
+    if l_value == 0:
+        return m_value * math.exp(s_value * z_score)
+    return m_value * (1 + l_value * s_value * z_score) ** (1 / l_value)
+
+
+def lms_z_score(value: float, l_value: float, m_value: float, s_value: float) -> float:
+    """Return the z-score of a measurement."""
+    if l_value == 0:
+        return math.log(value / m_value) / s_value
+    return ((value / m_value) ** l_value - 1) / (l_value * s_value)
+
+
+def z_score_to_percentile(z_score: float) -> float:
+    """Return the percentile of a z-score on the standard normal distribution."""
+    return 50 * (1 + math.erf(z_score / math.sqrt(2)))
+
+
+def percentile_to_z_score(percentile: float) -> float:
+    """Return the z-score of a percentile by bisection on the normal CDF."""
+    low, high = -6.0, 6.0
+    for _ in range(60):
+        middle = (low + high) / 2
+        if z_score_to_percentile(middle) < percentile:
+            low = middle
+        else:
+            high = middle
+    return (low + high) / 2
+
+
+@lru_cache(maxsize=1024)
+def growth_z_score(indicator: str, sex: str, age_days: int, value: float) -> Optional[float]:
+    """Return the z-score of a measurement at an age in days.
+
+    Weight z-scores beyond +/-3 use the WHO restricted LMS method, which
+    extrapolates linearly from the SD3 distance to limit skewness.
+    """
+    if value <= 0:
+        return None
+    lms = get_table(indicator, sex).lms(age_days)
+    if lms is None:
+        return None
+
+    z_score = lms_z_score(value, *lms)
+    if indicator == INDICATOR_WEIGHT and abs(z_score) > 3:
+        sign = 1 if z_score > 0 else -1
+        sd3 = lms_value(3 * sign, *lms)
+        sd23 = sd3 - lms_value(2 * sign, *lms)
+        z_score = 3 * sign + (value - sd3) / abs(sd23)
+    return z_score
+
+
+def growth_percentile(
+    indicator: str, sex: str, age_days: int, value: float
+) -> Optional[Dict[str, float]]:
+    """Return the z-score and percentile of a measurement."""
+    z_score = growth_z_score(indicator, sex, age_days, value)
+    if z_score is None:
+        return None
+    return {
+        "z_score": round(z_score, 2),
+        "percentile": round(z_score_to_percentile(z_score), 1),
+    }
+
+
+def growth_curve(
+    indicator: str,
+    sex: str,
+    percentiles: Optional[List[float]] = None,
+    step_days: int = 7,
+) -> Dict[str, List[List[float]]]:
+    """Return [age_days, value] points of percentile curves over the table."""
+    if percentiles is None:
+        percentiles = DEFAULT_CURVE_PERCENTILES
+    table = get_table(indicator, sex)
+    z_scores = {percentile: percentile_to_z_score(percentile) for percentile in percentiles}
+    curves: Dict[str, List[List[float]]] = {f"{percentile:g}": [] for percentile in percentiles}
+
+    age_days = 0
+    while age_days <= table.max_age_days:
+        lms = table.lms(age_days)
+        for percentile, z_score in z_scores.items():
+            curves[f"{percentile:g}"].append([age_days, round(lms_value(z_score, *lms), 2)])
+        age_days += step_days
+    return curves
@@ -0,0 +1,146 @@
+"""Interval index over completed activity sessions."""
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+Interval = Tuple[float, float, Dict[str, Any]]
+Bounds = Callable[[Dict[str, Any]], Optional[Tuple[float, float]]]
+
+
+def session_bounds(activity: Dict[str, Any]) -> Optional[Tuple[float, float]]:
+    """Return (start, end) epoch seconds of a session activity."""
+    start_time = activity.get("start_time")
+    end_time = activity.get("end_time")
+    if not start_time or not end_time:
+        return None
+    return (
+        datetime.fromisoformat(start_time).timestamp(),
+        datetime.fromisoformat(end_time).timestamp(),
+    )
+
+
+def activity_bounds(activity: Dict[str, Any]) -> Optional[Tuple[float, float]]:
+    """Return (start, end) epoch seconds of any activity, sessions or points."""
+    bounds = session_bounds(activity)
+    if bounds is not None:
+        return bounds
+    timestamp = activity.get("timestamp")
+    if not timestamp:
+        return None
+    point = datetime.fromisoformat(timestamp).timestamp()
+    return point, point
+
+
+def timestamp_bounds(activity: Dict[str, Any]) -> Optional[Tuple[float, float]]:
+    """Return the timestamp of an activity as a zero-length interval."""
+    timestamp = activity.get("timestamp")
+    if not timestamp:
+        return None
+    point = datetime.fromisoformat(timestamp).timestamp()
+    return point, point
+
+
+class IntervalIndex:
+    """Sessions sorted by start time, for overlap and clipped duration queries.
+
+    A query only has to look at sessions starting at most the longest session
+    length before the range, so lookups are a binary search plus a walk over
+    the matching sessions.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._starts: List[float] = []
+        self._intervals: List[Interval] = []
+        self._max_length = 0.0
+
+    def __len__(self) -> int:
+        """Return the number of indexed sessions."""
+        return len(self._intervals)
+
+    def last(self) -> Optional[Dict[str, Any]]:
+        """Return the activity that started last."""
+        return self._intervals[-1][2] if self._intervals else None
+
+    def add(self, start: float, end: float, activity: Dict[str, Any]) -> None:
+        """Add a completed session."""
+        if end < start:
+            start, end = end, start
+        self._max_length = max(self._max_length, end - start)
+
+        if not self._starts or start >= self._starts[-1]:
+            self._starts.append(start)
+            self._intervals.append((start, end, activity))
+            return
+
+        position = bisect_right(self._starts, start)
+        self._starts.insert(position, start)
+        self._intervals.insert(position, (start, end, activity))
+
+    def add_activity(self, activity: Dict[str, Any], bounds_func: Bounds = session_bounds) -> bool:
+        """Add an activity, returning False if it has no bounds."""
+        bounds = bounds_func(activity)
+        if bounds is None:
+            return False
+        self.add(bounds[0], bounds[1], activity)
+        return True
+
+    def remove_activity(self, activity: Dict[str, Any], bounds_func: Bounds = session_bounds) -> bool:
+        """Remove an activity, returning False if it was not indexed.
+
+        The longest session length is left as is; it only widens queries.
+        """
+        bounds = bounds_func(activity)
+        if bounds is None:
+            return False
+        start = min(bounds)
+        position = bisect_left(self._starts, start)
+        while position < len(self._starts) and self._starts[position] == start:
+            if self._intervals[position][2] is activity:
+                del self._starts[position]
+                del self._intervals[position]
+                return True
+            position += 1
+        return False
+
+    @classmethod
+    def from_activities(
+        cls, activities: Iterable[Dict[str, Any]], bounds_func: Bounds = session_bounds
+    ) -> IntervalIndex:
+        """Build an index from activities in one sort."""
+        index = cls()
+        intervals = []
+        for activity in activities:
+            bounds = bounds_func(activity)
+            if bounds is not None:
+                start, end = sorted(bounds)
+                intervals.append((start, end, activity))
+        intervals.sort(key=lambda interval: interval[0])
+        index._intervals = intervals
+        index._starts = [interval[0] for interval in intervals]
+        index._max_length = max((end - start for start, end, _ in intervals), default=0.0)
+        return index
+
+    def overlapping(self, start: float, end: float) -> List[Interval]:
+        """Return sessions overlapping [start, end), ordered by start.
+
+        Zero-length entries (point activities) are included when they fall
+        inside the range.
+        """
+        first = bisect_left(self._starts, start - self._max_length)
+        last = bisect_left(self._starts, end)
+        return [
+            interval
+            for interval in self._intervals[first:last]
+            if interval[1] > start or interval[0] >= start
+        ]
+
+    def clipped_duration(self, start: float, end: float) -> float:
+        """Return the seconds covered by sessions within [start, end)."""
+        return sum(
+            min(interval_end, end) - max(interval_start, start)
+            for interval_start, interval_end, _ in self.overlapping(start, end)
+        )
+
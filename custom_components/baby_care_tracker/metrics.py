@@ -0,0 +1,113 @@
+"""Performance instrumentation for Baby Care Tracker."""
+from __future__ import annotations
+
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, Optional
+
+# Number of samples kept per metric
+HISTOGRAM_SIZE = 256
+
+# Metric names, timings are in milliseconds
+METRIC_LOAD = "load_ms"
+METRIC_SAVE = "save_ms"
+METRIC_SAVE_ACTIVITIES = "save_activities"
+METRIC_SAVE_NEW_ACTIVITIES = "save_new_activities"
+METRIC_UPDATE = "update_ms"
+METRIC_QUERY_RANGE = "query_range_ms"
+METRIC_QUERY_LAST = "query_last_ms"
+METRIC_LISTENER_FANOUT = "listener_fanout_ms"
+METRIC_COMMAND_BATCH = "command_batch"
+
+# Counter names
+COUNTER_STATE_TRIGGERED = "state_change_triggered"
+COUNTER_STATE_IGNORED = "state_change_ignored"
+COUNTER_BUTTON_TRIGGERED = "button_event_triggered"
+COUNTER_BUTTON_MISSED = "button_event_missed"
+COUNTER_TRIGGER_DEBOUNCED = "trigger_debounced"
+COUNTER_TRIGGER_DUPLICATE = "trigger_duplicate"
+COUNTER_TRIGGER_RATE_LIMITED = "trigger_rate_limited"
+COUNTER_STATE_WRITES = "state_writes"
+COUNTER_STATE_WRITES_SKIPPED = "state_writes_skipped"
+
+
+class RollingHistogram:
+    """Keep the most recent samples of a metric and summarize them."""
+
+    def __init__(self, size: int = HISTOGRAM_SIZE) -> None:
+        """Initialize the histogram."""
+        self._samples: Deque[float] = deque(maxlen=size)
+        self.count = 0
+        self.last: Optional[float] = None
+
+    def add(self, value: float) -> None:
+        """Record a sample."""
+        self._samples.append(value)
+        self.count += 1
+        self.last = value
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """Return a percentile of the retained samples."""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Summarize the retained samples."""
+        if not self._samples:
+            return {"count": self.count}
+        return {
+            "count": self.count,
+            "last": round(self.last, 3),
+            "min": round(min(self._samples), 3),
+            "mean": round(sum(self._samples) / len(self._samples), 3),
+            "p50": round(self.percentile(50), 3),
+            "p95": round(self.percentile(95), 3),
+            "max": round(max(self._samples), 3),
+        }
+
+
+class PerformanceMetrics:
+    """Rolling histograms and counters for coordinator hot paths."""
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self.histograms: Dict[str, RollingHistogram] = {}
+        self.counters: Dict[str, int] = {}
+
+    def record(self, name: str, value: float) -> None:
+        """Record a sample for a metric."""
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = RollingHistogram()
+        histogram.add(value)
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        """Increment a counter."""
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """Record the duration of the wrapped block in milliseconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000)
+
+    def get(self, name: str) -> Optional[RollingHistogram]:
+        """Return the histogram for a metric."""
+        return self.histograms.get(name)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Summarize all metrics."""
+        return {
+            "histograms": {
+                name: histogram.as_dict()
+                for name, histogram in sorted(self.histograms.items())
+            },
+            "counters": dict(sorted(self.counters.items())),
+        }
@@ -0,0 +1,159 @@
+"""Next-feeding prediction for Baby Care Tracker."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+from .const import ACTIVITY_BOTTLE_FEEDING, ACTIVITY_FEEDING
+
+# Smoothing factor of the exponentially weighted averages
+PREDICTION_ALPHA = 0.3
+# Samples an hour-of-day bucket needs before it is preferred over the overall average
+PREDICTION_MIN_BUCKET_SAMPLES = 3
+# History used to train the model on load
+PREDICTION_HISTORY = timedelta(days=14)
+# A feeding starting this soon after the previous one ended continues it (side switch)
+FEEDING_CONTINUATION_GAP = timedelta(minutes=30)
+# Intervals outside this range are gaps in logging rather than cadence
+MIN_FEEDING_INTERVAL = timedelta(minutes=30)
+MAX_FEEDING_INTERVAL = timedelta(hours=12)
+
+
+class ExponentialAverage:
+    """Exponentially weighted moving average."""
+
+    def __init__(self, alpha: float = PREDICTION_ALPHA) -> None:
+        """Initialize the average."""
+        self.alpha = alpha
+        self.value: Optional[float] = None
+        self.count = 0
+
+    def add(self, sample: float) -> None:
+        """Add a sample."""
+        if self.value is None:
+            self.value = sample
+        else:
+            self.value += self.alpha * (sample - self.value)
+        self.count += 1
+
+
+class HourlyAverage:
+    """Exponentially weighted averages per hour of day with an overall fallback."""
+
+    def __init__(self) -> None:
+        """Initialize the averages."""
+        self.overall = ExponentialAverage()
+        self.buckets: List[ExponentialAverage] = [ExponentialAverage() for _ in range(24)]
+
+    def add(self, hour: int, sample: float) -> None:
+        """Add a sample to an hour bucket and the overall average."""
+        self.overall.add(sample)
+        self.buckets[hour].add(sample)
+
+    def get(self, hour: int) -> Optional[float]:
+        """Return the bucket average, or the overall one if the bucket is sparse."""
+        bucket = self.buckets[hour]
+        if bucket.count >= PREDICTION_MIN_BUCKET_SAMPLES:
+            return bucket.value
+        return self.overall.value
+
+
+def feeding_bounds(activity: Dict[str, Any]) -> Optional[tuple]:
+    """Return (start, end) of a breast or bottle feeding."""
+    activity_type = activity.get("type")
+    if activity_type == ACTIVITY_FEEDING and activity.get("start_time"):
+        start = datetime.fromisoformat(activity["start_time"])
+        end = datetime.fromisoformat(activity.get("end_time") or activity["timestamp"])
+        return start, end
+    if activity_type == ACTIVITY_BOTTLE_FEEDING:
+        timestamp = datetime.fromisoformat(activity["timestamp"])
+        return timestamp, timestamp
+    return None
+
+
+class FeedingPredictor:
+    """Online model of feeding cadence by time of day.
+
+    Each feeding updates the interval and duration averages of the hour it
+    started in once the next feeding arrives, so updates are O(1). Side
+    switches and top-up bottles right after a feeding are merged into it.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the model."""
+        self.intervals = HourlyAverage()
+        self.durations = HourlyAverage()
+        self._start: Optional[datetime] = None
+        self._end: Optional[datetime] = None
+        self._duration = 0.0
+
+    @classmethod
+    def from_activities(
+        cls, activities: Iterable[Dict[str, Any]], now: Optional[datetime] = None
+    ) -> FeedingPredictor:
+        """Train a model on the recent feedings in a history."""
+        if now is None:
+            now = datetime.now()
+        cutoff = (now - PREDICTION_HISTORY).isoformat()
+        feedings = []
+        for activity in activities:
+            if activity.get("timestamp", "") < cutoff:
+                continue
+            bounds = feeding_bounds(activity)
+            if bounds is not None:
+                feedings.append(bounds)
+
+        predictor = cls()
+        for start, end in sorted(feedings):
+            predictor.add(start, end)
+        return predictor
+
+    def add_activity(self, activity: Dict[str, Any]) -> None:
+        """Update the model with a feeding activity."""
+        bounds = feeding_bounds(activity)
+        if bounds is not None:
+            self.add(*bounds)
+
+    def add(self, start: datetime, end: datetime) -> None:
+        """Update the model with a feeding."""
+        if self._start is None:
+            self._start, self._end, self._duration = start, end, (end - start).total_seconds()
+            return
+
+        if start < self._start:
+            # Feedings logged out of order carry no cadence information
+            return
+
+        if start - self._end <= FEEDING_CONTINUATION_GAP:
+            self._end = max(self._end, end)
+            self._duration += (end - start).total_seconds()
+            return
+
+        interval = start - self._start
+        if MIN_FEEDING_INTERVAL <= interval <= MAX_FEEDING_INTERVAL:
+            self.intervals.add(self._start.hour, interval.total_seconds())
+        if self._duration > 0:
+            self.durations.add(self._start.hour, self._duration)
+        self._start, self._end, self._duration = start, end, (end - start).total_seconds()
+
+    @property
+    def last_feeding_start(self) -> Optional[datetime]:
+        """Return the start of the most recent feeding."""
+        return self._start
+
+    def predict(self) -> Optional[Dict[str, Any]]:
+        """Return the predicted next feeding time and duration."""
+        if self._start is None:
+            return None
+        interval = self.intervals.get(self._start.hour)
+        if interval is None:
+            return None
+
+        next_feeding = self._start + timedelta(seconds=interval)
+        duration = self.durations.get(next_feeding.hour)
+        return {
+            "next_feeding": next_feeding,
+            "interval_minutes": round(interval / 60, 1),
+            "expected_duration_minutes": round(duration / 60, 1) if duration is not None else None,
+            "samples": self.intervals.overall.count,
+        }
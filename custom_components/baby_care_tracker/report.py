@@ -0,0 +1,351 @@
+"""Printable pediatrician report of a baby's history over a date range."""
+from __future__ import annotations
+
+import html
+import logging
+import os
+from datetime import date, datetime, time, timedelta
+from statistics import median
+from typing import Any, Dict, List, Optional
+
+from .const import (
+    ACTIVITY_BOTTLE_FEEDING,
+    ACTIVITY_DIAPER,
+    ACTIVITY_FEEDING,
+    ACTIVITY_GROWTH,
+    ACTIVITY_SLEEPING,
+    DIAPER_BOTH,
+    DIAPER_PEE,
+    DIAPER_POO,
+    FEEDING_LEFT,
+    FEEDING_RIGHT,
+)
+from .growth import INDICATOR_LENGTH, INDICATOR_WEIGHT, INDICATOR_MEASUREMENTS, growth_percentile
+
+_LOGGER = logging.getLogger(__name__)
+
+# Reports are written to this folder of the local media directory
+REPORT_DIR = "baby_care_tracker"
+
+# Longest range a report covers
+MAX_REPORT_DAYS = 731
+DEFAULT_REPORT_DAYS = 30
+
+
+def _parse(value: str) -> datetime:
+    """Parse a stored local timestamp."""
+    return datetime.fromisoformat(value)
+
+
+def _clipped_seconds(start: datetime, end: datetime, range_start: datetime, range_end: datetime) -> float:
+    """Return the seconds of [start, end) inside [range_start, range_end)."""
+    return max(0.0, (min(end, range_end) - max(start, range_start)).total_seconds())
+
+
+def _per_day(total: float, days: int) -> float:
+    """Return a daily average."""
+    return round(total / days, 1) if days else 0.0
+
+
+def build_report(
+    activities: List[Dict[str, Any]],
+    start: date,
+    end: date,
+    birth_date: Optional[date] = None,
+    sex: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Aggregate the activities overlapping the days from start to end, inclusive.
+
+    Point activities count on the day they were logged. Feedings count when
+    they ended, as in the daily sensors, and sleep is split across the days
+    it covers.
+    """
+    range_start = datetime.combine(start, time.min)
+    range_end = datetime.combine(end + timedelta(days=1), time.min)
+    days = (end - start).days + 1
+    daily = {
+        start + timedelta(days=offset): {
+            "feedings": 0,
+            "feeding_minutes": 0.0,
+            "bottle_ml": 0,
+            "sleep_hours": 0.0,
+            "diapers": 0,
+        }
+        for offset in range(days)
+    }
+
+    feeding_starts: List[datetime] = []
+    feeding_seconds: List[float] = []
+    sides = {FEEDING_LEFT: 0, FEEDING_RIGHT: 0}
+    bottles: List[int] = []
+    sleeps: List[Dict[str, Any]] = []
+    diapers = {DIAPER_PEE: 0, DIAPER_POO: 0, DIAPER_BOTH: 0}
+    growth: List[Dict[str, Any]] = []
+
+    for activity in activities:
+        activity_type = activity.get("type")
+        if activity_type == ACTIVITY_SLEEPING:
+            if not activity.get("start_time") or not activity.get("end_time"):
+                continue
+            sleep_start = _parse(activity["start_time"])
+            sleep_end = _parse(activity["end_time"])
+            seconds = _clipped_seconds(sleep_start, sleep_end, range_start, range_end)
+            if seconds <= 0:
+                continue
+            sleeps.append({"start": sleep_start, "seconds": (sleep_end - sleep_start).total_seconds()})
+            # Split the sleep across the days it covers
+            day = max(sleep_start, range_start).date()
+            while day <= end and datetime.combine(day, time.min) < sleep_end:
+                day_start = datetime.combine(day, time.min)
+                daily[day]["sleep_hours"] += _clipped_seconds(
+                    sleep_start, sleep_end, day_start, day_start + timedelta(days=1)
+                ) / 3600
+                day += timedelta(days=1)
+            continue
+
+        timestamp = _parse(activity["timestamp"])
+        if not range_start <= timestamp < range_end:
+            continue
+        totals = daily[timestamp.date()]
+        if activity_type == ACTIVITY_FEEDING:
+            duration = activity.get("duration_seconds", 0)
+            totals["feedings"] += 1
+            totals["feeding_minutes"] += duration / 60
+            feeding_seconds.append(duration)
+            feeding_starts.append(_parse(activity.get("start_time") or activity["timestamp"]))
+            if activity.get("side") in sides:
+                sides[activity["side"]] += 1
+        elif activity_type == ACTIVITY_BOTTLE_FEEDING:
+            amount = activity.get("amount_ml", 0)
+            totals["bottle_ml"] += amount
+            bottles.append(amount)
+            feeding_starts.append(timestamp)
+        elif activity_type == ACTIVITY_DIAPER:
+            totals["diapers"] += 1
+            if activity.get("diaper_type") in diapers:
+                diapers[activity["diaper_type"]] += 1
+        elif activity_type == ACTIVITY_GROWTH:
+            growth.append(_growth_row(activity, timestamp, birth_date, sex))
+
+    feeding_starts.sort()
+    intervals = [
+        (later - earlier).total_seconds() / 3600
+        for earlier, later in zip(feeding_starts, feeding_starts[1:])
+    ]
+    sleep_hours = sum(totals["sleep_hours"] for totals in daily.values())
+    longest = max(sleeps, key=lambda sleep: sleep["seconds"], default=None)
+
+    return {
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "days": days,
+        "feeding": {
+            "breastfeedings": len(feeding_seconds),
+            "breastfeedings_per_day": _per_day(len(feeding_seconds), days),
+            "average_minutes": round(sum(feeding_seconds) / len(feeding_seconds) / 60, 1) if feeding_seconds else None,
+            "minutes_per_day": _per_day(sum(feeding_seconds) / 60, days),
+            "left": sides[FEEDING_LEFT],
+            "right": sides[FEEDING_RIGHT],
+            "bottles": len(bottles),
+            "bottles_per_day": _per_day(len(bottles), days),
+            "bottle_ml": sum(bottles),
+            "bottle_ml_per_day": _per_day(sum(bottles), days),
+            "average_bottle_ml": round(sum(bottles) / len(bottles)) if bottles else None,
+            "feedings_per_day": _per_day(len(feeding_starts), days),
+            "median_interval_hours": round(median(intervals), 1) if intervals else None,
+            "shortest_interval_hours": round(min(intervals), 1) if intervals else None,
+            "longest_interval_hours": round(max(intervals), 1) if intervals else None,
+        },
+        "sleep": {
+            "sleeps": len(sleeps),
+            "total_hours": round(sleep_hours, 1),
+            "hours_per_day": _per_day(sleep_hours, days),
+            "average_hours": round(sum(sleep["seconds"] for sleep in sleeps) / len(sleeps) / 3600, 1) if sleeps else None,
+            "longest_hours": round(longest["seconds"] / 3600, 1) if longest else None,
+            "longest_start": longest["start"].isoformat() if longest else None,
+        },
+        "diapers": {
+            "total": sum(diapers.values()),
+            "per_day": _per_day(sum(diapers.values()), days),
+            **diapers,
+        },
+        "growth": sorted(growth, key=lambda row: row["measured_at"]),
+        "daily": [
+            {
+                "date": day.isoformat(),
+                "feedings": totals["feedings"],
+                "feeding_minutes": round(totals["feeding_minutes"]),
+                "bottle_ml": totals["bottle_ml"],
+                "sleep_hours": round(totals["sleep_hours"], 1),
+                "diapers": totals["diapers"],
+            }
+            for day, totals in daily.items()
+        ],
+    }
+
+
+def _growth_row(
+    activity: Dict[str, Any], timestamp: datetime, birth_date: Optional[date], sex: Optional[str]
+) -> Dict[str, Any]:
+    """Return a growth measurement with its percentiles, when the birth date and sex are known."""
+    row: Dict[str, Any] = {"measured_at": activity["timestamp"], "age_days": None}
+    if birth_date is not None:
+        row["age_days"] = (timestamp.date() - birth_date).days
+    for indicator in (INDICATOR_WEIGHT, INDICATOR_LENGTH):
+        measurement = INDICATOR_MEASUREMENTS[indicator]
+        value = activity.get(measurement)
+        row[measurement] = value
+        row[f"{measurement}_percentile"] = None
+        if value is not None and sex is not None and row["age_days"] is not None:
+            result = growth_percentile(indicator, sex, row["age_days"], value)
+            if result is not None:
+                row[f"{measurement}_percentile"] = result["percentile"]
+    return row
+
+
+def _value(value: Any, unit: str = "") -> str:
+    """Format a report value, a dash when unknown."""
+    if value is None:
+        return "–"
+    return html.escape(f"{value}{unit}")
+
+
+def _table(rows: List[List[Any]], header: Optional[List[str]] = None) -> str:
+    """Render an HTML table from already formatted cells."""
+    head = ""
+    if header:
+        head = "<thead><tr>" + "".join(f"<th>{html.escape(cell)}</th>" for cell in header) + "</tr></thead>"
+    body = "".join("<tr>" + "".join(f"<td>{cell}</td>" for cell in row) + "</tr>" for row in rows)
+    return f"<table>{head}<tbody>{body}</tbody></table>"
+
+
+def _bar(value: float, maximum: float) -> str:
+    """Render a value with a proportional bar."""
+    width = round(100 * value / maximum) if maximum else 0
+    return f'<div class="bar"><span style="width:{width}%"></span></div>{html.escape(str(value))}'
+
+
+def render_report(report: Dict[str, Any], baby_name: str, generated: datetime) -> str:
+    """Render a report as a self-contained HTML page that prints to PDF."""
+    feeding = report["feeding"]
+    sleep = report["sleep"]
+    diapers = report["diapers"]
+
+    sections = [
+        "<h2>Feeding</h2>",
+        _table([
+            ["Feedings per day (breast and bottle)", _value(feeding["feedings_per_day"])],
+            ["Time between feedings, median", _value(feeding["median_interval_hours"], " h")],
+            ["Time between feedings, range", f'{_value(feeding["shortest_interval_hours"], " h")} – {_value(feeding["longest_interval_hours"], " h")}'],
+            ["Breastfeedings", f'{feeding["breastfeedings"]} ({_value(feeding["breastfeedings_per_day"])} per day)'],
+            ["Breastfeeding length, average", _value(feeding["average_minutes"], " min")],
+            ["Breastfeeding time per day", _value(feeding["minutes_per_day"], " min")],
+            ["Left / right side", f'{feeding["left"]} / {feeding["right"]}'],
+            ["Bottles", f'{feeding["bottles"]} ({_value(feeding["bottles_per_day"])} per day)'],
+            ["Bottle volume", f'{feeding["bottle_ml"]} ml ({_value(feeding["bottle_ml_per_day"])} ml per day)'],
+            ["Bottle volume, average", _value(feeding["average_bottle_ml"], " ml")],
+        ]),
+        "<h2>Sleep</h2>",
+        _table([
+            ["Sleep per day", _value(sleep["hours_per_day"], " h")],
+            ["Total sleep", _value(sleep["total_hours"], " h")],
+            ["Sleeps", str(sleep["sleeps"])],
+            ["Sleep length, average", _value(sleep["average_hours"], " h")],
+            ["Longest stretch", _value(sleep["longest_hours"], " h") + (
+                f' (from {_value(sleep["longest_start"][:16].replace("T", " "))})' if sleep["longest_start"] else ""
+            )],
+        ]),
+        "<h2>Diapers</h2>",
+        _table([
+            ["Diapers per day", _value(diapers["per_day"])],
+            ["Total", str(diapers["total"])],
+            ["Wet / dirty / both", f'{diapers[DIAPER_PEE]} / {diapers[DIAPER_POO]} / {diapers[DIAPER_BOTH]}'],
+        ]),
+        "<h2>Growth</h2>",
+    ]
+
+    if report["growth"]:
+        sections.append(_table(
+            [
+                [
+                    _value(row["measured_at"][:10]),
+                    _value(row["age_days"], " d"),
+                    _value(row["weight_kg"], " kg"),
+                    _value(row["weight_kg_percentile"]),
+                    _value(row["height_cm"], " cm"),
+                    _value(row["height_cm_percentile"]),
+                ]
+                for row in report["growth"]
+            ],
+            ["Date", "Age", "Weight", "Percentile", "Length", "Percentile"],
+        ))
+        sections.append('<p class="note">Percentiles compare with the WHO Child Growth Standards.</p>')
+    else:
+        sections.append("<p>No measurements in this period.</p>")
+
+    daily = report["daily"]
+    maxima = {
+        key: max((row[key] for row in daily), default=0)
+        for key in ("feedings", "feeding_minutes", "bottle_ml", "sleep_hours", "diapers")
+    }
+    sections.append("<h2>Day by day</h2>")
+    sections.append(_table(
+        [
+            [_value(row["date"])] + [_bar(row[key], maxima[key]) for key in maxima]
+            for row in daily
+        ],
+        ["Date", "Breastfeedings", "Breastfeeding (min)", "Bottle (ml)", "Sleep (h)", "Diapers"],
+    ))
+
+    title = f"{baby_name}: {report['start']} to {report['end']}"
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{html.escape(title)}</title>
+<style>
+body {{ font-family: -apple-system, "Segoe UI", Roboto, sans-serif; color: #222; max-width: 50em; margin: 2em auto; padding: 0 1em; }}
+h1 {{ margin-bottom: 0; }}
+h2 {{ border-bottom: 1px solid #ccc; margin-top: 1.5em; }}
+table {{ border-collapse: collapse; width: 100%; }}
+td, th {{ padding: 0.25em 0.5em; text-align: left; border-bottom: 1px solid #eee; }}
+.bar {{ display: inline-block; width: 4em; height: 0.6em; margin-right: 0.4em; background: #eee; }}
+.bar span {{ display: block; height: 100%; background: #4a90d9; }}
+.note, .meta {{ color: #666; font-size: 0.9em; }}
+@media print {{ body {{ margin: 0; }} h2 {{ break-after: avoid; }} tr {{ break-inside: avoid; }} }}
+</style>
+</head>
+<body>
+<h1>{html.escape(baby_name)}</h1>
+<p class="meta">{html.escape(report['start'])} to {html.escape(report['end'])} ({report['days']} days) · generated {html.escape(generated.strftime('%Y-%m-%d %H:%M'))}</p>
+{"".join(sections)}
+</body>
+</html>
+"""
+
+
+def write_report(
+    directory: str,
+    baby_name: str,
+    activities: List[Dict[str, Any]],
+    start: date,
+    end: date,
+    birth_date: Optional[date],
+    sex: Optional[str],
+    generated: datetime,
+) -> Dict[str, Any]:
+    """Aggregate, render and write a report, returning the report and its file name.
+
+    Runs in the executor over a snapshot of the activities.
+    """
+    report = build_report(activities, start, end, birth_date, sex)
+    slug = "".join(char if char.isalnum() else "_" for char in baby_name.lower())
+    file_name = f"{slug}_{start.isoformat()}_{end.isoformat()}.html"
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, file_name)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        file.write(render_report(report, baby_name, generated))
+    os.replace(temp_path, path)
+    _LOGGER.debug(f"Wrote {baby_name} report for {start} to {end} to {path}")
+    return {"file_name": file_name, "path": path, "report": report}
@@ -2,393 +2,595 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
+    SensorEntityDescription,
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import UnitOfTime
+from homeassistant.const import PERCENTAGE, Platform, UnitOfTime, UnitOfVolume
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, CONF_BABY_NAME, ACTIVITY_FEEDING, ACTIVITY_SLEEPING, ACTIVITY_DIAPER
+from .const import (
+    DOMAIN,
+    CONF_BABY_NAME,
+    STATISTICS_SENSOR_TRENDS,
+    ACTIVITY_FEEDING,
+    ACTIVITY_SLEEPING,
+    ACTIVITY_DIAPER,
+    ACTIVITY_BOTTLE_FEEDING,
+)
 from .coordinator import BabyCareCoordinator
+from .entity import SIGNIFICANT_STATE, BabyCareEntity, async_enabled_descriptions
+from .growth import INDICATOR_LENGTH, INDICATOR_WEIGHT
+from .metrics import METRIC_SAVE
+from .trends import (
+    TREND_BOTTLE_ML,
+    TREND_DIAPERS,
+    TREND_FEEDINGS,
+    TREND_SLEEP_HOURS,
+    TREND_WINDOWS,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+# Trend metric -> (name, unit, device class, icon)
+# Rolling sums go up and down, volume sensors only allow totals so the bottle trend has no device class
+TREND_SENSORS = {
+    TREND_FEEDINGS: ("Feedings", None, None, "mdi:baby-bottle"),
+    TREND_SLEEP_HOURS: ("Sleep", UnitOfTime.HOURS, SensorDeviceClass.DURATION, "mdi:sleep"),
+    TREND_DIAPERS: ("Diapers", None, None, "mdi:baby"),
+    TREND_BOTTLE_ML: ("Bottle Volume", UnitOfVolume.MILLILITERS, None, "mdi:baby-bottle-outline"),
+}
+
+
+@dataclass(frozen=True, kw_only=True)
+class BabyCareSensorEntityDescription(SensorEntityDescription):
+    """Describes a baby care sensor by the queries behind its state and attributes."""
+
+    value_fn: Callable[[BabyCareCoordinator], Any]
+    attr_fn: Optional[Callable[[BabyCareCoordinator], Dict[str, Any]]] = None
+    # "state" or an attribute -> smallest change that is written
+    significant_changes: Dict[str, float] = field(default_factory=dict)
+    # Key under which the sensor can be left out of long-term statistics
+    statistics_key: Optional[str] = None
+    # Measures a running session against the current time, so it is never memoized
+    live: bool = False
+
+
+def _session_seconds(coordinator: BabyCareCoordinator, activity_type: str) -> Optional[float]:
+    """Return how long the in-progress feeding or sleep has been running."""
+    start_time = coordinator.get_session_start(activity_type)
+    if start_time is None:
+        return None
+    return (datetime.now() - start_time).total_seconds()
 
-async def async_setup_entry(
-    hass: HomeAssistant,
-    config_entry: ConfigEntry,
-    async_add_entities: AddEntitiesCallback,
-) -> None:
-    """Set up Baby Care Tracker sensors."""
-    coordinator: BabyCareCoordinator = hass.data[DOMAIN][config_entry.entry_id]
-    baby_name = config_entry.data.get(CONF_BABY_NAME, "Baby")
 
-    entities = [
-        BabyCurrentActivitySensor(coordinator, baby_name),
-        BabyLastFeedingTimeSensor(coordinator, baby_name),
-        BabyLastSleepDurationSensor(coordinator, baby_name),
-        BabyDailyFeedingsSensor(coordinator, baby_name),
-        BabyDailyDiapersSensor(coordinator, baby_name),
-        BabySleepStatusSensor(coordinator, baby_name),
-        BabyCurrentFeedingDurationSensor(coordinator, baby_name),
-        BabyCurrentSleepDurationSensor(coordinator, baby_name),
-        BabyLastDiaperTimeSensor(coordinator, baby_name),
-        BabyFeedingSideSensor(coordinator, baby_name),
-    ]
+def _current_activity(coordinator: BabyCareCoordinator) -> str:
+    """Return the current activity."""
+    if coordinator.is_currently_feeding:
+        return f"Feeding ({coordinator.current_feeding_info.get('side', '')})"
+    if coordinator.is_currently_sleeping:
+        return "Sleeping"
+    return "Awake"
 
-    async_add_entities(entities)
 
+def _current_activity_attributes(coordinator: BabyCareCoordinator) -> Dict[str, Any]:
+    """Return the details of the in-progress feeding and sleep."""
+    attrs = {}
 
-class BabyCareSensorBase(CoordinatorEntity, SensorEntity):
-    """Base class for baby care sensors."""
+    if coordinator.is_currently_feeding:
+        feeding_info = coordinator.current_feeding_info
+        attrs.update({
+            "feeding_side": feeding_info.get("side"),
+            "feeding_start_time": feeding_info.get("start_time"),
+            "feeding_duration_minutes": round(_session_seconds(coordinator, ACTIVITY_FEEDING) / 60, 1),
+        })
 
-    def __init__(self, coordinator: BabyCareCoordinator, baby_name: str, sensor_type: str) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator)
-        self._baby_name = baby_name
-        self._sensor_type = sensor_type
-        self._attr_unique_id = f"{DOMAIN}_{baby_name}_{sensor_type}".lower().replace(" ", "_")
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, baby_name)},
-            "name": f"Baby Care - {baby_name}",
-            "manufacturer": "Baby Care Tracker",
-            "model": "Baby Monitor",
-        }
-
-
-class BabyCurrentActivitySensor(BabyCareSensorBase):
-    """Sensor for current baby activity."""
-
-    def __init__(self, coordinator: BabyCareCoordinator, baby_name: str) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator, baby_name, "current_activity")
-        self._attr_name = f"{baby_name} Current Activity"
-        self._attr_icon = "mdi:baby"
+    if coordinator.is_currently_sleeping:
+        attrs.update({
+            "sleep_start_time": coordinator.current_sleep_info.get("start_time"),
+            "sleep_duration_hours": round(_session_seconds(coordinator, ACTIVITY_SLEEPING) / 3600, 1),
+        })
 
-    @property
-    def native_value(self) -> str:
-        """Return the current activity."""
-        if self.coordinator.is_currently_feeding:
-            feeding_info = self.coordinator.current_feeding_info
-            side = feeding_info.get("side", "")
-            return f"Feeding ({side})"
-        elif self.coordinator.is_currently_sleeping:
-            return "Sleeping"
-        else:
-            return "Awake"
+    return attrs
 
-    @property
-    def extra_state_attributes(self) -> Dict[str, Any]:
-        """Return additional state attributes."""
-        attrs = {}
-        
-        if self.coordinator.is_currently_feeding:
-            feeding_info = self.coordinator.current_feeding_info
-            start_time = datetime.fromisoformat(feeding_info["start_time"])
-            duration = (datetime.now() - start_time).total_seconds()
-            attrs.update({
-                "feeding_side": feeding_info.get("side"),
-                "feeding_start_time": feeding_info.get("start_time"),
-                "feeding_duration_minutes": round(duration / 60, 1),
-            })
-        
-        if self.coordinator.is_currently_sleeping:
-            sleep_info = self.coordinator.current_sleep_info
-            start_time = datetime.fromisoformat(sleep_info["start_time"])
-            duration = (datetime.now() - start_time).total_seconds()
-            attrs.update({
-                "sleep_start_time": sleep_info.get("start_time"),
-                "sleep_duration_hours": round(duration / 3600, 1),
-            })
-        
-        return attrs
-
-
-class BabyLastFeedingTimeSensor(BabyCareSensorBase):
-    """Sensor for last feeding time."""
-
-    def __init__(self, coordinator: BabyCareCoordinator, baby_name: str) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator, baby_name, "last_feeding_time")
-        self._attr_name = f"{baby_name} Last Feeding Time"
-        self._attr_device_class = SensorDeviceClass.TIMESTAMP
-        self._attr_icon = "mdi:baby-bottle"
 
-    @property
-    def native_value(self) -> Optional[datetime]:
-        """Return the last feeding time."""
-        last_feeding = self.coordinator.get_last_activity(ACTIVITY_FEEDING)
-        if last_feeding:
-            return datetime.fromisoformat(last_feeding["timestamp"])
-        return None
+def _last_feeding_attributes(coordinator: BabyCareCoordinator) -> Dict[str, Any]:
+    """Return the details of the last feeding."""
+    last_feeding = coordinator.get_last_activity(ACTIVITY_FEEDING)
+    if not last_feeding:
+        return {}
+    return {
+        "side": last_feeding.get("side"),
+        "duration_minutes": round(last_feeding.get("duration_seconds", 0) / 60, 1),
+        "notes": last_feeding.get("notes", ""),
+    }
 
-    @property
-    def extra_state_attributes(self) -> Dict[str, Any]:
-        """Return additional state attributes."""
-        last_feeding = self.coordinator.get_last_activity(ACTIVITY_FEEDING)
-        if not last_feeding:
-            return {}
-        
-        return {
-            "side": last_feeding.get("side"),
-            "duration_minutes": round(last_feeding.get("duration_seconds", 0) / 60, 1),
-            "notes": last_feeding.get("notes", ""),
-        }
-
-
-class BabyLastSleepDurationSensor(BabyCareSensorBase):
-    """Sensor for last sleep duration."""
-
-    def __init__(self, coordinator: BabyCareCoordinator, baby_name: str) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator, baby_name, "last_sleep_duration")
-        self._attr_name = f"{baby_name} Last Sleep Duration"
-        self._attr_native_unit_of_measurement = UnitOfTime.HOURS
-        self._attr_device_class = SensorDeviceClass.DURATION
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-        self._attr_icon = "mdi:sleep"
 
-    @property
-    def native_value(self) -> Optional[float]:
-        """Return the last sleep duration in hours."""
-        last_sleep = self.coordinator.get_last_activity(ACTIVITY_SLEEPING)
-        if last_sleep and "duration_seconds" in last_sleep:
-            return round(last_sleep["duration_seconds"] / 3600, 1)
-        return None
+def _last_sleep_duration(coordinator: BabyCareCoordinator) -> Optional[float]:
+    """Return the last sleep duration in hours."""
+    last_sleep = coordinator.get_last_activity(ACTIVITY_SLEEPING)
+    if last_sleep and "duration_seconds" in last_sleep:
+        return round(last_sleep["duration_seconds"] / 3600, 1)
+    return None
 
-    @property
-    def extra_state_attributes(self) -> Dict[str, Any]:
-        """Return additional state attributes."""
-        last_sleep = self.coordinator.get_last_activity(ACTIVITY_SLEEPING)
-        if not last_sleep:
-            return {}
-        
-        return {
-            "start_time": last_sleep.get("start_time"),
-            "end_time": last_sleep.get("end_time"),
-            "notes": last_sleep.get("notes", ""),
-        }
-
-
-class BabyDailyFeedingsSensor(BabyCareSensorBase):
-    """Sensor for daily feeding count."""
-
-    def __init__(self, coordinator: BabyCareCoordinator, baby_name: str) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator, baby_name, "daily_feedings")
-        self._attr_name = f"{baby_name} Daily Feedings"
-        self._attr_state_class = SensorStateClass.TOTAL_INCREASING
-        self._attr_icon = "mdi:counter"
 
-    @property
-    def native_value(self) -> int:
-        """Return the number of feedings today."""
-        daily_feedings = self.coordinator.get_daily_activities(ACTIVITY_FEEDING)
-        return len(daily_feedings)
+def _last_sleep_attributes(coordinator: BabyCareCoordinator) -> Dict[str, Any]:
+    """Return the details of the last sleep."""
+    last_sleep = coordinator.get_last_activity(ACTIVITY_SLEEPING)
+    if not last_sleep:
+        return {}
+    return {
+        "start_time": last_sleep.get("start_time"),
+        "end_time": last_sleep.get("end_time"),
+        "notes": last_sleep.get("notes", ""),
+    }
+
+
+def _daily_feeding_attributes(coordinator: BabyCareCoordinator) -> Dict[str, Any]:
+    """Return today's feeding time and count per side."""
+    daily_feedings = coordinator.get_daily_activities(ACTIVITY_FEEDING)
+    return {
+        "total_duration_minutes": round(
+            sum(feeding.get("duration_seconds", 0) for feeding in daily_feedings) / 60, 1
+        ),
+        "left_breast_count": sum(1 for f in daily_feedings if f.get("side") == "left"),
+        "right_breast_count": sum(1 for f in daily_feedings if f.get("side") == "right"),
+    }
+
+
+def _daily_diaper_attributes(coordinator: BabyCareCoordinator) -> Dict[str, Any]:
+    """Return today's diaper counts by type."""
+    daily_diapers = coordinator.get_daily_activities(ACTIVITY_DIAPER)
+    return {
+        "pee_count": sum(1 for d in daily_diapers if d.get("diaper_type") in ["pee", "both"]),
+        "poo_count": sum(1 for d in daily_diapers if d.get("diaper_type") in ["poo", "both"]),
+    }
+
+
+def _sleep_status_attributes(coordinator: BabyCareCoordinator) -> Dict[str, Any]:
+    """Return the details of the in-progress sleep."""
+    if not coordinator.is_currently_sleeping:
+        return {}
+    return {
+        "sleep_start_time": coordinator.current_sleep_info.get("start_time"),
+        "current_duration_hours": round(_session_seconds(coordinator, ACTIVITY_SLEEPING) / 3600, 1),
+    }
 
-    @property
-    def extra_state_attributes(self) -> Dict[str, Any]:
-        """Return additional state attributes."""
-        daily_feedings = self.coordinator.get_daily_activities(ACTIVITY_FEEDING)
-        
-        # Calculate total feeding time today
-        total_duration = sum(
-            feeding.get("duration_seconds", 0)
-            for feeding in daily_feedings
-            if "duration_seconds" in feeding
-        )
-        
-        # Count by side
-        left_count = sum(1 for f in daily_feedings if f.get("side") == "left")
-        right_count = sum(1 for f in daily_feedings if f.get("side") == "right")
-        
-        return {
-            "total_duration_minutes": round(total_duration / 60, 1),
-            "left_breast_count": left_count,
-            "right_breast_count": right_count,
-        }
-
-
-class BabyDailyDiapersSensor(BabyCareSensorBase):
-    """Sensor for daily diaper count."""
-
-    def __init__(self, coordinator: BabyCareCoordinator, baby_name: str) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator, baby_name, "daily_diapers")
-        self._attr_name = f"{baby_name} Daily Diapers"
-        self._attr_state_class = SensorStateClass.TOTAL_INCREASING
-        self._attr_icon = "mdi:baby-carriage"
 
-    @property
-    def native_value(self) -> int:
-        """Return the number of diaper changes today."""
-        daily_diapers = self.coordinator.get_daily_activities(ACTIVITY_DIAPER)
-        return len(daily_diapers)
+def _current_duration(activity_type: str, unit_seconds: int) -> Callable[[BabyCareCoordinator], Optional[float]]:
+    """Return a query for the running duration of a feeding or sleep."""
 
-    @property
-    def extra_state_attributes(self) -> Dict[str, Any]:
-        """Return additional state attributes."""
-        daily_diapers = self.coordinator.get_daily_activities(ACTIVITY_DIAPER)
-        
-        # Count by type
-        pee_count = sum(1 for d in daily_diapers if d.get("diaper_type") in ["pee", "both"])
-        poo_count = sum(1 for d in daily_diapers if d.get("diaper_type") in ["poo", "both"])
-        
-        return {
-            "pee_count": pee_count,
-            "poo_count": poo_count,
-        }
-
-
-class BabySleepStatusSensor(BabyCareSensorBase):
-    """Sensor for current sleep status."""
-
-    def __init__(self, coordinator: BabyCareCoordinator, baby_name: str) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator, baby_name, "sleep_status")
-        self._attr_name = f"{baby_name} Sleep Status"
-        self._attr_icon = "mdi:sleep"
+    def _value(coordinator: BabyCareCoordinator) -> Optional[float]:
+        seconds = _session_seconds(coordinator, activity_type)
+        if seconds is None:
+            return None
+        return round(seconds / unit_seconds, 1)
 
-    @property
-    def native_value(self) -> str:
-        """Return the current sleep status."""
-        return "Sleeping" if self.coordinator.is_currently_sleeping else "Awake"
+    return _value
 
-    @property
-    def extra_state_attributes(self) -> Dict[str, Any]:
-        """Return additional state attributes."""
-        if self.coordinator.is_currently_sleeping:
-            sleep_info = self.coordinator.current_sleep_info
-            start_time = datetime.fromisoformat(sleep_info["start_time"])
-            duration = (datetime.now() - start_time).total_seconds()
-            return {
-                "sleep_start_time": sleep_info.get("start_time"),
-                "current_duration_hours": round(duration / 3600, 1),
-            }
+
+def _last_diaper_attributes(coordinator: BabyCareCoordinator) -> Dict[str, Any]:
+    """Return the details of the last diaper change."""
+    last_diaper = coordinator.get_last_activity(ACTIVITY_DIAPER)
+    if not last_diaper:
         return {}
+    return {
+        "diaper_type": last_diaper.get("diaper_type"),
+        "notes": last_diaper.get("notes", ""),
+    }
 
 
-class BabyCurrentFeedingDurationSensor(BabyCareSensorBase):
-    """Sensor for current feeding duration."""
+def _last_bottle_attributes(coordinator: BabyCareCoordinator) -> Dict[str, Any]:
+    """Return the details of the last bottle feeding."""
+    last_bottle = coordinator.get_last_activity(ACTIVITY_BOTTLE_FEEDING)
+    if not last_bottle:
+        return {}
+    return {
+        "amount_ml": last_bottle.get("amount_ml"),
+        "notes": last_bottle.get("notes", ""),
+    }
 
-    def __init__(self, coordinator: BabyCareCoordinator, baby_name: str) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator, baby_name, "current_feeding_duration")
-        self._attr_name = f"{baby_name} Current Feeding Duration"
-        self._attr_native_unit_of_measurement = UnitOfTime.MINUTES
-        self._attr_device_class = SensorDeviceClass.DURATION
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-        self._attr_icon = "mdi:timer"
 
-    @property
-    def native_value(self) -> Optional[float]:
-        """Return the current feeding duration in minutes."""
-        if not self.coordinator.is_currently_feeding:
-            return None
-        
-        feeding_info = self.coordinator.current_feeding_info
-        start_time = datetime.fromisoformat(feeding_info["start_time"])
-        duration = (datetime.now() - start_time).total_seconds()
-        return round(duration / 60, 1)
+def _feeding_side(coordinator: BabyCareCoordinator) -> Optional[str]:
+    """Return the current or last feeding side."""
+    if coordinator.is_currently_feeding:
+        return coordinator.current_feeding_info.get("side")
+    last_feeding = coordinator.get_last_activity(ACTIVITY_FEEDING)
+    if last_feeding:
+        return last_feeding.get("side")
+    return None
 
 
-class BabyCurrentSleepDurationSensor(BabyCareSensorBase):
-    """Sensor for current sleep duration."""
+def _feeding_side_attributes(coordinator: BabyCareCoordinator) -> Dict[str, Any]:
+    """Return whether the feeding side is of a running or a past feeding."""
+    if coordinator.is_currently_feeding:
+        return {"status": "Currently feeding"}
+    last_feeding = coordinator.get_last_activity(ACTIVITY_FEEDING)
+    if last_feeding:
+        return {"status": "Last feeding", "timestamp": last_feeding.get("timestamp")}
+    return {"status": "No feeding recorded"}
 
-    def __init__(self, coordinator: BabyCareCoordinator, baby_name: str) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator, baby_name, "current_sleep_duration")
-        self._attr_name = f"{baby_name} Current Sleep Duration"
-        self._attr_native_unit_of_measurement = UnitOfTime.HOURS
-        self._attr_device_class = SensorDeviceClass.DURATION
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-        self._attr_icon = "mdi:timer"
 
-    @property
-    def native_value(self) -> Optional[float]:
-        """Return the current sleep duration in hours."""
-        if not self.coordinator.is_currently_sleeping:
+def _sleep_total(key: str) -> Callable[[BabyCareCoordinator], float]:
+    """Return a query for one of today's sleep totals."""
+    return lambda coordinator: coordinator.get_sleep_totals(datetime.now().date())[key]
+
+
+def _daily_sleep_attributes(coordinator: BabyCareCoordinator) -> Dict[str, Any]:
+    """Return today's sleep split into night and day."""
+    totals = coordinator.get_sleep_totals(datetime.now().date())
+    return {
+        "night_hours": totals["night_hours"],
+        "day_hours": totals["day_hours"],
+    }
+
+
+def _daily_total(key: str) -> Callable[[BabyCareCoordinator], Any]:
+    """Return a query for one of today's totals."""
+    return lambda coordinator: coordinator.get_daily_summary()[key]
+
+
+def _next_feeding(coordinator: BabyCareCoordinator) -> Optional[datetime]:
+    """Return the predicted next feeding time."""
+    prediction = coordinator.get_feeding_prediction()
+    if prediction is None:
+        return None
+    return prediction["next_feeding"].astimezone()
+
+
+def _next_feeding_attributes(coordinator: BabyCareCoordinator) -> Dict[str, Any]:
+    """Return the interval and duration behind the feeding prediction."""
+    prediction = coordinator.get_feeding_prediction()
+    if prediction is None:
+        return {"status": "Not enough feedings recorded"}
+    return {
+        "interval_minutes": prediction["interval_minutes"],
+        "expected_duration_minutes": prediction["expected_duration_minutes"],
+        "samples": prediction["samples"],
+    }
+
+
+def _growth_percentile(indicator: str) -> Callable[[BabyCareCoordinator], Optional[float]]:
+    """Return a query for the percentile of the latest measurement."""
+
+    def _value(coordinator: BabyCareCoordinator) -> Optional[float]:
+        result = coordinator.get_growth_percentile(indicator)
+        if result is None:
             return None
-        
-        sleep_info = self.coordinator.current_sleep_info
-        start_time = datetime.fromisoformat(sleep_info["start_time"])
-        duration = (datetime.now() - start_time).total_seconds()
-        return round(duration / 3600, 1)
+        return result["percentile"]
 
+    return _value
 
-class BabyLastDiaperTimeSensor(BabyCareSensorBase):
-    """Sensor for last diaper change time."""
 
-    def __init__(self, coordinator: BabyCareCoordinator, baby_name: str) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator, baby_name, "last_diaper_time")
-        self._attr_name = f"{baby_name} Last Diaper Time"
-        self._attr_device_class = SensorDeviceClass.TIMESTAMP
-        self._attr_icon = "mdi:baby-carriage"
+def _growth_percentile_attributes(indicator: str) -> Callable[[BabyCareCoordinator], Dict[str, Any]]:
+    """Return a query for the measurement behind a percentile."""
 
-    @property
-    def native_value(self) -> Optional[datetime]:
-        """Return the last diaper change time."""
-        last_diaper = self.coordinator.get_last_activity(ACTIVITY_DIAPER)
-        if last_diaper:
-            return datetime.fromisoformat(last_diaper["timestamp"])
+    def _attributes(coordinator: BabyCareCoordinator) -> Dict[str, Any]:
+        result = coordinator.get_growth_percentile(indicator)
+        if result is None:
+            return {"status": "Needs a measurement, birth date and sex"}
+        return {key: value for key, value in result.items() if key != "percentile"}
+
+    return _attributes
+
+
+def _save_duration(coordinator: BabyCareCoordinator) -> Optional[float]:
+    """Return the 95th percentile save duration in milliseconds."""
+    histogram = coordinator.metrics.get(METRIC_SAVE)
+    if histogram is None:
         return None
+    return round(histogram.percentile(95), 1)
+
+
+SENSORS: List[BabyCareSensorEntityDescription] = [
+    BabyCareSensorEntityDescription(
+        key="current_activity",
+        name="Current Activity",
+        icon="mdi:baby",
+        value_fn=_current_activity,
+        attr_fn=_current_activity_attributes,
+        significant_changes={"feeding_duration_minutes": 5, "sleep_duration_hours": 0.25},
+        live=True,
+    ),
+    BabyCareSensorEntityDescription(
+        key="last_feeding_time",
+        name="Last Feeding Time",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        icon="mdi:baby-bottle",
+        value_fn=lambda coordinator: coordinator.get_last_activity_time(ACTIVITY_FEEDING),
+        attr_fn=_last_feeding_attributes,
+    ),
+    BabyCareSensorEntityDescription(
+        key="last_sleep_duration",
+        name="Last Sleep Duration",
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:sleep",
+        value_fn=_last_sleep_duration,
+        attr_fn=_last_sleep_attributes,
+    ),
+    BabyCareSensorEntityDescription(
+        key="daily_feedings",
+        name="Daily Feedings",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        icon="mdi:counter",
+        value_fn=lambda coordinator: len(coordinator.get_daily_activities(ACTIVITY_FEEDING)),
+        attr_fn=_daily_feeding_attributes,
+    ),
+    BabyCareSensorEntityDescription(
+        key="daily_diapers",
+        name="Daily Diapers",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        icon="mdi:baby-carriage",
+        value_fn=lambda coordinator: len(coordinator.get_daily_activities(ACTIVITY_DIAPER)),
+        attr_fn=_daily_diaper_attributes,
+    ),
+    BabyCareSensorEntityDescription(
+        key="sleep_status",
+        name="Sleep Status",
+        icon="mdi:sleep",
+        value_fn=lambda coordinator: "Sleeping" if coordinator.is_currently_sleeping else "Awake",
+        attr_fn=_sleep_status_attributes,
+        significant_changes={"current_duration_hours": 0.25},
+        live=True,
+    ),
+    BabyCareSensorEntityDescription(
+        key="current_feeding_duration",
+        name="Current Feeding Duration",
+        native_unit_of_measurement=UnitOfTime.MINUTES,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:timer",
+        value_fn=_current_duration(ACTIVITY_FEEDING, 60),
+        significant_changes={SIGNIFICANT_STATE: 1},
+        live=True,
+    ),
+    BabyCareSensorEntityDescription(
+        key="current_sleep_duration",
+        name="Current Sleep Duration",
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:timer",
+        value_fn=_current_duration(ACTIVITY_SLEEPING, 3600),
+        significant_changes={SIGNIFICANT_STATE: 0.25},
+        live=True,
+    ),
+    BabyCareSensorEntityDescription(
+        key="last_diaper_time",
+        name="Last Diaper Time",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        icon="mdi:baby-carriage",
+        value_fn=lambda coordinator: coordinator.get_last_activity_time(ACTIVITY_DIAPER),
+        attr_fn=_last_diaper_attributes,
+    ),
+    BabyCareSensorEntityDescription(
+        key="feeding_side",
+        name="Feeding Side",
+        icon="mdi:baby-bottle",
+        value_fn=_feeding_side,
+        attr_fn=_feeding_side_attributes,
+    ),
+    BabyCareSensorEntityDescription(
+        key="daily_sleep",
+        name="Daily Sleep",
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        icon="mdi:sleep",
+        value_fn=_sleep_total("total_hours"),
+        attr_fn=_daily_sleep_attributes,
+        significant_changes={SIGNIFICANT_STATE: 0.25, "night_hours": 0.25, "day_hours": 0.25},
+    ),
+    BabyCareSensorEntityDescription(
+        key="next_feeding",
+        name="Next Feeding",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        icon="mdi:baby-bottle-outline",
+        value_fn=_next_feeding,
+        attr_fn=_next_feeding_attributes,
+    ),
+    BabyCareSensorEntityDescription(
+        key=f"{INDICATOR_WEIGHT}_percentile",
+        name="Weight Percentile",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:scale-bathroom",
+        value_fn=_growth_percentile(INDICATOR_WEIGHT),
+        attr_fn=_growth_percentile_attributes(INDICATOR_WEIGHT),
+    ),
+    BabyCareSensorEntityDescription(
+        key=f"{INDICATOR_LENGTH}_percentile",
+        name="Length Percentile",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:human-male-height",
+        value_fn=_growth_percentile(INDICATOR_LENGTH),
+        attr_fn=_growth_percentile_attributes(INDICATOR_LENGTH),
+    ),
+    # Further daily statistics, enabled on demand
+    BabyCareSensorEntityDescription(
+        key="daily_feeding_time",
+        name="Daily Feeding Time",
+        native_unit_of_measurement=UnitOfTime.MINUTES,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_registry_enabled_default=False,
+        icon="mdi:timer-outline",
+        value_fn=_daily_total("daily_feeding_minutes"),
+    ),
+    BabyCareSensorEntityDescription(
+        key="daily_bottle_feedings",
+        name="Daily Bottle Feedings",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_registry_enabled_default=False,
+        icon="mdi:counter",
+        value_fn=_daily_total("daily_bottle_feedings"),
+    ),
+    BabyCareSensorEntityDescription(
+        key="daily_bottle_volume",
+        name="Daily Bottle Volume",
+        native_unit_of_measurement=UnitOfVolume.MILLILITERS,
+        device_class=SensorDeviceClass.VOLUME,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_registry_enabled_default=False,
+        icon="mdi:baby-bottle-outline",
+        value_fn=_daily_total("daily_bottle_ml"),
+    ),
+    BabyCareSensorEntityDescription(
+        key="night_sleep",
+        name="Night Sleep",
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_registry_enabled_default=False,
+        icon="mdi:weather-night",
+        value_fn=_sleep_total("night_hours"),
+        significant_changes={SIGNIFICANT_STATE: 0.25},
+    ),
+    BabyCareSensorEntityDescription(
+        key="day_sleep",
+        name="Day Sleep",
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_registry_enabled_default=False,
+        icon="mdi:weather-sunny",
+        value_fn=_sleep_total("day_hours"),
+        significant_changes={SIGNIFICANT_STATE: 0.25},
+    ),
+    BabyCareSensorEntityDescription(
+        key="last_bottle_feeding_time",
+        name="Last Bottle Feeding Time",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        entity_registry_enabled_default=False,
+        icon="mdi:baby-bottle-outline",
+        value_fn=lambda coordinator: coordinator.get_last_activity_time(ACTIVITY_BOTTLE_FEEDING),
+        attr_fn=_last_bottle_attributes,
+    ),
+    *(
+        BabyCareSensorEntityDescription(
+            key=f"trend_{metric}_{window}",
+            name=f"{name} {window}",
+            native_unit_of_measurement=unit,
+            device_class=device_class,
+            state_class=SensorStateClass.MEASUREMENT,
+            icon=icon,
+            value_fn=lambda coordinator, metric=metric, window=window: round(
+                coordinator.trends.total(metric, window), 2
+            ),
+            attr_fn=lambda coordinator, metric=metric, window=window: {
+                "window": window,
+                "daily_average": round(coordinator.trends.daily_average(metric, window), 2),
+            },
+            statistics_key=STATISTICS_SENSOR_TRENDS,
+        )
+        for metric, (name, unit, device_class, icon) in TREND_SENSORS.items()
+        for window in TREND_WINDOWS
+    ),
+    BabyCareSensorEntityDescription(
+        key="history_size",
+        name="History Size",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:database",
+        value_fn=lambda coordinator: coordinator.history_size,
+        attr_fn=lambda coordinator: {"storage_backend": coordinator.storage_backend},
+    ),
+    BabyCareSensorEntityDescription(
+        key="save_duration",
+        name="Save Duration",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:timer-sand",
+        value_fn=_save_duration,
+        attr_fn=lambda coordinator: coordinator.metrics.as_dict(),
+    ),
+]
 
-    @property
-    def extra_state_attributes(self) -> Dict[str, Any]:
-        """Return additional state attributes."""
-        last_diaper = self.coordinator.get_last_activity(ACTIVITY_DIAPER)
-        if not last_diaper:
-            return {}
-        
-        return {
-            "diaper_type": last_diaper.get("diaper_type"),
-            "notes": last_diaper.get("notes", ""),
-        }
-
-
-class BabyFeedingSideSensor(BabyCareSensorBase):
-    """Sensor for current/last feeding side."""
-
-    def __init__(self, coordinator: BabyCareCoordinator, baby_name: str) -> None:
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up Baby Care Tracker sensors."""
+    coordinator: BabyCareCoordinator = hass.data[DOMAIN][config_entry.entry_id]
+    baby_name = config_entry.data.get(CONF_BABY_NAME, "Baby")
+
+    async_add_entities(
+        BabyCareSensor(coordinator, baby_name, description)
+        for description in async_enabled_descriptions(hass, Platform.SENSOR, baby_name, SENSORS)
+    )
+
+
+class BabyCareSensor(BabyCareEntity, SensorEntity):
+    """Baby care sensor whose state and attributes come from its description."""
+
+    entity_description: BabyCareSensorEntityDescription
+
+    # Live durations and performance metrics change on every update
+    _unrecorded_attributes = frozenset({
+        "feeding_duration_minutes",
+        "sleep_duration_hours",
+        "current_duration_hours",
+        "histograms",
+        "counters",
+    })
+
+    def __init__(
+        self,
+        coordinator: BabyCareCoordinator,
+        baby_name: str,
+        description: BabyCareSensorEntityDescription,
+    ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator, baby_name, "feeding_side")
-        self._attr_name = f"{baby_name} Feeding Side"
-        self._attr_icon = "mdi:baby-bottle"
+        super().__init__(coordinator, baby_name, description.key)
+        self.entity_description = description
+        self._attr_name = f"{baby_name} {description.name}"
+        self._significant_changes = description.significant_changes
 
     @property
-    def native_value(self) -> Optional[str]:
-        """Return the current or last feeding side."""
-        if self.coordinator.is_currently_feeding:
-            feeding_info = self.coordinator.current_feeding_info
-            return feeding_info.get("side")
-        
-        last_feeding = self.coordinator.get_last_activity(ACTIVITY_FEEDING)
-        if last_feeding:
-            return last_feeding.get("side")
-        
-        return None
+    def native_value(self) -> Any:
+        """Return the state from the description's query."""
+        if self.entity_description.live:
+            return self.entity_description.value_fn(self.coordinator)
+        return self.coordinator.memoize(
+            (Platform.SENSOR, self._sensor_type, "value"),
+            lambda: self.entity_description.value_fn(self.coordinator),
+        )
 
     @property
-    def extra_state_attributes(self) -> Dict[str, Any]:
-        """Return additional state attributes."""
-        if self.coordinator.is_currently_feeding:
-            return {"status": "Currently feeding"}
-        
-        last_feeding = self.coordinator.get_last_activity(ACTIVITY_FEEDING)
-        if last_feeding:
-            return {
-                "status": "Last feeding",
-                "timestamp": last_feeding.get("timestamp"),
-            }
-        
-        return {"status": "No feeding recorded"}
+    def extra_state_attributes(self) -> Optional[Dict[str, Any]]:
+        """Return the attributes from the description's query."""
+        attr_fn = self.entity_description.attr_fn
+        if attr_fn is None:
+            return None
+        if self.entity_description.live:
+            return attr_fn(self.coordinator)
+        return self.coordinator.memoize(
+            (Platform.SENSOR, self._sensor_type, "attributes"),
+            lambda: attr_fn(self.coordinator),
+        )
+
+    @property
+    def state_class(self) -> Optional[SensorStateClass]:
+        """Return the state class, unless the sensor is kept out of long-term statistics."""
+        statistics_key = self.entity_description.statistics_key or self._sensor_type
+        if statistics_key in self.coordinator.unrecorded_sensors:
+            return None
+        return super().state_class
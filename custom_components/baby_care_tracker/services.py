@@ -0,0 +1,382 @@
+"""Domain-level services for Baby Care Tracker."""
+from __future__ import annotations
+
+import logging
+import math
+import time
+from http import HTTPStatus
+from typing import Any, Dict, Optional, Tuple
+
+from aiohttp import web
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.components.http.data_validator import RequestDataValidator
+from homeassistant.components.http.decorators import require_admin
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
+
+from .const import (
+    DOMAIN,
+    ATTR_BABY,
+    ATTR_CONFIG_ENTRY_ID,
+    FEEDING_LEFT,
+    FEEDING_RIGHT,
+    DIAPER_PEE,
+    DIAPER_POO,
+    DIAPER_BOTH,
+    SERVICE_START_FEEDING,
+    SERVICE_STOP_FEEDING,
+    SERVICE_LOG_DIAPER,
+    SERVICE_LOG_SLEEP_START,
+    SERVICE_LOG_WAKE_UP,
+    SERVICE_LOG_BOTTLE_FEEDING,
+    SERVICE_LOG_GROWTH,
+    SERVICE_UPDATE_BUTTON_MAPPING,
+    SERVICE_REMOVE_BUTTON_MAPPING,
+    SERVICE_GET_SESSION_SUMMARY,
+    SERVICE_GET_GROWTH_CURVE,
+    SERVICE_EDIT_ACTIVITY,
+    SERVICE_DELETE_ACTIVITY,
+    SERVICE_UNDO_LAST,
+    SERVICE_SYNC_NOW,
+    SERVICE_BACKUP_HISTORY,
+    SERVICE_RESTORE_HISTORY,
+    SERVICE_GENERATE_REPORT,
+    SESSION_ACTIVITY_TYPES,
+    SYNC_API_PATH,
+)
+from .charts import CHART_SERIES, DEFAULT_CHART_POINTS, DEFAULT_CHART_RANGE, MAX_CHART_POINTS
+from .coordinator import BabyCareCoordinator
+from .growth import INDICATORS
+from .sync import CHANGE_SCHEMA, SYNC_BATCH_SIZE, SYNC_PROTOCOL
+
+_LOGGER = logging.getLogger(__name__)
+
+WS_TYPE_CHART_SERIES = f"{DOMAIN}/chart_series"
+
+TARGET_SCHEMA = {
+    vol.Exclusive(ATTR_BABY, "target"): cv.string,
+    vol.Exclusive(ATTR_CONFIG_ENTRY_ID, "target"): cv.string,
+}
+
+# Service name -> (coordinator handler, schema, response support)
+SERVICES: Dict[str, Tuple[str, vol.Schema, SupportsResponse]] = {
+    SERVICE_START_FEEDING: (
+        "_handle_start_feeding",
+        vol.Schema({
+            **TARGET_SCHEMA,
+            vol.Required("side"): vol.In([FEEDING_LEFT, FEEDING_RIGHT]),
+            vol.Optional("notes"): cv.string,
+        }),
+        SupportsResponse.OPTIONAL,
+    ),
+    SERVICE_STOP_FEEDING: (
+        "_handle_stop_feeding",
+        vol.Schema({
+            **TARGET_SCHEMA,
+            vol.Optional("notes"): cv.string,
+        }),
+        SupportsResponse.OPTIONAL,
+    ),
+    SERVICE_LOG_DIAPER: (
+        "_handle_log_diaper",
+        vol.Schema({
+            **TARGET_SCHEMA,
+            vol.Required("type"): vol.In([DIAPER_PEE, DIAPER_POO, DIAPER_BOTH]),
+            vol.Optional("notes"): cv.string,
+        }),
+        SupportsResponse.OPTIONAL,
+    ),
+    SERVICE_LOG_SLEEP_START: (
+        "_handle_log_sleep_start",
+        vol.Schema({
+            **TARGET_SCHEMA,
+            vol.Optional("notes"): cv.string,
+        }),
+        SupportsResponse.OPTIONAL,
+    ),
+    SERVICE_LOG_WAKE_UP: (
+        "_handle_log_wake_up",
+        vol.Schema({
+            **TARGET_SCHEMA,
+            vol.Optional("notes"): cv.string,
+        }),
+        SupportsResponse.OPTIONAL,
+    ),
+    SERVICE_LOG_BOTTLE_FEEDING: (
+        "_handle_log_bottle_feeding",
+        vol.Schema({
+            **TARGET_SCHEMA,
+            vol.Required("amount_ml"): vol.Coerce(int),
+            vol.Optional("notes"): cv.string,
+        }),
+        SupportsResponse.OPTIONAL,
+    ),
+    SERVICE_LOG_GROWTH: (
+        "_handle_log_growth",
+        vol.Schema({
+            **TARGET_SCHEMA,
+            vol.Optional("weight_kg"): vol.Coerce(float),
+            vol.Optional("height_cm"): vol.Coerce(float),
+            vol.Optional("notes"): cv.string,
+        }),
+        SupportsResponse.OPTIONAL,
+    ),
+    SERVICE_EDIT_ACTIVITY: (
+        "_handle_edit_activity",
+        vol.Schema({
+            **TARGET_SCHEMA,
+            vol.Required("activity_id"): cv.string,
+            vol.Optional("timestamp"): cv.datetime,
+            vol.Optional("start_time"): cv.datetime,
+            vol.Optional("end_time"): cv.datetime,
+            vol.Optional("side"): vol.In([FEEDING_LEFT, FEEDING_RIGHT]),
+            vol.Optional("diaper_type"): vol.In([DIAPER_PEE, DIAPER_POO, DIAPER_BOTH]),
+            vol.Optional("amount_ml"): vol.Coerce(int),
+            vol.Optional("weight_kg"): vol.Coerce(float),
+            vol.Optional("height_cm"): vol.Coerce(float),
+            vol.Optional("notes"): cv.string,
+        }),
+        SupportsResponse.OPTIONAL,
+    ),
+    SERVICE_DELETE_ACTIVITY: (
+        "_handle_delete_activity",
+        vol.Schema({
+            **TARGET_SCHEMA,
+            vol.Required("activity_id"): cv.string,
+        }),
+        SupportsResponse.OPTIONAL,
+    ),
+    SERVICE_UNDO_LAST: (
+        "_handle_undo_last",
+        vol.Schema({
+            **TARGET_SCHEMA,
+        }),
+        SupportsResponse.OPTIONAL,
+    ),
+    SERVICE_SYNC_NOW: (
+        "_handle_sync_now",
+        vol.Schema({
+            **TARGET_SCHEMA,
+        }),
+        SupportsResponse.OPTIONAL,
+    ),
+    SERVICE_BACKUP_HISTORY: (
+        "_handle_backup_history",
+        vol.Schema({
+            **TARGET_SCHEMA,
+            vol.Optional("full", default=False): cv.boolean,
+        }),
+        SupportsResponse.OPTIONAL,
+    ),
+    SERVICE_RESTORE_HISTORY: (
+        "_handle_restore_history",
+        vol.Schema({
+            **TARGET_SCHEMA,
+            vol.Optional("at"): cv.datetime,
+        }),
+        SupportsResponse.OPTIONAL,
+    ),
+    SERVICE_GENERATE_REPORT: (
+        "_handle_generate_report",
+        vol.Schema({
+            **TARGET_SCHEMA,
+            vol.Optional("start"): cv.date,
+            vol.Optional("end"): cv.date,
+        }),
+        SupportsResponse.OPTIONAL,
+    ),
+    SERVICE_UPDATE_BUTTON_MAPPING: (
+        "_handle_update_button_mapping",
+        vol.Schema({
+            **TARGET_SCHEMA,
+            vol.Required("entity_id"): cv.string,
+            vol.Optional("trigger_action"): cv.string,
+            vol.Required("baby_care_action"): cv.string,
+        }),
+        SupportsResponse.NONE,
+    ),
+    SERVICE_REMOVE_BUTTON_MAPPING: (
+        "_handle_remove_button_mapping",
+        vol.Schema({
+            **TARGET_SCHEMA,
+            vol.Required("entity_id"): cv.string,
+            vol.Optional("specific_action"): cv.string,
+        }),
+        SupportsResponse.NONE,
+    ),
+    SERVICE_GET_SESSION_SUMMARY: (
+        "_handle_get_session_summary",
+        vol.Schema({
+            **TARGET_SCHEMA,
+            vol.Required("activity_type"): vol.In(SESSION_ACTIVITY_TYPES),
+            vol.Required("start"): cv.datetime,
+            vol.Required("end"): cv.datetime,
+        }),
+        SupportsResponse.ONLY,
+    ),
+    SERVICE_GET_GROWTH_CURVE: (
+        "_handle_get_growth_curve",
+        vol.Schema({
+            **TARGET_SCHEMA,
+            vol.Optional("indicator"): vol.In(INDICATORS),
+            vol.Optional("percentiles"): vol.All(
+                cv.ensure_list, [vol.All(vol.Coerce(float), vol.Range(min=0.1, max=99.9))]
+            ),
+            vol.Optional("step_days", default=7): vol.All(vol.Coerce(int), vol.Range(min=1, max=92)),
+        }),
+        SupportsResponse.ONLY,
+    ),
+}
+
+
+def async_get_coordinator(hass: HomeAssistant, data: Dict[str, Any]) -> BabyCareCoordinator:
+    """Resolve the coordinator targeted by a service call."""
+    coordinators: Dict[str, BabyCareCoordinator] = {
+        entry_id: coordinator
+        for entry_id, coordinator in hass.data.get(DOMAIN, {}).items()
+        if isinstance(coordinator, BabyCareCoordinator)
+    }
+
+    if not coordinators:
+        raise HomeAssistantError("No Baby Care Tracker is set up")
+
+    if entry_id := data.get(ATTR_CONFIG_ENTRY_ID):
+        if entry_id not in coordinators:
+            raise HomeAssistantError(f"Unknown Baby Care Tracker config entry: {entry_id}")
+        return coordinators[entry_id]
+
+    if baby := data.get(ATTR_BABY):
+        for coordinator in coordinators.values():
+            if coordinator.baby_name.casefold() == baby.casefold():
+                return coordinator
+        raise HomeAssistantError(f"No Baby Care Tracker is set up for {baby}")
+
+    if len(coordinators) > 1:
+        raise HomeAssistantError(
+            f"Multiple babies are tracked, specify '{ATTR_BABY}' or '{ATTR_CONFIG_ENTRY_ID}'"
+        )
+
+    return next(iter(coordinators.values()))
+
+
+async def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the domain services once, routing each call to its baby."""
+
+    async def _async_handle_service(call: ServiceCall) -> Optional[ServiceResponse]:
+        """Dispatch a service call to the targeted coordinator."""
+        coordinator = async_get_coordinator(hass, call.data)
+        handler_name, _, supports_response = SERVICES[call.service]
+        response = await getattr(coordinator, handler_name)(call)
+        if supports_response is SupportsResponse.NONE:
+            return None
+        return response
+
+    for service, (_, schema, supports_response) in SERVICES.items():
+        if hass.services.has_service(DOMAIN, service):
+            continue
+        hass.services.async_register(
+            DOMAIN,
+            service,
+            _async_handle_service,
+            schema=schema,
+            supports_response=supports_response,
+        )
+
+    websocket_api.async_register_command(hass, websocket_chart_series)
+    hass.http.register_view(PeerSyncView())
+
+
+@websocket_api.websocket_command({
+    vol.Required("type"): WS_TYPE_CHART_SERIES,
+    **TARGET_SCHEMA,
+    vol.Optional("series", default=CHART_SERIES): vol.All(cv.ensure_list, [vol.In(CHART_SERIES)]),
+    vol.Optional("start"): cv.datetime,
+    vol.Optional("end"): cv.datetime,
+    vol.Optional("points", default=DEFAULT_CHART_POINTS): vol.All(
+        vol.Coerce(int), vol.Range(min=10, max=MAX_CHART_POINTS)
+    ),
+})
+@callback
+def websocket_chart_series(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: Dict[str, Any]
+) -> None:
+    """Send downsampled chart series of a baby's history."""
+    try:
+        coordinator = async_get_coordinator(hass, msg)
+    except HomeAssistantError as err:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, str(err))
+        return
+
+    # An open range ends at the next full minute, so polling dashboards share cached results
+    end = msg["end"].timestamp() if "end" in msg else math.ceil(time.time() / 60) * 60
+    if "start" in msg:
+        start = msg["start"].timestamp()
+    else:
+        start = end - DEFAULT_CHART_RANGE.total_seconds()
+    if end <= start:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_INVALID_FORMAT, "The end of the range must be after its start"
+        )
+        return
+
+    connection.send_result(msg["id"], {
+        "baby": coordinator.baby_name,
+        "start": int(start * 1000),
+        "end": int(end * 1000),
+        "series": {
+            series: coordinator.get_chart_series(series, start, end, msg["points"])
+            for series in msg["series"]
+        },
+    })
+
+
+class PeerSyncView(HomeAssistantView):
+    """Exchange history changes with a peer Home Assistant instance.
+
+    Peers authenticate with a long-lived access token of an admin user.
+    """
+
+    url = SYNC_API_PATH
+    name = "api:baby_care_tracker:sync"
+
+    @require_admin
+    @RequestDataValidator(vol.Schema({
+        **TARGET_SCHEMA,
+        vol.Required("protocol"): int,
+        vol.Required("instance_id"): str,
+        vol.Required("since"): vol.All(int, vol.Range(min=0)),
+        vol.Required("cursor"): vol.All(int, vol.Range(min=0)),
+        vol.Required("changes"): vol.All([CHANGE_SCHEMA], vol.Length(max=SYNC_BATCH_SIZE)),
+    }))
+    async def post(self, request: web.Request, data: Dict[str, Any]) -> web.Response:
+        """Apply the peer's changes and answer with ours."""
+        if data["protocol"] != SYNC_PROTOCOL:
+            return self.json_message(
+                f"Unsupported sync protocol {data['protocol']}, expected {SYNC_PROTOCOL}",
+                HTTPStatus.BAD_REQUEST,
+            )
+
+        try:
+            coordinator = async_get_coordinator(request.app["hass"], data)
+        except HomeAssistantError as err:
+            return self.json_message(str(err), HTTPStatus.NOT_FOUND)
+
+        if data["instance_id"] == coordinator.sync.instance_id:
+            return self.json_message(
+                f"A history of {coordinator.baby_name} cannot sync with itself", HTTPStatus.BAD_REQUEST
+            )
+
+        try:
+            return self.json(await coordinator.async_sync_exchange(data))
+        except HomeAssistantError as err:
+            return self.json_message(str(err), HTTPStatus.SERVICE_UNAVAILABLE)
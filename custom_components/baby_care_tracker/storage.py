@@ -0,0 +1,389 @@
+"""Storage backends for Baby Care Tracker."""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import ulid as ulid_util
+
+from .const import (
+    DOMAIN,
+    SQLITE_FILE,
+    STORAGE_BACKEND_JSON,
+    STORAGE_BACKEND_SQLITE,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+# Keys of the data stored next to the activities
+STATE_KEYS = ("current_feeding", "current_sleep", "sync")
+
+
+def empty_data() -> Dict[str, Any]:
+    """Return the data layout of a tracker without history."""
+    return {
+        "activities": [],
+        "current_feeding": None,
+        "current_sleep": None,
+        "sync": None,
+    }
+
+
+def new_activity_id(activity: Dict[str, Any]) -> str:
+    """Return a new time-sortable ID for an activity."""
+    timestamp = activity.get("timestamp")
+    if timestamp:
+        return ulid_util.ulid(datetime.fromisoformat(timestamp).timestamp())
+    return ulid_util.ulid()
+
+
+def assign_activity_ids(activities: List[Dict[str, Any]]) -> int:
+    """Give activities logged before IDs existed an ID, returning how many changed."""
+    assigned = 0
+    for activity in activities:
+        if "id" not in activity:
+            activity["id"] = new_activity_id(activity)
+            assigned += 1
+    return assigned
+
+
+class ActivityStorage:
+    """Base class for activity storage backends.
+
+    The coordinator keeps the loaded activities in memory; backends decide how
+    changes are persisted. Backends with indexed_queries answer the sensor
+    queries themselves, the others leave them to the coordinator's indexes.
+    """
+
+    backend: str = ""
+    indexed_queries: bool = False
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the storage backend."""
+        self.hass = hass
+        self.entry_id = entry_id
+
+    async def async_load(self) -> Dict[str, Any]:
+        """Load all stored data."""
+        raise NotImplementedError
+
+    async def async_save(
+        self,
+        data: Dict[str, Any],
+        new_activities: List[Dict[str, Any]],
+        updated_activities: Optional[List[Dict[str, Any]]] = None,
+        deleted_ids: Optional[List[str]] = None,
+    ) -> None:
+        """Persist data in one write.
+
+        new_activities were appended, updated_activities edited and deleted_ids
+        removed since the last save.
+        """
+        raise NotImplementedError
+
+    async def async_import(self, data: Dict[str, Any]) -> None:
+        """Replace the stored data, used when migrating between backends."""
+        raise NotImplementedError
+
+    async def async_query_range(
+        self, activity_type: str, start: datetime, end: datetime
+    ) -> List[Dict[str, Any]]:
+        """Return activities of a type with start <= timestamp < end."""
+        raise NotImplementedError
+
+    async def async_query_last(self, activity_type: str) -> Optional[Dict[str, Any]]:
+        """Return the most recent activity of a type."""
+        raise NotImplementedError
+
+    async def async_get_size(self) -> Optional[int]:
+        """Return the size of the stored data in bytes."""
+        return await self.hass.async_add_executor_job(self._get_size)
+
+    def _get_size(self) -> Optional[int]:
+        """Return the size of the backing file, if it exists."""
+        path = self.path
+        if path is None or not os.path.exists(path):
+            return None
+        return os.path.getsize(path)
+
+    @property
+    def path(self) -> Optional[str]:
+        """Return the path of the backing file."""
+        return None
+
+    async def async_close(self) -> None:
+        """Release any resources held by the backend."""
+
+
+class JsonActivityStorage(ActivityStorage):
+    """Store all data in a single Home Assistant JSON Store file."""
+
+    backend = STORAGE_BACKEND_JSON
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the JSON backend."""
+        super().__init__(hass, entry_id)
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}_{entry_id}")
+
+    @property
+    def path(self) -> Optional[str]:
+        """Return the path of the JSON store file."""
+        return self._store.path
+
+    async def async_load(self) -> Dict[str, Any]:
+        """Load data from the JSON store."""
+        stored_data = await self._store.async_load()
+        if stored_data is None:
+            stored_data = empty_data()
+        
+        assigned = assign_activity_ids(stored_data.get("activities", []))
+        if assigned:
+            _LOGGER.info(f"Assigned IDs to {assigned} stored activities")
+            await self._store.async_save(stored_data)
+        return stored_data
+
+    async def async_save(
+        self,
+        data: Dict[str, Any],
+        new_activities: List[Dict[str, Any]],
+        updated_activities: Optional[List[Dict[str, Any]]] = None,
+        deleted_ids: Optional[List[str]] = None,
+    ) -> None:
+        """Rewrite the whole JSON store."""
+        await self._store.async_save(data)
+
+    async def async_import(self, data: Dict[str, Any]) -> None:
+        """Replace the JSON store contents."""
+        await self.async_save(data, [])
+
+
+class SqliteActivityStorage(ActivityStorage):
+    """Store activities in a local SQLite database with indexed queries.
+
+    All database access runs in the executor. A single connection is shared
+    between executor threads and guarded by a lock.
+    """
+
+    backend = STORAGE_BACKEND_SQLITE
+    indexed_queries = True
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the SQLite backend."""
+        super().__init__(hass, entry_id)
+        self._path = hass.config.path(SQLITE_FILE.format(entry_id=entry_id))
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> Optional[str]:
+        """Return the path of the database file."""
+        return self._path
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database and create the schema if needed."""
+        if self._conn is None:
+            conn = sqlite3.connect(self._path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS activities ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "type TEXT NOT NULL, "
+                "timestamp TEXT NOT NULL, "
+                "data TEXT NOT NULL, "
+                "activity_id TEXT)"
+            )
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(activities)")}
+            if "activity_id" not in columns:
+                conn.execute("ALTER TABLE activities ADD COLUMN activity_id TEXT")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_activities_type_timestamp "
+                "ON activities (type, timestamp)"
+            )
+            conn.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_activities_activity_id "
+                "ON activities (activity_id)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS state ("
+                "key TEXT PRIMARY KEY, "
+                "value TEXT)"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _activity_row(activity: Dict[str, Any]) -> tuple:
+        """Convert an activity into an insert row."""
+        return (
+            activity.get("type"),
+            activity["timestamp"],
+            json.dumps(activity),
+            activity.get("id"),
+        )
+
+    def _load(self) -> Dict[str, Any]:
+        """Read all activities and the current session state."""
+        with self._lock:
+            conn = self._connect()
+            data = empty_data()
+            missing_ids = []
+            for row_id, activity_id, row_data in conn.execute(
+                "SELECT id, activity_id, data FROM activities ORDER BY timestamp, id"
+            ):
+                activity = json.loads(row_data)
+                if activity_id is None:
+                    activity["id"] = activity.get("id") or new_activity_id(activity)
+                    missing_ids.append((activity["id"], json.dumps(activity), row_id))
+                data["activities"].append(activity)
+            
+            if missing_ids:
+                _LOGGER.info(f"Assigned IDs to {len(missing_ids)} stored activities")
+                with conn:
+                    conn.executemany(
+                        "UPDATE activities SET activity_id = ?, data = ? WHERE id = ?",
+                        missing_ids,
+                    )
+            for key, value in conn.execute("SELECT key, value FROM state"):
+                data[key] = json.loads(value) if value is not None else None
+            return data
+
+    def _write_state(self, conn: sqlite3.Connection, data: Dict[str, Any]) -> None:
+        """Upsert the current session and sync state."""
+        conn.executemany(
+            "INSERT INTO state (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            [
+                (key, json.dumps(data.get(key)))
+                for key in STATE_KEYS
+            ],
+        )
+
+    def _save(
+        self,
+        data: Dict[str, Any],
+        new_rows: List[tuple],
+        updated_rows: List[tuple],
+        deleted_ids: List[str],
+    ) -> None:
+        """Apply inserts, updates and deletes and the session state in one transaction."""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                if deleted_ids:
+                    conn.executemany(
+                        "DELETE FROM activities WHERE activity_id = ?",
+                        [(activity_id,) for activity_id in deleted_ids],
+                    )
+                if updated_rows:
+                    conn.executemany(
+                        "UPDATE activities SET type = ?, timestamp = ?, data = ? "
+                        "WHERE activity_id = ?",
+                        updated_rows,
+                    )
+                if new_rows:
+                    conn.executemany(
+                        "INSERT INTO activities (type, timestamp, data, activity_id) "
+                        "VALUES (?, ?, ?, ?)",
+                        new_rows,
+                    )
+                self._write_state(conn, data)
+
+    def _import(self, data: Dict[str, Any]) -> None:
+        """Replace all rows with the given data."""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM activities")
+                conn.executemany(
+                    "INSERT INTO activities (type, timestamp, data, activity_id) "
+                    "VALUES (?, ?, ?, ?)",
+                    [self._activity_row(activity) for activity in data.get("activities", [])],
+                )
+                self._write_state(conn, data)
+
+    def _query_range(self, activity_type: str, start: str, end: str) -> List[Dict[str, Any]]:
+        """Run an indexed range query."""
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT data FROM activities "
+                "WHERE type = ? AND timestamp >= ? AND timestamp < ? "
+                "ORDER BY timestamp, id",
+                (activity_type, start, end),
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def _query_last(self, activity_type: str) -> Optional[Dict[str, Any]]:
+        """Run an indexed latest-activity query."""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT data FROM activities WHERE type = ? "
+                "ORDER BY timestamp DESC, id DESC LIMIT 1",
+                (activity_type,),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _close(self) -> None:
+        """Close the connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    async def async_load(self) -> Dict[str, Any]:
+        """Load data from the database."""
+        return await self.hass.async_add_executor_job(self._load)
+
+    async def async_save(
+        self,
+        data: Dict[str, Any],
+        new_activities: List[Dict[str, Any]],
+        updated_activities: Optional[List[Dict[str, Any]]] = None,
+        deleted_ids: Optional[List[str]] = None,
+    ) -> None:
+        """Write only the changed rows instead of rewriting everything."""
+        # Serialize on the event loop so the executor never reads live records
+        await self.hass.async_add_executor_job(
+            self._save,
+            data,
+            [self._activity_row(activity) for activity in new_activities],
+            [self._activity_row(activity) for activity in updated_activities or []],
+            list(deleted_ids or []),
+        )
+
+    async def async_import(self, data: Dict[str, Any]) -> None:
+        """Replace the database contents."""
+        await self.hass.async_add_executor_job(self._import, data)
+
+    async def async_query_range(
+        self, activity_type: str, start: datetime, end: datetime
+    ) -> List[Dict[str, Any]]:
+        """Query a time range using the (type, timestamp) index."""
+        return await self.hass.async_add_executor_job(
+            self._query_range, activity_type, start.isoformat(), end.isoformat()
+        )
+
+    async def async_query_last(self, activity_type: str) -> Optional[Dict[str, Any]]:
+        """Query the latest activity using the (type, timestamp) index."""
+        return await self.hass.async_add_executor_job(self._query_last, activity_type)
+
+    async def async_close(self) -> None:
+        """Close the database connection."""
+        await self.hass.async_add_executor_job(self._close)
+
+
+def create_storage(hass: HomeAssistant, entry_id: str, backend: str) -> ActivityStorage:
+    """Create the storage backend selected in the options."""
+    if backend == STORAGE_BACKEND_SQLITE:
+        return SqliteActivityStorage(hass, entry_id)
+    return JsonActivityStorage(hass, entry_id)
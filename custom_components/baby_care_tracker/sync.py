@@ -0,0 +1,403 @@
+"""Delta sync of a baby's history with another Home Assistant instance."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+import aiohttp
+import voluptuous as vol
+
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util import dt as dt_util, ulid as ulid_util
+
+from .const import CONF_SYNC_BABY, CONF_SYNC_TOKEN, CONF_SYNC_URL, DOMAIN, SYNC_API_PATH
+
+if TYPE_CHECKING:
+    from .coordinator import BabyCareCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+SYNC_PROTOCOL = 1
+
+# Changes sent in one request, and requests per sync
+SYNC_BATCH_SIZE = 500
+SYNC_MAX_ROUNDS = 20
+# How often the peer is asked for its changes, and how long a local change waits to be pushed
+SYNC_INTERVAL = timedelta(minutes=1)
+SYNC_COOLDOWN = 10
+SYNC_TIMEOUT = 30
+
+# Sync fields of activities and tombstones; the sequence number is local and never sent
+FIELD_SEQ = "seq"
+FIELD_MODIFIED_AT = "modified_at"
+FIELD_MODIFIED_BY = "modified_by"
+FIELD_DELETED = "deleted"
+SYNC_FIELDS = (FIELD_SEQ, FIELD_MODIFIED_AT, FIELD_MODIFIED_BY)
+
+CHANGE_SCHEMA = vol.Schema(
+    {
+        vol.Required("id"): str,
+        vol.Optional(FIELD_MODIFIED_AT): str,
+        vol.Optional(FIELD_MODIFIED_BY): str,
+        vol.Optional(FIELD_DELETED): bool,
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
+
+def local_time(value: Any) -> str:
+    """Validate a time and return it as the naive local ISO string the history stores."""
+    return dt_util.as_local(cv.datetime(value)).replace(tzinfo=None).isoformat()
+
+
+# Times of a synced activity, checked like the edit_activity service checks them
+ACTIVITY_TIMES_SCHEMA = vol.Schema(
+    {
+        vol.Required("timestamp"): local_time,
+        vol.Optional("start_time"): vol.Any(None, local_time),
+        vol.Optional("end_time"): vol.Any(None, local_time),
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
+RESPONSE_SCHEMA = vol.Schema(
+    {
+        vol.Required("protocol"): SYNC_PROTOCOL,
+        vol.Required("instance_id"): str,
+        vol.Required("ack"): vol.All(int, vol.Range(min=0)),
+        vol.Required("cursor"): vol.All(int, vol.Range(min=0)),
+        vol.Required("changes"): [CHANGE_SCHEMA],
+        vol.Required("more"): bool,
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
+
+def version(entry: Dict[str, Any]) -> Tuple[str, str]:
+    """Return the version of an activity or tombstone.
+
+    Versions are (UTC modification time, instance ID), so every instance
+    picks the same winner; activities logged before sync have the lowest.
+    """
+    return (entry.get(FIELD_MODIFIED_AT, ""), entry.get(FIELD_MODIFIED_BY, ""))
+
+
+def content(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Return an activity without its sync fields."""
+    return {key: value for key, value in entry.items() if key not in SYNC_FIELDS}
+
+
+def peer_options(options: Dict[str, Any]) -> Optional[Tuple[str, str, Optional[str]]]:
+    """Return the configured peer URL, access token and remote baby, if sync is set up."""
+    if not options.get(CONF_SYNC_URL):
+        return None
+    return (options[CONF_SYNC_URL], options.get(CONF_SYNC_TOKEN, ""), options.get(CONF_SYNC_BABY))
+
+
+class SyncLog:
+    """Change log of a baby's history, numbered by a per-instance sequence.
+
+    Every change of an activity, local or synced, gets the next sequence
+    number; local changes also get a new version. Deleted activities leave
+    a tombstone so the deletion reaches peers. The log keeps one entry per
+    activity ID, moved to the end when it changes, so the changes after a
+    peer's cursor are found by walking back from the end.
+    """
+
+    def __init__(
+        self,
+        instance_id: Optional[str] = None,
+        sequence: int = 0,
+        tombstones: Optional[Dict[str, Dict[str, Any]]] = None,
+        peers: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> None:
+        """Initialize the log."""
+        self.instance_id = instance_id or ulid_util.ulid()
+        self.sequence = sequence
+        self.tombstones: Dict[str, Dict[str, Any]] = tombstones or {}
+        # Peer -> {"instance_id", "pushed": our acknowledged cursor, "pulled": their applied cursor}
+        self.peers: Dict[str, Dict[str, Any]] = peers or {}
+        self._log: OrderedDict[str, int] = OrderedDict()
+
+    @classmethod
+    def from_data(
+        cls, stored: Optional[Dict[str, Any]], activities: List[Dict[str, Any]]
+    ) -> Tuple[SyncLog, List[Dict[str, Any]]]:
+        """Restore the log, numbering activities stored before sync existed.
+
+        Returns the log and the activities that were numbered, which need saving.
+        """
+        stored = stored or {}
+        log = cls(
+            stored.get("instance_id"),
+            stored.get("sequence", 0),
+            dict(stored.get("tombstones", {})),
+            dict(stored.get("peers", {})),
+        )
+        numbered = []
+        for activity in activities:
+            if FIELD_SEQ not in activity:
+                log.sequence += 1
+                activity[FIELD_SEQ] = log.sequence
+                numbered.append(activity)
+
+        entries = [(activity[FIELD_SEQ], activity["id"]) for activity in activities]
+        entries.extend((tombstone[FIELD_SEQ], activity_id) for activity_id, tombstone in log.tombstones.items())
+        for seq, activity_id in sorted(entries):
+            log._log[activity_id] = seq
+        return log, numbered
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the state stored with the history."""
+        return {
+            "instance_id": self.instance_id,
+            "sequence": self.sequence,
+            "tombstones": self.tombstones,
+            "peers": self.peers,
+        }
+
+    def _next(self, activity_id: str) -> int:
+        """Move an activity to the end of the log with the next sequence number."""
+        self.sequence += 1
+        self._log[activity_id] = self.sequence
+        self._log.move_to_end(activity_id)
+        return self.sequence
+
+    def stamp(self, activity: Dict[str, Any]) -> None:
+        """Record a local change of an activity with a new version."""
+        activity[FIELD_MODIFIED_AT] = dt_util.utcnow().isoformat()
+        activity[FIELD_MODIFIED_BY] = self.instance_id
+        self.track(activity)
+
+    def track(self, activity: Dict[str, Any]) -> None:
+        """Record a change of an activity, keeping its version."""
+        self.tombstones.pop(activity["id"], None)
+        activity[FIELD_SEQ] = self._next(activity["id"])
+
+    def is_local(self, activity: Dict[str, Any]) -> bool:
+        """Return whether an activity was last changed here, or before sync existed."""
+        return activity.get(FIELD_MODIFIED_BY, "") in ("", self.instance_id)
+
+    def delete(self, activity_id: str, tombstone: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Record a deletion, with a new version or the version of a synced tombstone."""
+        if tombstone is None:
+            tombstone = {
+                FIELD_MODIFIED_AT: dt_util.utcnow().isoformat(),
+                FIELD_MODIFIED_BY: self.instance_id,
+            }
+        entry = {
+            "id": activity_id,
+            FIELD_DELETED: True,
+            FIELD_MODIFIED_AT: tombstone.get(FIELD_MODIFIED_AT, ""),
+            FIELD_MODIFIED_BY: tombstone.get(FIELD_MODIFIED_BY, ""),
+        }
+        entry[FIELD_SEQ] = self._next(activity_id)
+        self.tombstones[activity_id] = entry
+        return entry
+
+    def changes_since(
+        self,
+        cursor: int,
+        get_activity: Callable[[str], Optional[Dict[str, Any]]],
+        skip: Optional[Dict[str, int]] = None,
+        limit: Optional[int] = SYNC_BATCH_SIZE,
+    ) -> Tuple[List[Dict[str, Any]], int, bool]:
+        """Return the changes after a cursor, the cursor after them and whether more follow.
+
+        Changes in skip, activity ID -> sequence number, came from the peer
+        asking; they are passed over but still move the cursor. A limit of
+        None returns all changes.
+        """
+        newer = []
+        for activity_id, seq in reversed(self._log.items()):
+            if seq <= cursor:
+                break
+            newer.append((seq, activity_id))
+        newer.reverse()
+
+        changes = []
+        for seq, activity_id in newer:
+            if limit is not None and len(changes) >= limit:
+                return changes, cursor, True
+            cursor = seq
+            if skip and skip.get(activity_id) == seq:
+                continue
+            entry = self.tombstones.get(activity_id) or get_activity(activity_id)
+            if entry is None:
+                continue
+            changes.append({key: value for key, value in entry.items() if key != FIELD_SEQ})
+        return changes, cursor, False
+
+
+class PeerSync:
+    """Exchange history changes with the same baby on another Home Assistant.
+
+    Each exchange is one authenticated POST to the peer's sync endpoint
+    carrying our changes after the cursor the peer acknowledged last and
+    asking for theirs after the cursor we applied last. Changes are pushed
+    shortly after they are made and pulled every minute.
+    """
+
+    def __init__(self, coordinator: BabyCareCoordinator, url: str, token: str, baby: Optional[str]) -> None:
+        """Initialize the peer."""
+        self.coordinator = coordinator
+        self.hass = coordinator.hass
+        self.url = url.rstrip("/")
+        self.baby = baby or coordinator.baby_name
+        self.key = f"{self.url}/{self.baby}"
+        self._token = token
+        self._lock = asyncio.Lock()
+        # Changes applied from the peer, activity ID -> our sequence number, not sent back
+        self._received: Dict[str, int] = {}
+        self._synced_sequence: Optional[int] = None
+        self._unsubs: List[CALLBACK_TYPE] = []
+        self._debouncer = Debouncer(
+            self.hass,
+            _LOGGER,
+            cooldown=SYNC_COOLDOWN,
+            immediate=False,
+            function=self._async_sync_logged,
+        )
+        self.last_sync: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+
+    @callback
+    def async_start(self) -> None:
+        """Sync now, every interval and after local changes."""
+        self._unsubs.append(self.coordinator.async_add_listener(self._async_history_updated))
+        self._unsubs.append(
+            async_track_time_interval(
+                self.hass,
+                self._async_interval,
+                SYNC_INTERVAL,
+                name=f"{DOMAIN} {self.coordinator.baby_name} peer sync",
+            )
+        )
+        self._debouncer.async_schedule_call()
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop syncing."""
+        for unsub in self._unsubs:
+            unsub()
+        self._unsubs.clear()
+        self._debouncer.async_cancel()
+
+    @callback
+    def _async_history_updated(self) -> None:
+        """Push local changes once the history stops changing for a moment."""
+        if self.coordinator.sync.sequence != self._synced_sequence:
+            self._debouncer.async_schedule_call()
+
+    async def _async_interval(self, now: datetime) -> None:
+        """Pull the peer's changes."""
+        await self._async_sync_logged()
+
+    async def _async_sync_logged(self) -> None:
+        """Sync, logging failures instead of raising them."""
+        try:
+            await self.async_sync()
+        except HomeAssistantError as err:
+            if str(err) != self.last_error:
+                _LOGGER.warning(f"Peer sync of {self.coordinator.baby_name} failed: {err}")
+            self.last_error = str(err)
+
+    async def async_sync(self) -> Dict[str, Any]:
+        """Exchange changes until both sides are up to date."""
+        async with self._lock:
+            pushed = pulled = 0
+            for _ in range(SYNC_MAX_ROUNDS):
+                sent, received, more = await self._async_exchange()
+                pushed += sent
+                pulled += received
+                if not more:
+                    break
+            self._synced_sequence = self.coordinator.sync.sequence
+            if self.last_error is not None:
+                _LOGGER.info(f"Peer sync of {self.coordinator.baby_name} with {self.url} recovered")
+            self.last_sync = dt_util.utcnow()
+            self.last_error = None
+            if pushed or pulled:
+                _LOGGER.debug(f"Synced {self.coordinator.baby_name} with {self.url}: sent {pushed}, received {pulled}")
+            return {"peer": self.url, "pushed": pushed, "pulled": pulled}
+
+    async def _async_exchange(self) -> Tuple[int, int, bool]:
+        """Send our next changes and apply the peer's, returning the counts and whether more follow."""
+        log = self.coordinator.sync
+        peer = log.peers.get(self.key, {})
+        changes, cursor, more = log.changes_since(
+            peer.get("pushed", 0), self.coordinator.get_activity, self._received
+        )
+        response = await self._async_post({
+            "protocol": SYNC_PROTOCOL,
+            "baby": self.baby,
+            "instance_id": log.instance_id,
+            "since": peer.get("pulled", 0),
+            "cursor": cursor,
+            "changes": changes,
+        })
+
+        if peer.get("instance_id", response["instance_id"]) != response["instance_id"]:
+            # The peer's history was set up again, its cursors no longer apply
+            _LOGGER.warning(f"{self.url} has a new history for {self.baby}, syncing everything again")
+            log.peers[self.key] = {"instance_id": response["instance_id"], "pushed": 0, "pulled": 0}
+            self._received.clear()
+            return 0, 0, True
+
+        peer_state = {
+            "instance_id": response["instance_id"],
+            "pushed": response["ack"],
+            "pulled": response["cursor"],
+        }
+        applied = await self.coordinator.async_apply_sync_changes(
+            response["changes"], self.key, peer_state
+        )
+        self._received = {
+            activity_id: seq
+            for activity_id, seq in {**self._received, **applied}.items()
+            if seq > peer_state["pushed"]
+        }
+        return len(changes), len(response["changes"]), more or response["more"]
+
+    async def _async_post(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Post an exchange to the peer and validate its answer."""
+        session = async_get_clientsession(self.hass)
+        try:
+            async with asyncio.timeout(SYNC_TIMEOUT), session.post(
+                f"{self.url}{SYNC_API_PATH}",
+                json=payload,
+                headers={"Authorization": f"Bearer {self._token}"},
+            ) as response:
+                if response.status == HTTPStatus.UNAUTHORIZED:
+                    raise HomeAssistantError(f"{self.url} rejected the access token")
+                if response.status != HTTPStatus.OK:
+                    raise HomeAssistantError(
+                        f"{self.url} answered {response.status}: {await response.text()}"
+                    )
+                data = await response.json()
+        except (aiohttp.ClientError, TimeoutError) as err:
+            raise HomeAssistantError(f"Cannot reach {self.url}: {err or 'timeout'}") from err
+
+        try:
+            return RESPONSE_SCHEMA(data)
+        except vol.Invalid as err:
+            raise HomeAssistantError(f"Invalid sync response from {self.url}: {err}") from err
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Summarize the peer for diagnostics."""
+        return {
+            "url": self.url,
+            "baby": self.baby,
+            "cursors": self.coordinator.sync.peers.get(self.key),
+            "last_sync": self.last_sync.isoformat() if self.last_sync else None,
+            "last_error": self.last_error,
+        }
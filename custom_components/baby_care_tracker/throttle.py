@@ -0,0 +1,99 @@
+"""Flood protection for mapped button and entity triggers."""
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, Optional, Tuple
+
+# Events from one entity for the same action closer together than this are one
+# press; the window restarts on every event, so a flapping entity stays quiet
+# until it settles
+DEBOUNCE_SECONDS = 1.0
+# The same action and parameters within this window are one press reported
+# twice, e.g. through both a state change and a zha_event
+DEDUP_SECONDS = 2.0
+# Triggers allowed per entity in a burst, refilled at one per interval; well
+# above how fast anyone presses a button, so only a misbehaving entity hits it
+RATE_LIMIT_BURST = 10
+RATE_LIMIT_INTERVAL = 3.0
+
+# Reasons a trigger is dropped
+DROP_DEBOUNCED = "debounced"
+DROP_DUPLICATE = "duplicate"
+DROP_RATE_LIMITED = "rate_limited"
+
+
+class TokenBucket:
+    """Token bucket allowing short bursts at a bounded average rate."""
+
+    def __init__(self, capacity: int, interval: float) -> None:
+        """Initialize a full bucket."""
+        self.capacity = capacity
+        self.interval = interval
+        self.tokens = float(capacity)
+        self._updated: Optional[float] = None
+
+    def consume(self, now: float) -> bool:
+        """Take a token if one is available."""
+        if self._updated is not None:
+            refill = (now - self._updated) / self.interval
+            self.tokens = min(float(self.capacity), self.tokens + refill)
+        self._updated = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class TriggerThrottle:
+    """Decide which mapped triggers reach the coordinator.
+
+    Checks run cheapest first and a dropped trigger never takes a token.
+    Each entity has its own bucket, so a storm from one entity cannot
+    starve the others.
+    """
+
+    def __init__(
+        self,
+        debounce: float = DEBOUNCE_SECONDS,
+        dedup: float = DEDUP_SECONDS,
+        burst: int = RATE_LIMIT_BURST,
+        interval: float = RATE_LIMIT_INTERVAL,
+    ) -> None:
+        """Initialize the throttle."""
+        self.debounce = debounce
+        self.dedup = dedup
+        self.burst = burst
+        self.interval = interval
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._last_event: Dict[Tuple[str, str], float] = {}
+        self._last_action: Dict[Tuple[str, Tuple[Tuple[str, Any], ...]], float] = {}
+
+    def check(
+        self,
+        entity_id: str,
+        action: str,
+        params: Dict[str, Any],
+        now: Optional[float] = None,
+    ) -> Optional[str]:
+        """Return why a trigger is dropped, or None to let it through."""
+        if now is None:
+            now = time.monotonic()
+
+        last_event = self._last_event.get((entity_id, action))
+        self._last_event[(entity_id, action)] = now
+        if last_event is not None and now - last_event < self.debounce:
+            return DROP_DEBOUNCED
+
+        key = (action, tuple(sorted(params.items())))
+        last_action = self._last_action.get(key)
+        if last_action is not None and now - last_action < self.dedup:
+            return DROP_DUPLICATE
+
+        bucket = self._buckets.get(entity_id)
+        if bucket is None:
+            bucket = self._buckets[entity_id] = TokenBucket(self.burst, self.interval)
+        if not bucket.consume(now):
+            return DROP_RATE_LIMITED
+
+        self._last_action[key] = now
+        return None
@@ -0,0 +1,188 @@
+"""Rolling-window trends for Baby Care Tracker."""
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Deque, Dict, Iterable, Optional, Tuple
+
+from .const import (
+    ACTIVITY_BOTTLE_FEEDING,
+    ACTIVITY_DIAPER,
+    ACTIVITY_FEEDING,
+    ACTIVITY_SLEEPING,
+)
+
+# Trend metrics
+TREND_FEEDINGS = "feedings"
+TREND_SLEEP_HOURS = "sleep_hours"
+TREND_DIAPERS = "diapers"
+TREND_BOTTLE_ML = "bottle_ml"
+
+TREND_METRICS = [
+    TREND_FEEDINGS,
+    TREND_SLEEP_HOURS,
+    TREND_DIAPERS,
+    TREND_BOTTLE_ML,
+]
+
+# Trend windows
+TREND_WINDOWS: Dict[str, timedelta] = {
+    "24h": timedelta(hours=24),
+    "7d": timedelta(days=7),
+    "30d": timedelta(days=30),
+}
+
+
+def trend_values(activity: Dict[str, Any]) -> Iterable[Tuple[str, float]]:
+    """Return the (metric, value) contributions of an activity.
+
+    Sleep contributes its whole length; windows count only the part of it
+    after their start.
+    """
+    activity_type = activity.get("type")
+    if activity_type in (ACTIVITY_FEEDING, ACTIVITY_BOTTLE_FEEDING):
+        yield TREND_FEEDINGS, 1
+    if activity_type == ACTIVITY_BOTTLE_FEEDING:
+        yield TREND_BOTTLE_ML, activity.get("amount_ml", 0)
+    elif activity_type == ACTIVITY_SLEEPING:
+        yield TREND_SLEEP_HOURS, activity.get("duration_seconds", 0) / 3600
+    elif activity_type == ACTIVITY_DIAPER:
+        yield TREND_DIAPERS, 1
+
+
+def _sample_bounds(activity: Dict[str, Any]) -> Tuple[float, Optional[float]]:
+    """Return the end and, for sleep, the start of an activity's sample in epoch seconds."""
+    timestamp = datetime.fromisoformat(activity["timestamp"]).timestamp()
+    if activity.get("type") == ACTIVITY_SLEEPING and activity.get("start_time"):
+        return timestamp, min(datetime.fromisoformat(activity["start_time"]).timestamp(), timestamp)
+    return timestamp, None
+
+
+class RollingWindow:
+    """Time-ordered samples within a sliding window with a running sum.
+
+    Samples are ordered by their end. A sample spanning time, like a sleep,
+    is spread evenly over its span and counts only for the part inside the
+    window, so the window agrees with the clipped daily sleep totals.
+    """
+
+    def __init__(self, length: timedelta) -> None:
+        """Initialize the window."""
+        self.length = length.total_seconds()
+        self._samples: Deque[Tuple[float, float, float]] = deque()
+        self._longest = 0.0
+        self.total = 0.0
+
+    def __len__(self) -> int:
+        """Return the number of samples in the window."""
+        return len(self._samples)
+
+    def add(self, timestamp: float, value: float, now: float, start: Optional[float] = None) -> None:
+        """Add a sample ending at timestamp, ignoring it if it is already outside the window."""
+        if timestamp < now - self.length:
+            return
+
+        sample = (timestamp, value, timestamp if start is None else start)
+        self._longest = max(self._longest, sample[0] - sample[2])
+        if not self._samples or timestamp >= self._samples[-1][0]:
+            self._samples.append(sample)
+        else:
+            # Late arrivals are rare, keep the samples ordered
+            position = bisect_right([existing[0] for existing in self._samples], timestamp)
+            self._samples.insert(position, sample)
+        self.total += value
+
+    def remove(self, timestamp: float, value: float, start: Optional[float] = None) -> None:
+        """Remove a sample if it is still in the window."""
+        try:
+            self._samples.remove((timestamp, value, timestamp if start is None else start))
+        except ValueError:
+            return
+        self.total -= value
+
+    def clipped_total(self, now: float) -> float:
+        """Return the sum over the window ending now, clipping samples that started before it.
+
+        Only samples ending within the longest sample length of the window
+        start can be clipped, so this walks just the oldest few.
+        """
+        cutoff = now - self.length
+        total = self.total
+        for end, value, start in self._samples:
+            if end >= cutoff + self._longest:
+                break
+            if end < cutoff:
+                total -= value
+            elif start < cutoff:
+                total -= value * (cutoff - start) / (end - start)
+        return max(total, 0.0)
+
+    def expire(self, now: float) -> None:
+        """Drop samples that fell out of the window."""
+        cutoff = now - self.length
+        while self._samples and self._samples[0][0] < cutoff:
+            self.total -= self._samples.popleft()[1]
+        if not self._samples:
+            self.total = 0.0
+
+
+class TrendTracker:
+    """Running totals of trend metrics over each window."""
+
+    def __init__(self) -> None:
+        """Initialize the tracker."""
+        self._windows: Dict[Tuple[str, str], RollingWindow] = {
+            (metric, window): RollingWindow(length)
+            for metric in TREND_METRICS
+            for window, length in TREND_WINDOWS.items()
+        }
+
+    @classmethod
+    def from_activities(
+        cls, activities: Iterable[Dict[str, Any]], now: Optional[datetime] = None
+    ) -> TrendTracker:
+        """Build a tracker from the activities inside the longest window."""
+        if now is None:
+            now = datetime.now()
+        tracker = cls()
+        cutoff = (now - max(TREND_WINDOWS.values())).isoformat()
+        now_timestamp = now.timestamp()
+        for activity in activities:
+            if activity.get("timestamp", "") >= cutoff:
+                tracker.add_activity(activity, now_timestamp)
+        return tracker
+
+    def add_activity(self, activity: Dict[str, Any], now: Optional[float] = None) -> None:
+        """Add an activity to every window it contributes to."""
+        if now is None:
+            now = datetime.now().timestamp()
+        timestamp, start = _sample_bounds(activity)
+        for metric, value in trend_values(activity):
+            for window in TREND_WINDOWS:
+                self._windows[(metric, window)].add(timestamp, value, now, start)
+
+    def remove_activity(self, activity: Dict[str, Any]) -> None:
+        """Remove an activity from every window it contributes to."""
+        timestamp, start = _sample_bounds(activity)
+        for metric, value in trend_values(activity):
+            for window in TREND_WINDOWS:
+                self._windows[(metric, window)].remove(timestamp, value, start)
+
+    def expire(self, now: Optional[float] = None) -> None:
+        """Drop samples that fell out of their windows."""
+        if now is None:
+            now = datetime.now().timestamp()
+        for rolling_window in self._windows.values():
+            rolling_window.expire(now)
+
+    def total(self, metric: str, window: str, now: Optional[float] = None) -> float:
+        """Return the total of a metric over a window ending now."""
+        if now is None:
+            now = datetime.now().timestamp()
+        return self._windows[(metric, window)].clipped_total(now)
+
+    def daily_average(self, metric: str, window: str, now: Optional[float] = None) -> float:
+        """Return the per-day average of a metric over a window."""
+        days = TREND_WINDOWS[window].total_seconds() / 86400
+        return self.total(metric, window, now) / days
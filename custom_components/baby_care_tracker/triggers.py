@@ -0,0 +1,192 @@
+"""Trigger rules compiled from button mappings."""
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from homeassistant.core import HomeAssistant, State, split_entity_id
+from homeassistant.helpers import entity_registry as er
+
+from .const import (
+    CONF_MAPPINGS,
+    DIAPER_BOTH,
+    DIAPER_POO,
+    DIAPER_PEE,
+    FEEDING_LEFT,
+    FEEDING_RIGHT,
+    MAPPING_ACTION_CONFIG_KEYS,
+    MAPPING_CONFIG_KEYS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Mapping action -> (coordinator action, parameters)
+MAPPING_ACTIONS: Dict[str, Tuple[str, Dict[str, Any]]] = {
+    "feeding_start_left": ("start_feeding", {"side": FEEDING_LEFT}),
+    "feeding_start_right": ("start_feeding", {"side": FEEDING_RIGHT}),
+    "feeding_stop": ("stop_feeding", {}),
+    "sleep_start": ("sleep_start", {}),
+    "wake_up": ("wake_up", {}),
+    "diaper_pee": ("log_diaper", {"type": DIAPER_PEE}),
+    "diaper_poo": ("log_diaper", {"type": DIAPER_POO}),
+    "diaper_both": ("log_diaper", {"type": DIAPER_BOTH}),
+    "sleep_toggle": ("toggle_sleep", {}),
+    "feeding_toggle": ("toggle_feeding", {}),
+}
+
+# Domains whose state is the time of the last press
+PRESS_DOMAINS = {"button", "input_button"}
+# Domains that trigger when they turn on
+EDGE_DOMAINS = {"switch", "binary_sensor", "input_boolean"}
+# Domains whose trigger name is the event_type attribute of a new event
+EVENT_DOMAINS = {"event"}
+
+
+class TriggerMatcher:
+    """Predicate on a state change."""
+
+    def matches(self, old_state: Optional[State], new_state: State) -> bool:
+        """Return whether the state change fires the trigger."""
+        raise NotImplementedError
+
+
+class StateUpdated(TriggerMatcher):
+    """Fire on every state write, as buttons do when pressed."""
+
+    def matches(self, old_state: Optional[State], new_state: State) -> bool:
+        """Return True."""
+        return True
+
+
+class RisingEdge(TriggerMatcher):
+    """Fire when the state changes to a value."""
+
+    def __init__(self, to_state: str = "on") -> None:
+        """Initialize the matcher."""
+        self.to_state = to_state
+
+    def matches(self, old_state: Optional[State], new_state: State) -> bool:
+        """Return whether the state just became the target value."""
+        return (
+            new_state.state == self.to_state
+            and old_state is not None
+            and old_state.state != self.to_state
+        )
+
+
+class AnyChange(TriggerMatcher):
+    """Fire when the state value changes."""
+
+    def matches(self, old_state: Optional[State], new_state: State) -> bool:
+        """Return whether the state value differs from the previous one."""
+        return old_state is not None and old_state.state != new_state.state
+
+
+class AttributeEquals(TriggerMatcher):
+    """Fire on a new state whose attribute has a value.
+
+    Event entities store the time of the last event as their state, so a
+    new state with the matching event_type is a new press of that kind.
+    """
+
+    def __init__(self, attribute: str, value: Any) -> None:
+        """Initialize the matcher."""
+        self.attribute = attribute
+        self.value = value
+
+    def matches(self, old_state: Optional[State], new_state: State) -> bool:
+        """Return whether the state changed and the attribute matches."""
+        if new_state.attributes.get(self.attribute) != self.value:
+            return False
+        return old_state is None or old_state.state != new_state.state
+
+
+StateRoute = Tuple[TriggerMatcher, str, Dict[str, Any]]
+ButtonRoute = Tuple[str, str, Dict[str, Any]]
+
+
+def compile_state_matcher(entity_id: str, trigger: Optional[str] = None) -> TriggerMatcher:
+    """Return the matcher of a mapped entity from its domain and trigger name."""
+    domain = split_entity_id(entity_id)[0]
+    if domain in EVENT_DOMAINS:
+        if trigger:
+            return AttributeEquals("event_type", trigger)
+        return StateUpdated()
+    if domain in PRESS_DOMAINS:
+        return StateUpdated()
+    if domain in EDGE_DOMAINS:
+        return RisingEdge("on")
+    return AnyChange()
+
+
+def mapping_key(mapping: Mapping[str, Any]) -> Tuple[str, Optional[str]]:
+    """Return the (entity ID, trigger) a mapping listens to."""
+    return mapping["entity_id"], mapping.get("trigger") or None
+
+
+def get_mappings(options: Mapping[str, Any]) -> List[Dict[str, Any]]:
+    """Return the button mappings of an entry.
+
+    Entries configured before mappings were structured keep one
+    "entity_id[:trigger]" string per action, converted here.
+    """
+    if CONF_MAPPINGS in options:
+        return [dict(mapping) for mapping in options[CONF_MAPPINGS]]
+
+    mappings = []
+    for action_key, config_key in MAPPING_ACTION_CONFIG_KEYS.items():
+        entity_config = options.get(config_key)
+        if not entity_config:
+            continue
+        entity_id, _, trigger = str(entity_config).partition(":")
+        mapping = {"entity_id": entity_id, "action": action_key}
+        if trigger:
+            mapping["trigger"] = trigger
+        mappings.append(mapping)
+    return mappings
+
+
+def mapping_options(
+    options: Mapping[str, Any], mappings: Iterable[Mapping[str, Any]]
+) -> Dict[str, Any]:
+    """Return entry options with the mappings stored in structured form."""
+    new_options = {
+        key: value for key, value in options.items() if key not in MAPPING_CONFIG_KEYS
+    }
+    new_options[CONF_MAPPINGS] = [dict(mapping) for mapping in mappings]
+    return new_options
+
+
+def compile_mappings(
+    hass: HomeAssistant, mappings: Iterable[Mapping[str, Any]]
+) -> Tuple[Dict[str, List[StateRoute]], Dict[str, Dict[str, ButtonRoute]]]:
+    """Compile button mappings into routing tables.
+
+    Returns state routes by entity ID, and zha/deCONZ button routes by
+    device ID and command, so an event costs one lookup to find its route.
+    """
+    state_routes: Dict[str, List[StateRoute]] = {}
+    button_routes: Dict[str, Dict[str, ButtonRoute]] = {}
+    registry = er.async_get(hass)
+
+    for mapping in mappings:
+        if mapping.get("action") not in MAPPING_ACTIONS:
+            _LOGGER.warning(f"Ignoring mapping with unknown action: {mapping}")
+            continue
+        action, params = MAPPING_ACTIONS[mapping["action"]]
+        entity_id, trigger = mapping_key(mapping)
+
+        if not trigger or split_entity_id(entity_id)[0] in EVENT_DOMAINS:
+            matcher = compile_state_matcher(entity_id, trigger)
+            state_routes.setdefault(entity_id, []).append((matcher, action, params))
+            _LOGGER.debug(f"Configured state change: {entity_id} {trigger or ''} -> {action}")
+            continue
+
+        entry = registry.async_get(entity_id)
+        if entry is None or entry.device_id is None:
+            _LOGGER.warning(f"Cannot map button action {trigger} of {entity_id}: entity has no device")
+            continue
+        button_routes.setdefault(entry.device_id, {})[trigger] = (entity_id, action, params)
+        _LOGGER.debug(f"Configured button event: {entity_id} action {trigger} -> {action}")
+
+    return state_routes, button_routes
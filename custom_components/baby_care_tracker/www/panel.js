@@ -35,7 +35,9 @@ class BabyCareTrackerPanel extends LitElement {
       { key: 'wake_up', label: 'Wake Up', icon: 'mdi:weather-sunny' },
       { key: 'diaper_pee', label: 'Pee Diaper', icon: 'mdi:water' },
       { key: 'diaper_poo', label: 'Poo Diaper', icon: 'mdi:emoticon-poop' },
-      { key: 'diaper_both', label: 'Both Diaper', icon: 'mdi:baby-carriage' }
+      { key: 'diaper_both', label: 'Both Diaper', icon: 'mdi:baby-carriage' },
+      { key: 'sleep_toggle', label: 'Sleep / Wake', icon: 'mdi:power-sleep' },
+      { key: 'feeding_toggle', label: 'Feeding Toggle', icon: 'mdi:swap-horizontal' }
     ];
   }
 
@@ -46,104 +48,39 @@ class BabyCareTrackerPanel extends LitElement {
 
   async _loadDevices() {
     try {
-      // Get all entities that are buttons, switches, etc.
-      const relevantEntities = Object.values(this.hass.states).filter(entity => 
-        ['button', 'switch', 'input_button', 'binary_sensor'].includes(entity.entity_id.split('.')[0])
-      );
-      
-      console.log('Found relevant entities:', relevantEntities.length);
-      
-      // Try to get device registry
-      let deviceRegistry = [];
-      try {
-        deviceRegistry = await this.hass.callWS({
-          type: "config/device_registry/list",
-        });
-        console.log('Device registry loaded:', deviceRegistry.length, 'devices');
-      } catch (err) {
-        console.warn('Could not load device registry:', err);
-      }
-      
-      // Group entities by device
-      const deviceMap = new Map();
-      
-      for (const entity of relevantEntities) {
-        try {
-          // Try to get entity registry info
-          const entityRegistry = await this.hass.callWS({
-            type: "config/entity_registry/get",
-            entity_id: entity.entity_id,
-          });
-          
-          if (entityRegistry?.device_id) {
-            const device = deviceRegistry.find(d => d.id === entityRegistry.device_id);
-            if (device) {
-              if (!deviceMap.has(device.id)) {
-                deviceMap.set(device.id, {
-                  id: device.id,
-                  name: device.name_by_user || device.name || device.model || 'Unknown Device',
-                  model: device.model,
-                  manufacturer: device.manufacturer,
-                  entities: []
-                });
-              }
-              deviceMap.get(device.id).entities.push({
-                entity_id: entity.entity_id,
-                name: entity.attributes.friendly_name || entity.entity_id,
-                domain: entity.entity_id.split('.')[0],
-                state: entity.state
-              });
-            }
-          } else {
-            // Entity without device - create virtual device
-            const domain = entity.entity_id.split('.')[0];
-            const virtualDeviceId = `virtual_${domain}`;
-            
-            if (!deviceMap.has(virtualDeviceId)) {
-              deviceMap.set(virtualDeviceId, {
-                id: virtualDeviceId,
-                name: `${domain.charAt(0).toUpperCase() + domain.slice(1)} Entities`,
-                model: 'Virtual Device',
-                manufacturer: 'Home Assistant',
-                entities: []
-              });
-            }
-            
-            deviceMap.get(virtualDeviceId).entities.push({
-              entity_id: entity.entity_id,
-              name: entity.attributes.friendly_name || entity.entity_id,
-              domain: entity.entity_id.split('.')[0],
-              state: entity.state
-            });
-          }
-        } catch (entityError) {
-          console.warn('Error processing entity:', entity.entity_id, entityError);
-          
-          // Fallback: add to virtual device
-          const domain = entity.entity_id.split('.')[0];
-          const virtualDeviceId = `virtual_${domain}`;
-          
-          if (!deviceMap.has(virtualDeviceId)) {
-            deviceMap.set(virtualDeviceId, {
-              id: virtualDeviceId,
-              name: `${domain.charAt(0).toUpperCase() + domain.slice(1)} Entities`,
-              model: 'Virtual Device',
-              manufacturer: 'Home Assistant',
-              entities: []
-            });
-          }
-          
-          deviceMap.get(virtualDeviceId).entities.push({
-            entity_id: entity.entity_id,
-            name: entity.attributes.friendly_name || entity.entity_id,
-            domain: entity.entity_id.split('.')[0],
-            state: entity.state
+      // One request returns the devices, their triggers and the entities
+      // without a device, cached and kept current by the integration
+      const catalog = await this.hass.callWS({
+        type: "baby_care_tracker/device_catalog",
+      });
+      const withState = entity => ({
+        ...entity,
+        state: this.hass.states[entity.entity_id]?.state
+      });
+
+      const devices = catalog.devices.map(device => ({
+        ...device,
+        entities: device.entities.map(withState)
+      }));
+
+      // Entities without a device are grouped into a virtual device per domain
+      const virtualDevices = new Map();
+      for (const entity of catalog.entities) {
+        const virtualDeviceId = `virtual_${entity.domain}`;
+        if (!virtualDevices.has(virtualDeviceId)) {
+          virtualDevices.set(virtualDeviceId, {
+            id: virtualDeviceId,
+            name: `${entity.domain.charAt(0).toUpperCase() + entity.domain.slice(1)} Entities`,
+            model: 'Virtual Device',
+            manufacturer: 'Home Assistant',
+            entities: [],
+            triggers: []
           });
         }
+        virtualDevices.get(virtualDeviceId).entities.push(withState(entity));
       }
-      
-      this._devices = Array.from(deviceMap.values()).filter(device => device.entities.length > 0);
-      console.log('Final devices:', this._devices);
+
+      this._devices = [...devices, ...virtualDevices.values()].filter(device => device.entities.length > 0);
       this._loading = false;
     } catch (error) {
       console.error('Error loading devices:', error);
@@ -161,6 +98,7 @@ class BabyCareTrackerPanel extends LitElement {
       
       if (configEntries.length > 0) {
         const config = configEntries[0];
+        this._entryId = config.entry_id;
         this._mappings = this._parseMappingsFromOptions(config.options);
       }
     } catch (error) {
@@ -169,33 +107,32 @@ class BabyCareTrackerPanel extends LitElement {
   }
 
   _parseMappingsFromOptions(options) {
-    const mappings = [];
-    const actionMap = {
-      'feeding_start_left_entity': 'Start Left Breast Feeding',
-      'feeding_start_right_entity': 'Start Right Breast Feeding',
-      'feeding_stop_entity': 'Stop Feeding',
-      'sleep_start_entity': 'Start Sleep',
-      'wake_up_entity': 'Wake Up',
-      'diaper_pee_entity': 'Log Pee Diaper',
-      'diaper_poo_entity': 'Log Poo Diaper',
-      'diaper_both_entity': 'Log Both (Pee & Poo)',
-    };
+    const labels = Object.fromEntries(
+      this._babyCareActions.map(action => [action.key, action.label])
+    );
+    const toMapping = (entityId, action, trigger) => ({
+      entity_id: entityId,
+      action: action,
+      label: labels[action] || action,
+      specific_action: trigger || null
+    });
+
+    // Structured mappings: [{entity_id, action, trigger}]
+    if (Array.isArray(options.mappings)) {
+      return options.mappings.map(m => toMapping(m.entity_id, m.action, m.trigger));
+    }
 
+    // Older entries keep one "entity_id[:trigger]" string per action
+    const mappings = [];
     for (const [configKey, entityConfig] of Object.entries(options)) {
-      if (actionMap[configKey] && entityConfig) {
-        const [entityId, specificAction] = entityConfig.includes(':') 
-          ? entityConfig.split(':') 
-          : [entityConfig, null];
-        
-        mappings.push({
-          entity_id: entityId,
-          action: actionMap[configKey],
-          specific_action: specificAction,
-          config_key: configKey
-        });
-      }
+      if (!configKey.endsWith('_entity') || !entityConfig) continue;
+      const action = configKey.slice(0, -'_entity'.length);
+      if (!labels[action]) continue;
+      const separator = entityConfig.indexOf(':');
+      mappings.push(separator === -1
+        ? toMapping(entityConfig, action, null)
+        : toMapping(entityConfig.slice(0, separator), action, entityConfig.slice(separator + 1)));
     }
-    
     return mappings;
   }
 
@@ -221,8 +158,8 @@ class BabyCareTrackerPanel extends LitElement {
       const entityActions = [];
       
       if (entity.domain === 'button') {
-        // Try to get device-specific actions from device triggers
-        const deviceTriggers = await this._getDeviceTriggers(this._selectedDevice.id);
+        // Device-specific actions come from the cached device triggers
+        const deviceTriggers = this._selectedDevice.triggers || [];
         
         if (deviceTriggers.length > 0) {
           // Use device triggers if available
@@ -263,19 +200,6 @@ class BabyCareTrackerPanel extends LitElement {
     this._deviceActions = actions;
   }
 
-  async _getDeviceTriggers(deviceId) {
-    try {
-      const deviceTriggers = await this.hass.callWS({
-        type: "device_automation/trigger/list",
-        device_id: deviceId,
-      });
-      return deviceTriggers || [];
-    } catch (error) {
-      console.log('No device triggers found for device:', deviceId);
-      return [];
-    }
-  }
-
   _formatActionLabel(action) {
     return action
       .replace(/_/g, ' ')
@@ -287,6 +211,7 @@ class BabyCareTrackerPanel extends LitElement {
     
     // Call service to update mapping
     await this.hass.callService('baby_care_tracker', 'update_button_mapping', {
+      config_entry_id: this._entryId,
       entity_id: entityId,
       trigger_action: triggerAction === 'state_change' ? null : triggerAction,
       baby_care_action: babyCareAction
@@ -302,6 +227,7 @@ class BabyCareTrackerPanel extends LitElement {
 
   async _removeMapping(mapping) {
     await this.hass.callService('baby_care_tracker', 'remove_button_mapping', {
+      config_entry_id: this._entryId,
       entity_id: mapping.entity_id,
       specific_action: mapping.specific_action
     });
@@ -513,7 +439,7 @@ class BabyCareTrackerPanel extends LitElement {
                         <span class="specific-action">(${mapping.specific_action})</span>
                       ` : ''}
                       <span class="arrow">→</span>
-                      <span class="action">${mapping.action}</span>
+                      <span class="action">${mapping.label}</span>
                     </div>
                     <button 
                       @click=${() => this._removeMapping(mapping)}
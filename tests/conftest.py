@@ -0,0 +1,74 @@
+"""Fixtures shared by the Baby Care Tracker tests."""
+from __future__ import annotations
+
+import asyncio
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from homeassistant.config_entries import ConfigEntry  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+from homeassistant.helpers import (  # noqa: E402
+    area_registry as ar,
+    device_registry as dr,
+    entity_registry as er,
+)
+
+from custom_components.baby_care_tracker.const import CONF_BABY_NAME, DOMAIN  # noqa: E402
+from custom_components.baby_care_tracker.coordinator import BabyCareCoordinator  # noqa: E402
+
+
+@pytest.fixture
+def loop():
+    """Provide an event loop per test."""
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    yield loop
+    loop.close()
+
+
+@pytest.fixture
+def hass(loop, tmp_path):
+    """Provide a bare Home Assistant core without any integrations."""
+
+    async def _async_create() -> HomeAssistant:
+        hass = HomeAssistant(str(tmp_path))
+        hass.config.set_time_zone("UTC")
+        await ar.async_load(hass)
+        await dr.async_load(hass)
+        await er.async_load(hass)
+        return hass
+
+    hass = loop.run_until_complete(_async_create())
+    yield hass
+    loop.run_until_complete(hass.async_stop(force=True))
+
+
+@pytest.fixture
+def create_coordinator(hass: HomeAssistant, loop):
+    """Provide a factory of loaded coordinators for a baby called Emma."""
+    created: List[BabyCareCoordinator] = []
+
+    def _create(entry_id: str, options: Optional[Dict[str, Any]] = None) -> BabyCareCoordinator:
+        entry = ConfigEntry(
+            version=1,
+            minor_version=1,
+            domain=DOMAIN,
+            title="Emma",
+            data={CONF_BABY_NAME: "Emma"},
+            source="user",
+            options=options or {},
+            entry_id=entry_id,
+        )
+        coordinator = BabyCareCoordinator(hass, entry)
+        loop.run_until_complete(coordinator._async_load_data())
+        created.append(coordinator)
+        return coordinator
+
+    yield _create
+    for coordinator in created:
+        loop.run_until_complete(coordinator.async_close())
@@ -0,0 +1,43 @@
+"""Tests for backing up and restoring a baby's history.
+
+Run from the repository root:
+
+    pytest tests
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from custom_components.baby_care_tracker.backup import KIND_SEGMENT, KIND_SNAPSHOT
+
+
+def timestamps(coordinator):
+    """Return the timestamps of the history in list order."""
+    return [activity["timestamp"] for activity in coordinator._data["activities"]]
+
+
+def test_restore_keeps_history_in_time_order(create_coordinator, loop):
+    """An activity back-dated after the snapshot is restored at its place in time."""
+    coordinator = create_coordinator("restore")
+    first = loop.run_until_complete(coordinator._handle_log_diaper_internal("pee"))
+    loop.run_until_complete(coordinator._handle_log_bottle_feeding_internal(90))
+    moved = loop.run_until_complete(coordinator._handle_log_diaper_internal("poo"))
+    snapshot = loop.run_until_complete(coordinator.backups.async_backup())
+
+    earlier = datetime.fromisoformat(first["timestamp"]) - timedelta(hours=3)
+    loop.run_until_complete(
+        coordinator._handle_edit_activity_internal(moved["id"], {"timestamp": earlier.isoformat()})
+    )
+    segment = loop.run_until_complete(coordinator.backups.async_backup())
+    assert (snapshot["kind"], segment["kind"]) == (KIND_SNAPSHOT, KIND_SEGMENT)
+
+    loop.run_until_complete(coordinator.backups.async_restore())
+
+    assert timestamps(coordinator) == sorted(timestamps(coordinator))
+    assert coordinator._data["activities"][0]["id"] == moved["id"]
+
+    latest = loop.run_until_complete(coordinator._handle_undo_last_internal())
+    assert latest["id"] != moved["id"]
+
+    reloaded = create_coordinator("restore")
+    assert timestamps(reloaded) == sorted(timestamps(reloaded))
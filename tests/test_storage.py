@@ -0,0 +1,37 @@
+"""Tests for persisting a baby's history.
+
+Run from the repository root:
+
+    pytest tests
+"""
+from __future__ import annotations
+
+import pytest
+
+from custom_components.baby_care_tracker.const import CONF_STORAGE_BACKEND, STORAGE_BACKEND_SQLITE
+
+
+def test_failed_save_is_retried(create_coordinator, loop):
+    """Changes whose save failed are written with the next save."""
+    coordinator = create_coordinator("storage", {CONF_STORAGE_BACKEND: STORAGE_BACKEND_SQLITE})
+    kept = loop.run_until_complete(coordinator._handle_log_diaper_internal("pee"))
+    save = coordinator._storage.async_save
+
+    async def _async_fail(*args, **kwargs):
+        raise OSError("disk full")
+
+    coordinator._storage.async_save = _async_fail
+    with pytest.raises(OSError):
+        loop.run_until_complete(coordinator._handle_log_diaper_internal("poo"))
+    with pytest.raises(OSError):
+        loop.run_until_complete(coordinator._handle_delete_activity_internal(kept["id"]))
+
+    coordinator._storage.async_save = save
+    bottle = loop.run_until_complete(coordinator._handle_log_bottle_feeding_internal(60))
+    loop.run_until_complete(coordinator.async_close())
+
+    reloaded = create_coordinator("storage", {CONF_STORAGE_BACKEND: STORAGE_BACKEND_SQLITE})
+    stored = {activity["id"]: activity for activity in reloaded._data["activities"]}
+    assert kept["id"] not in stored
+    assert bottle["id"] in stored
+    assert [activity.get("diaper_type") for activity in stored.values()].count("poo") == 1
@@ -0,0 +1,158 @@
+"""Tests for syncing a baby's history between two Home Assistant instances.
+
+Run from the repository root:
+
+    pytest tests
+
+Two coordinators stand in for the two instances; the peer sync of the first
+posts its exchanges to the second as JSON, the way the sync endpoint does.
+"""
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List
+
+import pytest
+
+from custom_components.baby_care_tracker.const import CONF_SYNC_TOKEN, CONF_SYNC_URL
+from custom_components.baby_care_tracker.coordinator import BabyCareCoordinator
+from custom_components.baby_care_tracker.sync import (
+    FIELD_MODIFIED_AT,
+    FIELD_MODIFIED_BY,
+    RESPONSE_SCHEMA,
+    SYNC_PROTOCOL,
+)
+
+PEER_URL = "http://peer.local:8123"
+
+
+@pytest.fixture
+def peers(create_coordinator):
+    """Provide a coordinator syncing with a second one, and the payloads it posted."""
+    local = create_coordinator("local", {CONF_SYNC_URL: PEER_URL, CONF_SYNC_TOKEN: "token"})
+    remote = create_coordinator("remote", {})
+    posted: List[Dict[str, Any]] = []
+
+    async def _async_post(payload: Dict[str, Any]) -> Dict[str, Any]:
+        payload = json.loads(json.dumps(payload))
+        posted.append(payload)
+        response = await remote.async_sync_exchange(payload)
+        return RESPONSE_SCHEMA(json.loads(json.dumps(response)))
+
+    local.peer_sync._async_post = _async_post
+    return local, remote, posted
+
+
+def history(coordinator: BabyCareCoordinator) -> Dict[str, Dict[str, Any]]:
+    """Return the activities by ID without the local sequence numbers."""
+    return {
+        activity["id"]: {key: value for key, value in activity.items() if key != "seq"}
+        for activity in coordinator._data["activities"]
+    }
+
+
+def test_sync_exchanges_both_ways(peers, loop):
+    """Activities logged on either side end up on both."""
+    local, remote, _ = peers
+    loop.run_until_complete(local._handle_log_diaper_internal("pee"))
+    loop.run_until_complete(remote._handle_log_bottle_feeding_internal(90))
+
+    result = loop.run_until_complete(local.peer_sync.async_sync())
+
+    assert (result["pushed"], result["pulled"]) == (1, 1)
+    assert history(local) == history(remote)
+    assert len(history(local)) == 2
+
+
+def test_received_changes_are_not_echoed(peers, loop):
+    """Changes pulled from the peer are never pushed back to it."""
+    local, remote, posted = peers
+    loop.run_until_complete(remote._handle_log_diaper_internal("poo"))
+    loop.run_until_complete(local.peer_sync.async_sync())
+    posted.clear()
+
+    result = loop.run_until_complete(local.peer_sync.async_sync())
+
+    assert (result["pushed"], result["pulled"]) == (0, 0)
+    assert all(not payload["changes"] for payload in posted)
+
+
+def test_last_writer_wins(peers, loop):
+    """Concurrent edits of an activity converge on the newer one."""
+    local, remote, _ = peers
+    diaper = loop.run_until_complete(local._handle_log_diaper_internal("pee"))
+    loop.run_until_complete(local.peer_sync.async_sync())
+
+    loop.run_until_complete(local._handle_edit_activity_internal(diaper["id"], {"notes": "older"}))
+    loop.run_until_complete(remote._handle_edit_activity_internal(diaper["id"], {"notes": "newer"}))
+    loop.run_until_complete(local.peer_sync.async_sync())
+
+    assert local.get_activity(diaper["id"])["notes"] == "newer"
+    assert remote.get_activity(diaper["id"])["notes"] == "newer"
+    assert history(local) == history(remote)
+
+
+def test_deletion_reaches_peer_as_tombstone(peers, loop):
+    """A deleted activity is removed on the peer and is not revived by an older edit."""
+    local, remote, _ = peers
+    bottle = loop.run_until_complete(remote._handle_log_bottle_feeding_internal(120))
+    loop.run_until_complete(local.peer_sync.async_sync())
+    stale = dict(remote.get_activity(bottle["id"]))
+
+    loop.run_until_complete(local._handle_delete_activity_internal(bottle["id"]))
+    loop.run_until_complete(local.peer_sync.async_sync())
+
+    assert remote.get_activity(bottle["id"]) is None
+    assert bottle["id"] in remote.sync.tombstones
+
+    loop.run_until_complete(local.async_apply_sync_changes([stale]))
+    assert local.get_activity(bottle["id"]) is None
+
+
+def test_new_peer_history_resets_cursors(peers, loop):
+    """A peer whose history was set up again is sent everything again."""
+    local, remote, _ = peers
+    loop.run_until_complete(local._handle_log_diaper_internal("pee"))
+    loop.run_until_complete(local.peer_sync.async_sync())
+    key = local.peer_sync.key
+    assert local.sync.peers[key]["pushed"] > 0
+
+    remote.sync.instance_id = "reinstalled"
+    remote._data["activities"].clear()
+    remote._activity_index.clear()
+
+    loop.run_until_complete(local.peer_sync.async_sync())
+
+    assert local.sync.peers[key]["instance_id"] == "reinstalled"
+    assert set(history(remote)) == set(history(local))
+
+
+def test_invalid_synced_times_are_ignored(peers, loop):
+    """A synced activity with a bad time is skipped without touching the history."""
+    local, _, _ = peers
+    good = {
+        "id": "good",
+        "type": "diaper",
+        "diaper_type": "pee",
+        "timestamp": "2026-01-01T08:00:00+02:00",
+        FIELD_MODIFIED_AT: "2026-01-01T06:00:00+00:00",
+        FIELD_MODIFIED_BY: "peer",
+    }
+    bad = {**good, "id": "bad", "timestamp": "yesterday"}
+    bad_start = {**good, "id": "bad_start", "type": "sleeping", "start_time": "soon", "end_time": None}
+
+    applied = loop.run_until_complete(local.async_apply_sync_changes([bad, good, bad_start]))
+
+    assert set(applied) == {"good"}
+    assert set(history(local)) == {"good"}
+    assert local.get_activity("good")["timestamp"] == "2026-01-01T06:00:00"
+
+
+def test_exchange_request_protocol(peers, loop):
+    """Exchanges carry the protocol, our instance and both cursors."""
+    local, _, posted = peers
+    loop.run_until_complete(local.peer_sync.async_sync())
+
+    assert posted[0]["protocol"] == SYNC_PROTOCOL
+    assert posted[0]["instance_id"] == local.sync.instance_id
+    assert (posted[0]["since"], posted[0]["cursor"]) == (0, 0)
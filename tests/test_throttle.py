@@ -0,0 +1,47 @@
+"""Tests for the flood protection of mapped triggers.
+
+Run from the repository root:
+
+    pytest tests
+"""
+from __future__ import annotations
+
+from custom_components.baby_care_tracker.throttle import (
+    DROP_DEBOUNCED,
+    DROP_DUPLICATE,
+    DROP_RATE_LIMITED,
+    RATE_LIMIT_BURST,
+    TriggerThrottle,
+)
+
+
+def test_bounce_is_debounced():
+    """Events from one entity for one action within the window are one press."""
+    throttle = TriggerThrottle()
+    assert throttle.check("button.remote", "log_diaper", {"type": "pee"}, now=0.0) is None
+    assert throttle.check("button.remote", "log_diaper", {"type": "pee"}, now=0.5) == DROP_DEBOUNCED
+
+
+def test_debounce_is_per_action():
+    """A single and a double press of one remote both run."""
+    throttle = TriggerThrottle()
+    assert throttle.check("event.remote", "toggle_sleep", {}, now=0.0) is None
+    assert throttle.check("event.remote", "toggle_feeding", {}, now=0.3) is None
+
+
+def test_same_press_from_two_sources_runs_once():
+    """The same action reported by two entities within the window runs once."""
+    throttle = TriggerThrottle()
+    assert throttle.check("sensor.remote_action", "toggle_sleep", {}, now=0.0) is None
+    assert throttle.check("zha_event.remote", "toggle_sleep", {}, now=0.2) == DROP_DUPLICATE
+
+
+def test_rate_limit_is_per_entity():
+    """A flooding entity is limited without dropping presses on another one."""
+    throttle = TriggerThrottle()
+    now = 0.0
+    for index in range(RATE_LIMIT_BURST):
+        assert throttle.check("button.flood", f"action_{index}", {}, now=now) is None
+        now += 0.1
+    assert throttle.check("button.flood", "action_extra", {}, now=now) == DROP_RATE_LIMITED
+    assert throttle.check("button.other", "log_diaper", {"type": "poo"}, now=now) is None